@@ -0,0 +1,549 @@
+"""
+ANÁLISIS DE PROBABILIDAD - BANK MARKETING DATASET (módulo importable)
+======================================================================
+Contiene los cálculos y reportes de las secciones 1-4 y 6 de codigo.py
+como funciones. Importar este módulo no ejecuta el análisis ni carga
+matplotlib o scipy: las gráficas (sección 5) viven en visualizaciones.py y
+scipy solo se importa al calcular el test Chi-cuadrado.
+
+Uso típico:
+    import analisis_probabilidad as ap
+    df = ap.load_data()
+    results = ap.compute_probabilities(df)
+    ap.print_section(results, '3.4')
+"""
+
+import contextlib
+
+import pandas as pd
+
+from counts import probability_summary
+
+# Secciones disponibles, en orden de ejecución
+SECTIONS = ['1', '2', '3.1', '3.2', '3.3', '3.4', '3.5', '3.6', '4', '5', '6']
+
+SIMULATED = 'simulado'
+
+AGE_GROUPS = ['young', 'middle', 'senior']
+
+AGE_LABELS = {
+    'young': 'Jóvenes (18-35)',
+    'middle': 'Edad Media (36-55)',
+    'senior': 'Mayores (56+)'
+}
+
+# Nombres de cada grupo en el resumen de la sección 4: etiqueta corta,
+# sujeto en plural y complemento de "el grupo ..."
+AGE_NAMES = {
+    'young': ('Jóvenes', 'Los jóvenes', 'de jóvenes'),
+    'middle': ('Edad Media', 'Los clientes de edad media', 'de edad media'),
+    'senior': ('Mayores', 'Los mayores', 'de mayores'),
+}
+
+# Configuración del dataset simulado
+AGE_DISTRIBUTION = {
+    'young': 1200,
+    'middle': 2500,
+    'senior': 821
+}
+
+SUBSCRIPTION_RATES = {
+    'young': 0.15,
+    'middle': 0.112,
+    'senior': 0.0743
+}
+
+AGE_RANGES = {
+    'young': (18, 35),
+    'middle': (36, 55),
+    'senior': (56, 80)
+}
+
+RESULTS_CSV = 'resultados_probabilidad.csv'
+
+
+def parse_sections(spec):
+    """Traducir '3.2,3.4' (o '3' para todas las 3.x) a una lista ordenada de secciones."""
+    if spec is None:
+        return list(SECTIONS)
+    selected = set()
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        matches = [s for s in SECTIONS if s == item or s.startswith(item + '.')]
+        if not matches:
+            raise ValueError(f"Sección desconocida: {item!r}. Disponibles: {', '.join(SECTIONS)}")
+        selected.update(matches)
+    return [s for s in SECTIONS if s in selected]
+
+
+# ============================================================================
+# 1. CARGA Y PREPARACIÓN DE DATOS
+# ============================================================================
+
+def load_data(dataset=SIMULATED, cache_dir=None):
+    """Cargar el dataset simulado o uno real desde bank+marketing.zip (con caché)."""
+    import data_cache
+
+    cache_dir = cache_dir or data_cache.DEFAULT_CACHE_DIR
+    if dataset == SIMULATED:
+        # Columnas vectorizadas con semilla propia; la primera ejecución lo
+        # guarda en data/cache/ y las siguientes lo abren con memory-map
+        return data_cache.cached_synthetic_dataset(
+            AGE_DISTRIBUTION, SUBSCRIPTION_RATES, AGE_RANGES, seed=42, cache_dir=cache_dir)
+
+    from data_loader import add_age_group
+    return add_age_group(data_cache.cached_bank_dataset(dataset, cache_dir=cache_dir))
+
+
+def print_section_1(df):
+    from compact import print_memory_report
+
+    print("[1] CARGANDO Y PREPARANDO DATOS...")
+    print("-"*70)
+    print(f"Dataset cargado: {len(df)} registros")
+    print(f"Variables: {df.columns.tolist()}")
+    print()
+
+    # Información básica del dataset
+    print("Información del Dataset:")
+    print(df.info())
+    print()
+    # Etiquetas como category (códigos int8) y edad como int8, frente a la
+    # representación con cadenas e int64
+    print_memory_report(df)
+    print()
+    print("Primeras filas:")
+    print(df.head(10))
+    print()
+
+
+# ============================================================================
+# 2. ANÁLISIS DESCRIPTIVO
+# ============================================================================
+
+def print_section_2(df):
+    print("\n[2] ANÁLISIS DESCRIPTIVO")
+    print("-"*70)
+
+    # Estadísticas de edad
+    print(f"Edad - Media: {df['age'].mean():.1f} años")
+    print(f"Edad - Mediana: {df['age'].median():.0f} años")
+    print(f"Edad - Desv. Estándar: {df['age'].std():.1f} años")
+    print(f"Edad - Rango: [{df['age'].min()}, {df['age'].max()}]")
+    print()
+
+    # Distribución de grupos de edad
+    print("Distribución por Grupo de Edad:")
+    print(df['age_group'].value_counts().sort_index())
+    print()
+
+    # Distribución de suscripciones
+    print("Distribución de Suscripciones:")
+    print(df['y'].value_counts())
+    print()
+
+
+# ============================================================================
+# 3. CÁLCULOS DE PROBABILIDAD
+# ============================================================================
+
+def compute_probabilities(df, column='age_group', groups=AGE_GROUPS):
+    """Calcular todas las probabilidades de la sección 3 desde una sola tabla de conteos.
+
+    Devuelve un diccionario con los mismos nombres que usaba el script
+    (`conditional_probs`, `marginal_age_probs`, `bayes_results`, ...).
+    """
+    summary = probability_summary(df, column, 'y', positive='yes', groups=groups)
+    return {
+        'age_groups': list(groups),
+        'age_labels': {g: AGE_LABELS.get(g, str(g)) for g in groups},
+        'total_clients': summary['total'],
+        'subscribed': summary['subscribed'],
+        'not_subscribed': summary['not_subscribed'],
+        'prob_subscribe': summary['prob_subscribe'],
+        'prob_not_subscribe': summary['prob_not_subscribe'],
+        'conditional_probs': summary['conditional_probs'],
+        'marginal_age_probs': summary['marginal_probs'],
+        'joint_probs': summary['joint_probs'],
+        'bayes_results': summary['bayes_results'],
+        'bayes_details': summary['bayes_details'],
+        'contingency_table': summary['table'],
+        'age_mean': float(df['age'].mean()) if 'age' in df.columns else float('nan'),
+    }
+
+
+def chi_square_test(results):
+    """Test Chi-cuadrado de independencia sobre la tabla de conteos (carga scipy)."""
+    if 'chi2' not in results:
+        from independence import chi2_statistic
+
+        chi2, p_value, dof, _ = chi2_statistic(results['contingency_table'])
+        results['chi2'] = {'chi2': chi2, 'p_value': p_value, 'dof': dof}
+    return results['chi2']
+
+
+def bootstrap_intervals(results, n_boot=10_000, seed=42):
+    """Intervalos de confianza bootstrap de las probabilidades (se calculan una vez)."""
+    if 'bootstrap_ci' not in results:
+        from bootstrap import bootstrap_probabilities
+
+        results['bootstrap_ci'] = bootstrap_probabilities(
+            results['contingency_table'], positive='yes', n_boot=n_boot, seed=seed)
+    return results['bootstrap_ci']
+
+
+def print_section_3_header(results):
+    print("\n[3] CÁLCULOS DE PROBABILIDAD")
+    print("="*70)
+
+
+def print_section_3_1(results):
+    total_clients = results['total_clients']
+    subscribed = results['subscribed']
+    not_subscribed = results['not_subscribed']
+    prob_subscribe = results['prob_subscribe']
+    prob_not_subscribe = results['prob_not_subscribe']
+
+    print("\n[3.1] PROBABILIDAD MARGINAL")
+    print("-"*70)
+
+    print(f"P(Suscripción = Sí) = {subscribed}/{total_clients}")
+    print(f"                    = {prob_subscribe:.6f}")
+    print(f"                    = {prob_subscribe*100:.2f}%")
+    print()
+    print(f"P(Suscripción = No) = {not_subscribed}/{total_clients}")
+    print(f"                   = {prob_not_subscribe:.6f}")
+    print(f"                   = {prob_not_subscribe*100:.2f}%")
+    print()
+
+    # Verificación
+    print(f"Verificación: P(Sí) + P(No) = {prob_subscribe + prob_not_subscribe:.6f}")
+    print()
+
+
+def print_section_3_2(results):
+    conditional_probs = results['conditional_probs']
+    age_labels = results['age_labels']
+
+    print("\n[3.2] PROBABILIDADES CONDICIONALES: P(Suscripción | Edad)")
+    print("-"*70)
+
+    for group in results['age_groups']:
+        total_group = conditional_probs[group]['total']
+        subscribed_group = conditional_probs[group]['subscribed']
+        not_subscribed_group = conditional_probs[group]['not_subscribed']
+        prob_sub_given_age = conditional_probs[group]['prob_yes']
+        prob_not_sub_given_age = conditional_probs[group]['prob_no']
+
+        print(f"\n{age_labels[group]}:")
+        print(f"  Total clientes: {total_group}")
+        print(f"  Suscripciones: {subscribed_group}")
+        print(f"  No suscripciones: {not_subscribed_group}")
+        print(f"  P(Sí | {group}) = {subscribed_group}/{total_group} = {prob_sub_given_age:.6f} ({prob_sub_given_age*100:.2f}%)")
+        print(f"  P(No | {group}) = {not_subscribed_group}/{total_group} = {prob_not_sub_given_age:.6f} ({prob_not_sub_given_age*100:.2f}%)")
+
+    print()
+
+
+def print_section_3_3(results):
+    conditional_probs = results['conditional_probs']
+    marginal_age_probs = results['marginal_age_probs']
+    age_labels = results['age_labels']
+
+    print("\n[3.3] PROBABILIDADES MARGINALES: P(Edad)")
+    print("-"*70)
+
+    for group in results['age_groups']:
+        prob = marginal_age_probs[group]
+        print(f"P({age_labels[group]}) = {conditional_probs[group]['total']}/{results['total_clients']}")
+        print(f"                       = {prob:.6f} ({prob*100:.2f}%)")
+    print()
+
+
+def print_section_3_4(results):
+    bayes_results = results['bayes_results']
+    bayes_details = results['bayes_details']
+    age_labels = results['age_labels']
+
+    print("\n[3.4] TEOREMA DE BAYES: P(Edad | Suscripción)")
+    print("-"*70)
+    print("Fórmula: P(A|B) = [P(B|A) × P(A)] / P(B)")
+    print()
+
+    for group in results['age_groups']:
+        # P(Edad | Suscripción) = P(Suscripción | Edad) × P(Edad) / P(Suscripción)
+
+        likelihood = bayes_details[group]['likelihood']  # P(S|E)
+        prior = bayes_details[group]['prior']  # P(E)
+        evidence = bayes_details[group]['evidence']  # P(S)
+        numerator = bayes_details[group]['numerator']
+        posterior = bayes_details[group]['posterior']
+
+        print(f"\nP({age_labels[group]} | Suscripción):")
+        print(f"  Likelihood P(S|{group}) = {likelihood:.6f}")
+        print(f"  Prior P({group}) = {prior:.6f}")
+        print(f"  Evidence P(S) = {evidence:.6f}")
+        print(f"  Numerador = {likelihood:.6f} × {prior:.6f} = {numerator:.6f}")
+        print(f"  Posterior = {numerator:.6f} / {evidence:.6f} = {posterior:.6f}")
+        print(f"  RESULTADO: {posterior*100:.2f}%")
+
+    print()
+
+    # Verificación de Bayes
+    total_posterior = sum(bayes_results.values())
+    print(f"Verificación: Σ P(Edad|Suscripción) = {total_posterior:.6f}")
+    print(f"Debe ser ≈ 1.0000 ✓" if abs(total_posterior - 1.0) < 0.001 else "ERROR: No suma 1.0")
+    print()
+
+
+def print_section_3_5(results):
+    conditional_probs = results['conditional_probs']
+    prob_subscribe = results['prob_subscribe']
+    age_labels = results['age_labels']
+
+    print("\n[3.5] TEST DE INDEPENDENCIA ESTADÍSTICA")
+    print("-"*70)
+    print("Hipótesis H0: Edad y Suscripción son independientes")
+    print("Para independencia: P(S|E) = P(S) para toda E")
+    print()
+
+    independent = True
+    max_diff = 0
+
+    for group in results['age_groups']:
+        prob_cond = conditional_probs[group]['prob_yes']
+        diff = abs(prob_cond - prob_subscribe)
+        max_diff = max(max_diff, diff)
+
+        status = "≈ IGUAL" if diff < 0.001 else "≠ DIFERENTE"
+
+        print(f"{age_labels[group]}:")
+        print(f"  P(S|{group}) = {prob_cond:.6f}")
+        print(f"  P(S)         = {prob_subscribe:.6f}")
+        print(f"  |Diferencia| = {diff:.6f}  [{status}]")
+
+        if diff > 0.001:
+            independent = False
+        print()
+
+    print("CONCLUSIÓN:", end=" ")
+    if independent:
+        print("Edad y Suscripción SON INDEPENDIENTES")
+        print("(Las probabilidades condicionales son iguales a la marginal)")
+    else:
+        print("Edad y Suscripción NO SON INDEPENDIENTES ✓")
+        print("(La edad influye en la probabilidad de suscripción)")
+    print()
+
+    # Test Chi-cuadrado formal
+    print("Test Chi-cuadrado de independencia:")
+    test = chi_square_test(results)
+    print(f"  χ² = {test['chi2']:.4f}")
+    print(f"  p-valor = {test['p_value']:.6f}")
+    print(f"  Grados de libertad = {test['dof']}")
+    if test['p_value'] < 0.05:
+        print(f"  Resultado: RECHAZAMOS H0 (p < 0.05)")
+        print(f"  Las variables NO son independientes ✓")
+    else:
+        print(f"  Resultado: NO RECHAZAMOS H0 (p ≥ 0.05)")
+        print(f"  No hay evidencia suficiente de dependencia")
+    print()
+
+    # Intervalos de confianza bootstrap (réplicas multinomiales de la tabla de conteos)
+    print("Intervalos de confianza bootstrap al 95% (10,000 réplicas):")
+    bootstrap_ci = bootstrap_intervals(results)
+    for group in results['age_groups']:
+        _, low, high = bootstrap_ci.loc[('P(S|E)', group)]
+        inside = "contiene P(S)" if low <= prob_subscribe <= high else "no contiene P(S)"
+        print(f"  P(S|{group}) ∈ [{low:.4f}, {high:.4f}]  ({inside})")
+    print()
+
+
+def print_section_3_6(results):
+    conditional_probs = results['conditional_probs']
+    marginal_age_probs = results['marginal_age_probs']
+    age_labels = results['age_labels']
+    total_clients = results['total_clients']
+
+    print("\n[3.6] PROBABILIDADES CONJUNTAS: P(Edad ∩ Suscripción)")
+    print("-"*70)
+
+    for group in results['age_groups']:
+        # P(E ∩ S) = P(S|E) × P(E)
+        joint_prob = conditional_probs[group]['prob_yes'] * marginal_age_probs[group]
+
+        # Verificación alternativa: conteo directo
+        count_both = conditional_probs[group]['subscribed']
+        joint_prob_alt = results['joint_probs'][group]
+
+        print(f"\nP({age_labels[group]} ∩ Suscripción):")
+        print(f"  Método 1: P(S|{group}) × P({group})")
+        print(f"           = {conditional_probs[group]['prob_yes']:.6f} × {marginal_age_probs[group]:.6f}")
+        print(f"           = {joint_prob:.6f} ({joint_prob*100:.2f}%)")
+        print(f"  Método 2: Conteo directo = {count_both}/{total_clients}")
+        print(f"           = {joint_prob_alt:.6f} ({joint_prob_alt*100:.2f}%)")
+        print(f"  Verificación: Ambos métodos {'coinciden ✓' if abs(joint_prob - joint_prob_alt) < 0.0001 else 'NO coinciden ✗'}")
+
+    print()
+
+
+# ============================================================================
+# 4. RESUMEN DE RESULTADOS
+# ============================================================================
+
+def print_section_4(results):
+    conditional_probs = results['conditional_probs']
+    bayes_results = results['bayes_results']
+    prob_subscribe = results['prob_subscribe']
+    age_labels = results['age_labels']
+    groups = results['age_groups']
+    names = {g: AGE_NAMES.get(g, (str(g), f"Los clientes del grupo {g}", str(g)))
+             for g in groups}
+    best = max(groups, key=lambda g: conditional_probs[g]['prob_yes'])
+    worst = min(groups, key=lambda g: conditional_probs[g]['prob_yes'])
+    largest = max(groups, key=lambda g: bayes_results[g])
+    p_value = chi_square_test(results)['p_value']
+
+    print("\n[4] RESUMEN DE RESULTADOS")
+    print("="*70)
+
+    print("\n📊 PROBABILIDADES CLAVE:")
+    print(f"  • Tasa general de suscripción: {prob_subscribe*100:.2f}%")
+    print(f"  • Mejor tasa ({names[best][0]}): {conditional_probs[best]['prob_yes']*100:.2f}%")
+    print(f"  • Peor tasa ({names[worst][0]}): {conditional_probs[worst]['prob_yes']*100:.2f}%")
+    print()
+
+    print("🎯 TEOREMA DE BAYES - Composición de Suscriptores:")
+    for group in results['age_groups']:
+        print(f"  • {age_labels[group]}: {bayes_results[group]*100:.2f}%")
+    print()
+
+    print("🔍 INSIGHTS:")
+    print(f"  1. {names[best][1]} tienen {(conditional_probs[best]['prob_yes']/prob_subscribe - 1)*100:+.1f}% más probabilidad")
+    print(f"     de suscribirse que el promedio")
+    print(f"  2. El grupo {names[largest][2]} representa el {bayes_results[largest]*100:.1f}% de todos")
+    print(f"     los suscriptores, siendo el segmento más grande")
+    p_text = "p < 0.001" if p_value < 0.001 else f"p = {p_value:.4f}"
+    if p_value < 0.05:
+        print(f"  3. La edad influye significativamente en la decisión ({p_text})")
+    else:
+        print(f"  3. No hay evidencia de que la edad influya en la decisión ({p_text})")
+    print()
+
+
+# ============================================================================
+# 6. EXPORTAR RESULTADOS A CSV
+# ============================================================================
+
+def results_frame(results):
+    """Tabla de resultados por grupo de edad (una fila por grupo)."""
+    results_data = []
+    for group in results['age_groups']:
+        conditional = results['conditional_probs'][group]
+        results_data.append({
+            'Grupo_Edad': results['age_labels'][group],
+            'Total_Clientes': conditional['total'],
+            'Suscripciones': conditional['subscribed'],
+            'No_Suscripciones': conditional['not_subscribed'],
+            'P(Edad)': f"{results['marginal_age_probs'][group]:.6f}",
+            'P(S|Edad)': f"{conditional['prob_yes']:.6f}",
+            'P(Edad|S)_Bayes': f"{results['bayes_results'][group]:.6f}"
+        })
+    return pd.DataFrame(results_data)
+
+
+def print_section_6(results, path=RESULTS_CSV):
+    print("\n[6] EXPORTANDO RESULTADOS...")
+    print("-"*70)
+
+    results_frame(results).to_csv(path, index=False)
+    print(f"✓ Resultados exportados a '{path}'")
+    print()
+
+
+_PRINTERS = {
+    '3.1': print_section_3_1,
+    '3.2': print_section_3_2,
+    '3.3': print_section_3_3,
+    '3.4': print_section_3_4,
+    '3.5': print_section_3_5,
+    '3.6': print_section_3_6,
+    '4': print_section_4,
+}
+
+
+def print_section(results, section):
+    """Imprimir una de las secciones 3.1-4 a partir de los resultados calculados."""
+    _PRINTERS[section](results)
+
+
+def _unmeasured(name, rows=None):
+    """Etapa sin instrumentación (no hace falta importar `instrumentation`)."""
+    return contextlib.nullcontext({})
+
+
+def run_analysis(df, sections=None, plots=True, show=True, render=None, recorder=None):
+    """Ejecutar las secciones pedidas sobre `df` e imprimir sus reportes.
+
+    `sections` es una lista como la que devuelve `parse_sections` (None =
+    todas). Si `render` es un diccionario de opciones de
+    `visualizaciones.render_report`, la sección 5 se dibuja sin pantalla
+    (Agg, en paralelo y con caché) en lugar de usar pyplot. `recorder` es
+    un `instrumentation.RunRecorder` que mide cada sección (por defecto no
+    se mide nada).
+    Devuelve el diccionario de resultados de la sección 3.
+    """
+    stage = recorder.stage if recorder is not None else _unmeasured
+    sections = list(SECTIONS) if sections is None else sections
+    rows = len(df)
+
+    with stage('count', rows):
+        results = compute_probabilities(df)
+
+    if '1' in sections:
+        with stage('1', rows):
+            print_section_1(df)
+    if '2' in sections:
+        with stage('2', rows):
+            print_section_2(df)
+    if any(s.startswith('3.') for s in sections):
+        print_section_3_header(results)
+    for section in sections:
+        if section in _PRINTERS:
+            with stage(section):
+                print_section(results, section)
+
+    if '5' in sections and plots:
+        with stage('5'):
+            import visualizaciones
+
+            print("\n[5] GENERANDO VISUALIZACIONES...")
+            print("-"*70)
+            if render is not None:
+                status = visualizaciones.render_report(results, **render)
+                for path, state in status.items():
+                    note = "sin cambios, reutilizada" if state == 'cached' else "guardada"
+                    print(f"✓ Visualización {note}: '{path}'")
+            else:
+                path = visualizaciones.plot_results(results)
+                print(f"✓ Visualización guardada como '{path}'")
+            print()
+
+        if show and render is None:
+            visualizaciones.show()
+
+    if '6' in sections:
+        with stage('6', len(results['age_groups'])):
+            print_section_6(results)
+
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    from codigo import main
+
+    sys.exit(main())
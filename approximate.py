@@ -0,0 +1,239 @@
+"""
+Modo aproximado: muestreo estratificado progresivo con parada por error
+========================================================================
+Para explorar archivos de campañas muy grandes no hace falta P(S|E) exacta
+con seis decimales. Aquí las filas se muestrean por estrato (grupo de edad o
+cualquier columna categórica) en rondas cada vez más grandes, y el muestreo
+se detiene en cuanto la semiamplitud del intervalo de confianza de cada
+probabilidad pedida es menor que la tolerancia.
+
+- El tamaño de cada estrato (N_g) se obtiene contando solo la columna de
+  estratos, así que P(E) es exacta; de la columna objetivo solo se leen las
+  filas muestreadas (con el dataset en memory-map, solo esas páginas).
+- P(S|E) se estima en cada estrato con la varianza de Agresti-Coull y la
+  corrección por población finita: si un estrato se recorre completo su
+  error es 0.
+- P(S), P(E∩S) y P(E|S) (Bayes) se combinan desde los estratos; el error
+  de P(E|S) se propaga con el método delta.
+
+El resultado lleva, junto a cada valor, la semiamplitud alcanzada.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+from counts import _codes
+
+# Estadísticos que se pueden pedir (mismos nombres que bootstrap.STATISTICS)
+STATISTICS = ['P(S|E)', 'P(E|S)', 'P(E∩S)', 'P(E)', 'P(S)']
+
+DEFAULT_TOLERANCE = 0.005
+
+DEFAULT_CONFIDENCE = 0.95
+
+# Filas por estrato en la primera ronda; cada ronda duplica la muestra de
+# los estratos que todavía no alcanzan la tolerancia
+DEFAULT_INITIAL = 500
+
+DEFAULT_MAX_ROUNDS = 30
+
+
+def _strata(df, column, groups):
+    """Códigos de estrato por fila, etiquetas y tamaño N_g (solo se lee esa columna)."""
+    codes, labels = _codes(df[column])
+    # Una comparación por etiqueta sobre los códigos angostos (int8) es más
+    # rápida que bincount, que los convierte antes a int64
+    sizes = np.array([np.count_nonzero(codes == k) for k in range(len(labels))],
+                     dtype=np.int64)
+    groups = [g for g, n in zip(labels, sizes) if n] if groups is None else list(groups)
+    missing = [g for g in groups if g not in labels or not sizes[labels.index(g)]]
+    if missing:
+        raise KeyError(f"Valores sin filas en {column!r}: {missing}")
+    index = [labels.index(g) for g in groups]
+    return groups, codes, np.array(index), sizes[index]
+
+
+def _sample_stratum(codes, code, size, k, rng, rows):
+    """Posiciones de una muestra aleatoria simple de `k` filas del estrato `code`.
+
+    Mientras la muestra es chica se sortean posiciones de todo el dataset y
+    se conservan las del estrato (no hace falta indexar el estrato completo);
+    si se necesita más de un cuarto de las filas, se indexa el estrato una
+    vez (`rows` guarda esas posiciones).
+    """
+    n = len(codes)
+    if k >= size:
+        draw = None
+    else:
+        draw = int(min(n, np.ceil(k * n / size * 1.2) + 64))
+    if draw is not None and draw <= n // 4:
+        while True:
+            positions = rng.choice(n, draw, replace=False)
+            positions = positions[codes[positions] == code]
+            if len(positions) >= k:
+                return positions[:k]
+            draw = min(n, draw * 2)
+    if code not in rows:
+        rows[code] = np.flatnonzero(codes == code)
+    if k >= size:
+        return rows[code]
+    return rows[code][rng.choice(size, k, replace=False)]
+
+
+def _variances(positive, sampled, sizes):
+    """Varianza de p̂_g por estrato (Agresti-Coull con corrección por población finita)."""
+    adjusted = (positive + 2) / (sampled + 4)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fpc = np.where(sizes > 1, (sizes - sampled) / (sizes - 1), 0.0)
+    return adjusted * (1 - adjusted) / np.maximum(sampled, 1) * np.clip(fpc, 0, 1)
+
+
+def _estimates(positive, sampled, sizes):
+    """Probabilidades y varianzas de todos los estadísticos desde los conteos por estrato."""
+    weights = sizes / sizes.sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = np.where(sampled > 0, positive / sampled, np.nan)
+    var_p = _variances(positive, sampled, sizes)
+
+    joint = weights * p
+    var_joint = weights ** 2 * var_p
+    prob_positive = joint.sum()
+    var_positive = var_joint.sum()
+
+    # P(E|S) = a_g / T con a_g = W_g·p_g, T = Σ a_h (método delta)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bayes = joint / prob_positive
+        gradient = -joint[:, np.newaxis] / prob_positive ** 2 * np.ones(len(p))
+        gradient[np.diag_indices(len(p))] += 1 / prob_positive
+        var_bayes = (gradient ** 2 * var_joint).sum(axis=1)
+
+    return {
+        'P(S|E)': (p, var_p),
+        'P(E|S)': (bayes, var_bayes),
+        'P(E∩S)': (joint, var_joint),
+        'P(E)': (weights, np.zeros(len(p))),
+        'P(S)': (np.array([prob_positive]), np.array([var_positive])),
+    }
+
+
+def stratified_estimate(df, column='age_group', target='y', positive='yes',
+                        tolerance=DEFAULT_TOLERANCE, confidence=DEFAULT_CONFIDENCE,
+                        statistics=None, groups=None, initial=DEFAULT_INITIAL,
+                        max_rounds=DEFAULT_MAX_ROUNDS, seed=42):
+    """Estimar las probabilidades de `target` por estratos de `column` con error acotado.
+
+    Parámetros:
+        df: DataFrame (puede estar respaldado por memory-map)
+        column: columna de estratos (por defecto age_group)
+        target, positive: columna resultado y etiqueta de éxito
+        tolerance: semiamplitud máxima del intervalo de cada probabilidad
+        confidence: nivel de confianza de los intervalos
+        statistics: nombres de `STATISTICS` que deben cumplir la tolerancia
+            (por defecto todos)
+        groups: estratos y su orden (por defecto los valores con filas)
+        initial: filas por estrato en la primera ronda (luego se duplican)
+
+    Devuelve un diccionario con `estimates` ({estadístico: {grupo: (valor,
+    semiamplitud)}}), el tamaño de muestra por estrato y si se alcanzó la
+    tolerancia.
+    """
+    statistics = list(STATISTICS) if statistics is None else list(statistics)
+    unknown = set(statistics) - set(STATISTICS)
+    if unknown:
+        raise ValueError(f"Estadísticos desconocidos: {sorted(unknown)}. "
+                         f"Disponibles: {', '.join(STATISTICS)}")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence debe estar entre 0 y 1")
+
+    for name in (column, target):
+        if name not in df.columns:
+            raise KeyError(f"Columna desconocida: {name!r}")
+    groups, strata_codes, group_codes, sizes = _strata(df, column, groups)
+    target_codes, target_labels = _codes(df[target])
+    if positive not in target_labels:
+        raise KeyError(f"{positive!r} no aparece en {target!r}")
+    positive_code = target_labels.index(positive)
+
+    # Cada ronda toma una muestra aleatoria simple nueva de cada estrato que
+    # crece (sin reemplazo); como el tamaño se duplica, el total leído es a lo
+    # sumo el doble de la muestra final
+    rng = np.random.default_rng(seed)
+    rows = {}
+    sampled = np.zeros(len(groups), dtype=np.int64)
+    hits = np.zeros(len(groups), dtype=np.int64)
+    wanted = np.minimum(initial, sizes).astype(np.int64)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    for rounds in range(1, max_rounds + 1):
+        for i in range(len(groups)):
+            if wanted[i] > sampled[i]:
+                batch = _sample_stratum(strata_codes, group_codes[i], sizes[i],
+                                        wanted[i], rng, rows)
+                hits[i] = int(np.count_nonzero(target_codes[batch] == positive_code))
+                sampled[i] = wanted[i]
+
+        estimates = _estimates(hits, sampled, sizes)
+        widths = {name: z * np.sqrt(var) for name, (_, var) in estimates.items()}
+        pending = [name for name in statistics if not np.all(widths[name] < tolerance)]
+        exhausted = sampled >= sizes
+        if not pending or exhausted.all():
+            break
+
+        # Crecen los estratos cuyo propio P(S|E) no alcanza la tolerancia y, si
+        # falla un estadístico combinado (P(S), P(E∩S), Bayes), los que más
+        # aportan a su varianza (peso × semiamplitud sobre su parte de la tolerancia)
+        grow = np.zeros(len(groups), dtype=bool)
+        if 'P(S|E)' in pending:
+            grow |= widths['P(S|E)'] >= tolerance
+        if set(pending) - {'P(S|E)'}:
+            share = tolerance / np.sqrt(max(1, int((~exhausted).sum())))
+            grow |= sizes / sizes.sum() * widths['P(S|E)'] >= share
+        grow &= ~exhausted
+        if not grow.any():
+            grow = ~exhausted
+        wanted = np.where(grow, np.minimum(sampled * 2, sizes), sampled).astype(np.int64)
+
+    labels = {'P(S)': [positive]}
+    return {
+        'column': column,
+        'target': target,
+        'positive': positive,
+        'groups': groups,
+        'tolerance': tolerance,
+        'confidence': confidence,
+        'statistics': statistics,
+        'rounds': rounds,
+        'converged': not pending,
+        'population': dict(zip(groups, sizes.tolist())),
+        'sampled': dict(zip(groups, sampled.tolist())),
+        'estimates': {
+            name: {label: (float(value), float(width))
+                   for label, value, width in zip(labels.get(name, groups), values,
+                                                  widths[name])}
+            for name, (values, _) in estimates.items()
+        },
+    }
+
+
+def print_approximate(result):
+    """Imprimir cada probabilidad con su error alcanzado (± semiamplitud)."""
+    column, positive = result['column'], result['positive']
+    n_sampled = sum(result['sampled'].values())
+    n_total = sum(result['population'].values())
+    print(f"\n[3] PROBABILIDADES APROXIMADAS (muestreo estratificado por {column})")
+    print("="*70)
+    print(f"Muestra: {n_sampled:,} de {n_total:,} filas ({n_sampled / n_total:.2%}) "
+          f"en {result['rounds']} rondas; IC {result['confidence']:.0%}, "
+          f"tolerancia ± {result['tolerance']:.6f}")
+    if not result['converged']:
+        print("⚠ No se alcanzó la tolerancia en todos los estadísticos pedidos")
+
+    value, error = result['estimates']['P(S)'][positive]
+    print(f"\nP(S = {positive}) = {value:.6f} ± {error:.6f}")
+    for name in ('P(S|E)', 'P(E)', 'P(E∩S)', 'P(E|S)'):
+        print(f"\n{name}:")
+        for group, (value, error) in result['estimates'][name].items():
+            print(f"  {str(group):<15} {value:.6f} ± {error:.6f}"
+                  f"   (n = {result['sampled'][group]:,} de {result['population'][group]:,})")
+    print()
@@ -0,0 +1,330 @@
+"""
+Benchmarks por etapa del análisis a distintas escalas
+=====================================================
+Mide tiempo y memoria de cada etapa del pipeline de codigo.py:
+
+    load        generación del dataset simulado / lectura del CSV real
+    describe    estadísticas descriptivas (sección 2)
+    count       tabla de conteos y probabilidades (sección 3)
+    chi_square  test Chi-cuadrado (scipy)
+    bootstrap   intervalos de confianza bootstrap
+    sections_3  reportes 3.1-3.6 y 4
+    render      figura de la sección 5 (Agg, sin pantalla)
+    export      CSV de la sección 6
+
+Escalas: el dataset simulado multiplicado (4.5k, 45k, 4.5M y 45M filas) y
+el CSV real bank-additional-full. Cada etapa se repite `--repeat` veces
+para el tiempo (se guarda el mínimo y la mediana) y una vez más bajo
+tracemalloc para el pico de memoria, así la medición de memoria no
+distorsiona los tiempos. Las etapas que importan scipy o matplotlib se
+calientan con una llamada sin medir. El RSS máximo que acompaña a cada
+escala es el del proceso hasta ese momento (acumulado entre escalas).
+
+Los resultados se guardan en JSON y se pueden comparar contra una línea
+base guardada; el script termina con código 1 si alguna etapa empeoró más
+que el umbral.
+
+Ejemplos:
+    python benchmarks.py                              # todas las escalas
+    python benchmarks.py --scales 4.5k,45k --repeat 5
+    python benchmarks.py --save-baseline data/benchmarks/baseline.json
+    python benchmarks.py --compare data/benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import analisis_probabilidad as ap
+from instrumentation import max_rss_mb
+
+DEFAULT_OUTPUT = Path("data") / "benchmarks" / "latest.json"
+
+# Nombre de la escala -> factor sobre AGE_DISTRIBUTION (4,521 filas), o
+# 'real' para el CSV de bank+marketing.zip
+SCALES = {
+    '4.5k': 1,
+    '45k': 10,
+    '4.5M': 1_000,
+    '45M': 10_000,
+    'real': 'bank-additional-full',
+}
+
+STAGES = ['load', 'describe', 'count', 'chi_square', 'bootstrap',
+          'sections_3', 'render', 'export']
+
+# Etapas cuya primera llamada importa módulos pesados (scipy, matplotlib):
+# se ejecutan una vez sin medir antes de tomar los tiempos. Trabajan sobre
+# la tabla de conteos, así que el calentamiento es barato en toda escala
+WARMUP_STAGES = ('chi_square', 'bootstrap', 'render', 'export')
+
+# Diferencias menores que esto (en s o en MiB) no se consideran regresión
+MIN_TIME_DELTA = 0.005
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+# ============================================================================
+# Etapas
+# ============================================================================
+
+def _load(scale):
+    target = SCALES[scale]
+    if isinstance(target, str):
+        from data_loader import add_age_group, load_bank_dataset
+
+        return add_age_group(load_bank_dataset(target))
+
+    from synthetic_data import generate_dataset
+
+    distribution = {g: n * target for g, n in ap.AGE_DISTRIBUTION.items()}
+    return generate_dataset(distribution, ap.SUBSCRIPTION_RATES, ap.AGE_RANGES, seed=42)
+
+
+def _quiet(func, *args):
+    """Ejecutar `func` descartando lo que imprime (se mide el cálculo, no la terminal)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def _sections_3(results):
+    ap.print_section_3_header(results)
+    for section in ['3.1', '3.2', '3.3', '3.4', '3.5', '3.6', '4']:
+        ap.print_section(results, section)
+
+
+def _stage_functions(scale, workdir):
+    """Funciones sin argumentos de cada etapa; cada una recibe el estado anterior."""
+    state = {}
+
+    def load():
+        state['df'] = _load(scale)
+
+    def describe():
+        _quiet(ap.print_section_2, state['df'])
+
+    def count():
+        state['results'] = ap.compute_probabilities(state['df'])
+
+    def chi_square():
+        state['results'].pop('chi2', None)
+        ap.chi_square_test(state['results'])
+
+    def bootstrap():
+        state['results'].pop('bootstrap_ci', None)
+        ap.bootstrap_intervals(state['results'])
+
+    def sections_3():
+        _quiet(_sections_3, state['results'])
+
+    def render():
+        import visualizaciones
+
+        visualizaciones.render_report(state['results'], output_dir=workdir, force=True)
+
+    def export():
+        _quiet(ap.print_section_6, state['results'], os.path.join(workdir, ap.RESULTS_CSV))
+
+    stages = dict(load=load, describe=describe, count=count, chi_square=chi_square,
+                  bootstrap=bootstrap, sections_3=sections_3, render=render, export=export)
+    return stages, state
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _peak_memory(func):
+    """Pico de memoria asignada por `func` según tracemalloc, en MiB."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def run_scale(scale, stages=STAGES, repeat=3, memory=True):
+    """Medir cada etapa en una escala; devuelve {etapa: métricas}."""
+    with tempfile.TemporaryDirectory() as workdir:
+        functions, state = _stage_functions(scale, workdir)
+        report = {}
+        for name in STAGES:
+            if name not in stages and name not in ('load', 'count'):
+                continue
+            if name in WARMUP_STAGES:
+                functions[name]()
+            times = [_timed(functions[name]) for _ in range(repeat)]
+            entry = {
+                'min_s': min(times),
+                'median_s': statistics.median(times),
+                'repeat': repeat,
+            }
+            if memory:
+                entry['peak_mb'] = _peak_memory(functions[name])
+            entry['rows'] = len(state['df'])
+            if name in stages:
+                report[name] = entry
+        # Máximo histórico del proceso: incluye las escalas medidas antes
+        report['_process'] = {'cumulative_max_rss_mb': max_rss_mb()}
+    return report
+
+
+# ============================================================================
+# Resultados y comparación
+# ============================================================================
+
+def environment():
+    """Datos de la máquina y versiones, para interpretar los resultados."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def run_benchmarks(scales=tuple(SCALES), stages=STAGES, repeat=3, memory=True):
+    """Correr todas las escalas pedidas; devuelve el documento de resultados."""
+    results = {'environment': environment(), 'scales': {}}
+    for scale in scales:
+        if scale not in SCALES:
+            raise ValueError(f"Escala desconocida: {scale!r}. Disponibles: {', '.join(SCALES)}")
+        if scale == 'real':
+            from data_loader import DEFAULT_ZIP
+
+            if not DEFAULT_ZIP.exists():
+                print(f"  (se omite 'real': no existe {DEFAULT_ZIP})")
+                continue
+        print(f"Escala {scale}...", flush=True)
+        results['scales'][scale] = run_scale(scale, stages, repeat, memory)
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """Comparar contra una línea base; devuelve una lista de filas (dict).
+
+    Una etapa es regresión si su tiempo mínimo (o su pico de memoria)
+    supera al de la línea base en más de `threshold` (0.2 = 20 %) y en más
+    del piso absoluto `MIN_TIME_DELTA` / `MIN_MEMORY_DELTA_MB`.
+    """
+    rows = []
+    for scale, stages in results['scales'].items():
+        base_stages = baseline.get('scales', {}).get(scale, {})
+        for stage, entry in stages.items():
+            base = base_stages.get(stage)
+            if stage.startswith('_') or base is None:
+                continue
+            for metric, floor in (('min_s', MIN_TIME_DELTA), ('peak_mb', MIN_MEMORY_DELTA_MB)):
+                if metric not in entry or metric not in base:
+                    continue
+                new, old = entry[metric], base[metric]
+                ratio = new / old if old else float('inf')
+                regression = ratio > 1 + threshold and new - old > floor
+                rows.append({'scale': scale, 'stage': stage, 'metric': metric,
+                             'baseline': old, 'current': new, 'ratio': ratio,
+                             'regression': regression})
+    return rows
+
+
+def print_results(results):
+    for scale, stages in results['scales'].items():
+        rows = next(e['rows'] for k, e in stages.items() if not k.startswith('_'))
+        rss = stages['_process'].get('cumulative_max_rss_mb')
+        rss = f"{rss:.0f} MiB" if rss is not None else '-'
+        print(f"\n{scale} ({rows:,} filas, RSS máx. acumulado del proceso {rss})")
+        print(f"  {'etapa':<12}{'mín (s)':>10}{'mediana (s)':>13}{'pico (MiB)':>12}")
+        for stage, entry in stages.items():
+            if stage.startswith('_'):
+                continue
+            peak = f"{entry['peak_mb']:.1f}" if 'peak_mb' in entry else '-'
+            print(f"  {stage:<12}{entry['min_s']:>10.4f}{entry['median_s']:>13.4f}{peak:>12}")
+
+
+def print_comparison(rows, threshold):
+    regressions = [r for r in rows if r['regression']]
+    print(f"\nComparación con la línea base (umbral +{threshold:.0%}):")
+    for r in rows:
+        flag = '  ✗ REGRESIÓN' if r['regression'] else ''
+        print(f"  {r['scale']:<6}{r['stage']:<12}{r['metric']:<9}"
+              f"{r['baseline']:>10.4f} → {r['current']:<10.4f}({r['ratio']:.2f}x){flag}")
+    if regressions:
+        print(f"\n✗ {len(regressions)} regresiones")
+    else:
+        print("\n✓ Sin regresiones")
+    return regressions
+
+
+def _write_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa del análisis")
+    parser.add_argument('--scales', default=','.join(SCALES),
+                        help=f"Escalas separadas por comas (disponibles: {', '.join(SCALES)})")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Etapas separadas por comas (disponibles: {', '.join(STAGES)})")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por etapa")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="No medir el pico de memoria (evita la pasada con tracemalloc)")
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), help="JSON de resultados")
+    parser.add_argument('--save-baseline', default=None,
+                        help="Guardar también los resultados como línea base en esta ruta")
+    parser.add_argument('--compare', default=None, help="Línea base contra la cual comparar")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Empeoramiento relativo tolerado antes de marcar regresión")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f"✗ Etapas desconocidas: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    try:
+        results = run_benchmarks([s.strip() for s in args.scales.split(',') if s.strip()],
+                                 stages, args.repeat, not args.no_memory)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    print_results(results)
+    _write_json(args.output, results)
+    print(f"\n✓ Resultados guardados en '{args.output}'")
+    if args.save_baseline:
+        _write_json(args.save_baseline, results)
+        print(f"✓ Línea base guardada en '{args.save_baseline}'")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        results['comparison'] = compare(results, baseline, args.threshold)
+        _write_json(args.output, results)
+        if print_comparison(results['comparison'], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Intervalos de confianza bootstrap para las probabilidades del análisis
+======================================================================
+En lugar de remuestrear filas del DataFrame, cada réplica se obtiene como
+una muestra multinomial de la tabla de conteos (mismo total, probabilidades
+= frecuencias observadas). Es equivalente al bootstrap no paramétrico de
+filas, pero cuesta O(celdas) por réplica en vez de O(filas), así que 100k
+réplicas se calculan en segundos.
+
+Las réplicas se generan por lotes, cada uno con su propio flujo aleatorio
+derivado de una `SeedSequence`; el resultado es reproducible y no depende
+del número de procesos usados.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BATCH_SIZE = 10_000
+
+STATISTICS = ['P(S|E)', 'P(E|S)', 'P(E∩S)', 'P(E)']
+
+
+def _as_table(table):
+    """Aceptar un DataFrame de conteos o un objeto con método `table()`."""
+    if hasattr(table, 'table') and callable(table.table):
+        return table.table()
+    return table
+
+
+def _statistics(samples, positive_col):
+    """Probabilidades derivadas de un arreglo de tablas (réplicas, grupos, resultados).
+
+    Devuelve un arreglo (réplicas, estadísticos, grupos) en el orden de
+    `STATISTICS` y un arreglo (réplicas,) con P(S).
+    """
+    samples = samples.astype(np.float64, copy=False)
+    totals = samples.sum(axis=(1, 2))[:, np.newaxis]
+    group_totals = samples.sum(axis=2)
+    positive = samples[:, :, positive_col]
+    positive_totals = positive.sum(axis=1)[:, np.newaxis]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stats = np.stack([
+            positive / group_totals,        # P(S|E)
+            positive / positive_totals,     # P(E|S)
+            positive / totals,              # P(E∩S)
+            group_totals / totals,          # P(E)
+        ], axis=1)
+        prob_positive = positive_totals[:, 0] / totals[:, 0]
+    return stats, prob_positive
+
+
+def _bootstrap_batch(counts, positive_col, n_replicates, seed_sequence):
+    """Generar un lote de réplicas multinomiales y sus estadísticos."""
+    rng = np.random.default_rng(seed_sequence)
+    total = int(counts.sum())
+    probs = counts.ravel() / total
+    samples = rng.multinomial(total, probs, size=n_replicates)
+    return _statistics(samples.reshape((n_replicates,) + counts.shape), positive_col)
+
+
+def bootstrap_probabilities(table, positive='yes', n_boot=10_000, confidence=0.95,
+                            seed=42, workers=1, batch_size=DEFAULT_BATCH_SIZE):
+    """Intervalos de confianza percentil para P(S|E), P(E|S), P(E∩S) y P(E).
+
+    Parámetros:
+        table: tabla de conteos grupos × resultados (`counts.count_table`)
+            o un objeto `BayesCounts`
+        positive: etiqueta del resultado de interés
+        n_boot: número de réplicas bootstrap
+        confidence: nivel de confianza del intervalo
+        seed: semilla de la `SeedSequence` de la que se derivan los lotes
+        workers: procesos para repartir los lotes (1 = sin pool)
+        batch_size: réplicas por lote (acota la memoria por lote)
+
+    Devuelve un DataFrame con una fila por (estadístico, grupo) y columnas
+    'estimate', 'ci_low', 'ci_high', más una fila ('P(S)', 'total').
+    """
+    table = _as_table(table)
+    counts = table.to_numpy(dtype=np.int64)
+    groups = list(table.index)
+    positive_col = list(table.columns).index(positive)
+
+    batch_sizes = [min(batch_size, n_boot - start) for start in range(0, n_boot, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    args = [(counts, positive_col, n, s) for n, s in zip(batch_sizes, seeds)]
+
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_bootstrap_batch, *zip(*args)))
+    else:
+        results = [_bootstrap_batch(*a) for a in args]
+
+    replicate_stats = np.concatenate([r[0] for r in results])
+    replicate_positive = np.concatenate([r[1] for r in results])
+    point_stats, point_positive = _statistics(counts[np.newaxis], positive_col)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(replicate_stats, [alpha, 1 - alpha], axis=0)
+    p_low, p_high = np.nanquantile(replicate_positive, [alpha, 1 - alpha])
+
+    rows = []
+    for k, name in enumerate(STATISTICS):
+        for g, group in enumerate(groups):
+            rows.append((name, group, point_stats[0, k, g], low[k, g], high[k, g]))
+    rows.append(('P(S)', 'total', point_positive[0], p_low, p_high))
+
+    result = pd.DataFrame(rows, columns=['statistic', 'group', 'estimate', 'ci_low', 'ci_high'])
+    return result.set_index(['statistic', 'group'])
@@ -0,0 +1,99 @@
+"""
+Representación compacta del DataFrame del análisis
+===================================================
+Las columnas de etiquetas (age_group, job, y, ...) se guardan como
+`category` con códigos int8, y las columnas enteras (age, duration, ...)
+con el tipo entero más angosto que admite su rango. Así cada comparación
+trabaja sobre códigos de 1 byte en lugar de comparar cadenas fila a fila.
+"""
+
+import numpy as np
+import pandas as pd
+
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def smallest_int_dtype(min_value, max_value):
+    """Tipo entero con signo más pequeño que contiene [min_value, max_value]."""
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return np.dtype(dtype)
+    raise OverflowError(f"Rango fuera de int64: [{min_value}, {max_value}]")
+
+
+def _is_label(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def compact_frame(df):
+    """Convertir `df` a la representación compacta (devuelve un DataFrame nuevo).
+
+    - Columnas de texto -> `category` (códigos int8 si hay < 128 etiquetas)
+    - Columnas enteras -> el entero con signo más angosto posible
+    - Las columnas float y las ya categóricas se mantienen
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if _is_label(series):
+            columns[col] = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series.dtype) and len(series):
+            values = series.to_numpy()
+            columns[col] = values.astype(
+                smallest_int_dtype(values.min(), values.max()), copy=False)
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def expand_frame(df):
+    """Representación "ingenua" equivalente: etiquetas como objetos Python e int64.
+
+    Es la forma en que el script original construía el DataFrame; se usa
+    como referencia para el reporte de memoria.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            columns[col] = series.astype(object)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            columns[col] = series.astype(np.int64)
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def memory_report(df, reference=None):
+    """Tabla de memoria por columna (bytes reales, incluidos los objetos).
+
+    Compara `df` contra `reference` (por defecto su versión expandida) y
+    devuelve un DataFrame con el tipo y los bytes de cada columna.
+    """
+    if reference is None:
+        reference = expand_frame(df)
+
+    before = reference.memory_usage(deep=True, index=False)
+    after = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype_antes': reference.dtypes.astype(str),
+        'bytes_antes': before,
+        'dtype_despues': df.dtypes.astype(str),
+        'bytes_despues': after,
+    })
+    report.loc['TOTAL'] = ['', before.sum(), '', after.sum()]
+    return report
+
+
+def print_memory_report(df, reference=None):
+    """Imprimir el reporte de memoria con el factor de reducción total."""
+    report = memory_report(df, reference)
+    total_before = report.loc['TOTAL', 'bytes_antes']
+    total_after = report.loc['TOTAL', 'bytes_despues']
+
+    print("Huella de memoria (antes → después):")
+    print(report.to_string())
+    ratio = total_before / total_after if total_after else float('nan')
+    print(f"Reducción: {total_before/1024:.1f} KB → {total_after/1024:.1f} KB "
+          f"({ratio:.1f}x menos memoria)")
@@ -0,0 +1,190 @@
+"""
+Comparación de las variantes del dataset en paralelo
+====================================================
+bank+marketing.zip trae cuatro variantes (bank, bank-full,
+bank-additional y bank-additional-full). Este modo corre el análisis de la
+sección 3 sobre todas (o sobre una lista de CSV propios) en un pool de
+procesos y arma un solo reporte con las variantes lado a lado.
+
+Cada proceso lee solo las columnas que necesita (`age` o la columna de
+grupos, y `y`) y devuelve únicamente la tabla de contingencia y el test
+Chi-cuadrado: unos pocos números por variante, no el DataFrame. Las
+probabilidades se derivan de esa tabla en el proceso principal.
+
+Ejemplos:
+    python compare_datasets.py
+    python compare_datasets.py --group job --output data/comparacion.xlsx
+    python compare_datasets.py --files mis_datos/campania_2024.csv bank-full
+"""
+
+import argparse
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_loader import AGE_GROUPS, DATASETS, DEFAULT_ZIP
+
+DEFAULT_SOURCES = list(DATASETS)
+
+
+def _needed_columns(group_col, target):
+    return ['age', target] if group_col == 'age_group' else [group_col, target]
+
+
+def _load(source, group_col, target, zip_path, sep):
+    """Leer de `source` solo las columnas del análisis (zip del UCI o CSV local)."""
+    from data_loader import _column_dtypes, add_age_group
+    from compact import compact_frame
+
+    usecols = _needed_columns(group_col, target)
+    if Path(source).suffix.lower() == '.csv' and Path(source).exists():
+        dtypes = {c: t for c, t in _column_dtypes().items() if c in usecols}
+        df = compact_frame(pd.read_csv(source, sep=sep, usecols=usecols, dtype=dtypes))
+    else:
+        import data_cache
+
+        df = data_cache.cached_bank_dataset(source, zip_path, usecols=usecols)
+    return add_age_group(df) if group_col == 'age_group' else df
+
+
+def analyse_source(source, group_col='age_group', target='y', zip_path=DEFAULT_ZIP, sep=';'):
+    """Trabajo de cada proceso: tabla de conteos y Chi-cuadrado de una variante.
+
+    Devuelve un diccionario pequeño y serializable; si la variante no se
+    puede leer, el error va en `error` en lugar de detener a las demás.
+    """
+    from counts import count_table
+    from independence import chi2_statistic
+
+    started = time.perf_counter()
+    try:
+        df = _load(source, group_col, target, zip_path, sep)
+        loaded = time.perf_counter()
+        table = count_table(df, group_col, target)
+        chi2, p_value, dof, _ = chi2_statistic(table)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, pd.errors.ParserError) as e:
+        return {'source': source, 'error': f"{type(e).__name__}: {e}"}
+    return {
+        'source': source,
+        'rows': len(df),
+        'groups': [str(g) for g in table.index],
+        'outcomes': [str(o) for o in table.columns],
+        'counts': table.to_numpy(dtype=np.int64).tolist(),
+        'chi2': {'chi2': float(chi2), 'p_value': float(p_value), 'dof': int(dof)},
+        'load_s': loaded - started,
+        'compute_s': time.perf_counter() - loaded,
+    }
+
+
+def run_comparison(sources=DEFAULT_SOURCES, group_col='age_group', target='y',
+                   zip_path=DEFAULT_ZIP, workers=None, sep=';'):
+    """Analizar cada variante en un proceso; devuelve los agregados en el orden de `sources`."""
+    sources = list(sources)
+    workers = workers or min(len(sources), os.cpu_count() or 1)
+    if workers <= 1 or len(sources) == 1:
+        return [analyse_source(s, group_col, target, zip_path, sep) for s in sources]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyse_source, s, group_col, target, zip_path, sep)
+                   for s in sources]
+        return [f.result() for f in futures]
+
+
+def comparison_frame(aggregates, positive='yes', groups=None):
+    """Reporte lado a lado: una fila por métrica y una columna por variante."""
+    from counts import probability_tables
+
+    columns = {}
+    for agg in aggregates:
+        if 'error' in agg:
+            continue
+        table = pd.DataFrame(agg['counts'], index=agg['groups'], columns=agg['outcomes'])
+        order = groups or agg['groups']
+        summary = probability_tables(table, positive=positive, groups=order)
+        metrics = {('Filas', ''): agg['rows'], ('P(S)', ''): summary['prob_subscribe']}
+        for name, key in (('P(S|E)', None), ('P(E)', 'marginal_probs'),
+                          ('P(E|S)', 'bayes_results'), ('P(E∩S)', 'joint_probs')):
+            for g in order:
+                metrics[(name, g)] = (summary['conditional_probs'][g]['prob_yes']
+                                      if key is None else summary[key][g])
+        metrics[('χ²', '')] = agg['chi2']['chi2']
+        metrics[('p-valor', '')] = agg['chi2']['p_value']
+        metrics[('Tiempo (s)', '')] = agg['load_s'] + agg['compute_s']
+        columns[agg['source']] = metrics
+    frame = pd.DataFrame(columns)
+    frame.index = pd.MultiIndex.from_tuples(frame.index, names=['métrica', 'grupo'])
+    return frame
+
+
+def print_comparison(frame, aggregates):
+    print("\nCOMPARACIÓN ENTRE VARIANTES DEL DATASET")
+    print("="*70)
+
+    def fmt(value):
+        if isinstance(value, (int, np.integer)) or float(value).is_integer() and value > 1:
+            return f"{int(value):,}"
+        return f"{value:.6f}" if abs(value) < 1 else f"{value:.4f}"
+
+    print(frame.to_string(formatters={c: fmt for c in frame.columns}))
+    for agg in aggregates:
+        if 'error' in agg:
+            print(f"✗ {agg['source']}: {agg['error']}")
+    print()
+
+
+def write_report(frame, path):
+    """Guardar el reporte (formato según la extensión, como `export.export_frame`)."""
+    from export import export_frame
+
+    flat = frame.reset_index()
+    return export_frame(flat, path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Análisis de la sección 3 sobre varias variantes del dataset en paralelo")
+    parser.add_argument('--files', nargs='+', default=DEFAULT_SOURCES,
+                        help="Variantes del zip y/o CSV propios (por defecto las cuatro del zip: "
+                             f"{', '.join(DEFAULT_SOURCES)})")
+    parser.add_argument('--group', default='age_group',
+                        help="Columna de grupos (por defecto age_group, desde 'age')")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos (por defecto uno por variante, hasta el número de CPUs)")
+    parser.add_argument('--sep', default=';', help="Separador de los CSV propios")
+    parser.add_argument('--output', default=None,
+                        help="Guardar el reporte (.csv, .json, .xlsx, .parquet)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    aggregates = run_comparison(args.files, args.group, workers=args.workers, sep=args.sep)
+    elapsed = time.perf_counter() - started
+
+    groups = AGE_GROUPS if args.group == 'age_group' else None
+    frame = comparison_frame(aggregates, groups=groups)
+    if frame.empty:
+        for agg in aggregates:
+            print(f"✗ {agg['source']}: {agg['error']}", file=sys.stderr)
+        return 1
+    print_comparison(frame, aggregates)
+    print(f"{len(aggregates)} variantes en {elapsed:.2f} s")
+
+    if args.output:
+        try:
+            path = write_report(frame, args.output)
+        except (ImportError, ValueError) as e:
+            print(f"✗ No se pudo guardar el reporte: {e}", file=sys.stderr)
+            return 1
+        print(f"✓ Reporte guardado en '{path}'")
+    return 1 if any('error' in agg for agg in aggregates) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
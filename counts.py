@@ -0,0 +1,306 @@
+"""
+Motor de conteos para las secciones de probabilidad
+====================================================
+Construye la tabla de contingencia conjunta de dos columnas categóricas en
+una sola pasada sobre sus códigos (bincount) y deriva de ella todas las
+probabilidades del análisis: marginales, condicionales, conjuntas y las
+posteriores del Teorema de Bayes.
+
+Funciona con cualquier columna categórica (age_group, job, marital,
+contact, poutcome, ...), no solo con los grupos de edad.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _codes(series):
+    """Códigos enteros y etiquetas de una columna (los nulos quedan en -1)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), list(series.cat.categories)
+    codes, labels = pd.factorize(series, sort=True)
+    return codes, list(labels)
+
+
+def count_table(df, row_col, col_col='y'):
+    """Tabla de contingencia de `row_col` × `col_col` en una sola pasada.
+
+    Equivale a `pd.crosstab(df[row_col], df[col_col])` pero combina los
+    códigos de ambas columnas en un índice plano y los cuenta con
+    `np.bincount`, sin filtrar ni copiar el DataFrame por cada grupo.
+    """
+    row_codes, row_labels = _codes(df[row_col])
+    col_codes, col_labels = _codes(df[col_col])
+
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    if not valid.all():
+        row_codes, col_codes = row_codes[valid], col_codes[valid]
+
+    n_rows, n_cols = len(row_labels), len(col_labels)
+    flat = row_codes.astype(np.int64) * n_cols + col_codes
+    counts = np.bincount(flat, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+    return pd.DataFrame(
+        counts,
+        index=pd.Index(row_labels, name=row_col),
+        columns=pd.Index(col_labels, name=col_col),
+    )
+
+
+def probability_tables(table, positive='yes', groups=None):
+    """Derivar todas las probabilidades del análisis a partir de los conteos.
+
+    Parámetros:
+        table: tabla de contingencia (grupos en filas, resultado en columnas)
+        positive: etiqueta del resultado de interés (suscripción = 'yes')
+        groups: orden de los grupos en los resultados (por defecto el de la tabla)
+
+    Devuelve un diccionario con las mismas estructuras que usa codigo.py:
+    `conditional_probs`, `marginal_probs`, `bayes_results`, `bayes_details`
+    y `joint_probs`, además de los totales.
+    """
+    if groups is None:
+        groups = list(table.index)
+    table = table.reindex(index=groups, fill_value=0)
+
+    counts = table.to_numpy(dtype=np.int64)
+    total_clients = int(counts.sum())
+    group_totals = counts.sum(axis=1)
+    positive_counts = (table[positive].to_numpy(dtype=np.int64)
+                       if positive in table.columns
+                       else np.zeros(len(groups), dtype=np.int64))
+    subscribed = int(positive_counts.sum())
+    not_subscribed = total_clients - subscribed
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prob_subscribe = subscribed / total_clients if total_clients else np.nan
+        prob_yes = positive_counts / group_totals
+        marginal = group_totals / total_clients if total_clients else np.full(len(groups), np.nan)
+        joint = positive_counts / total_clients if total_clients else np.full(len(groups), np.nan)
+        posterior = positive_counts / subscribed if subscribed else np.full(len(groups), np.nan)
+
+    conditional_probs = {}
+    marginal_probs = {}
+    bayes_results = {}
+    bayes_details = {}
+    joint_probs = {}
+
+    for i, group in enumerate(groups):
+        conditional_probs[group] = {
+            'total': int(group_totals[i]),
+            'subscribed': int(positive_counts[i]),
+            'not_subscribed': int(group_totals[i] - positive_counts[i]),
+            'prob_yes': float(prob_yes[i]),
+            'prob_no': float(1 - prob_yes[i])
+        }
+        marginal_probs[group] = float(marginal[i])
+        joint_probs[group] = float(joint[i])
+        bayes_results[group] = float(posterior[i])
+        bayes_details[group] = {
+            'likelihood': float(prob_yes[i]),
+            'prior': float(marginal[i]),
+            'evidence': float(prob_subscribe),
+            'numerator': float(prob_yes[i] * marginal[i]),
+            'posterior': float(posterior[i])
+        }
+
+    return {
+        'total': total_clients,
+        'subscribed': subscribed,
+        'not_subscribed': not_subscribed,
+        'prob_subscribe': float(prob_subscribe),
+        'prob_not_subscribe': float(1 - prob_subscribe),
+        'conditional_probs': conditional_probs,
+        'marginal_probs': marginal_probs,
+        'joint_probs': joint_probs,
+        'bayes_results': bayes_results,
+        'bayes_details': bayes_details,
+    }
+
+
+def probability_summary(df, column, target_col='y', positive='yes', groups=None):
+    """Atajo: tabla de conteos y probabilidades de `column` frente a `target_col`."""
+    table = count_table(df, column, target_col)
+    summary = probability_tables(table, positive=positive, groups=groups)
+    summary['table'] = table
+    return summary
+
+
+class BayesCounts:
+    """Estadísticos suficientes para el Teorema de Bayes: la tabla conjunta.
+
+    Todas las probabilidades de las secciones 3.1-3.6 dependen solo de los
+    conteos `grupo × resultado`, así que basta con guardar esa tabla para
+    mantenerlas al día: cada lote nuevo se suma con `update` (costo
+    proporcional al lote, no al histórico), un lote viejo se quita con
+    `subtract_table` y los conteos de otro shard o proceso se combinan con
+    `merge` o `+`.
+    """
+
+    def __init__(self, row_col, col_col='y', positive='yes',
+                 groups=(), outcomes=(), counts=None):
+        self.row_col = row_col
+        self.col_col = col_col
+        self.positive = positive
+        self.groups = list(groups)
+        self.outcomes = list(outcomes)
+        if counts is None:
+            counts = np.zeros((len(self.groups), len(self.outcomes)), dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, df, row_col, col_col='y', positive='yes', groups=None):
+        """Construir los conteos a partir de un DataFrame (una sola pasada)."""
+        stats = cls(row_col, col_col, positive, groups=groups or ())
+        return stats.update(df)
+
+    @classmethod
+    def from_table(cls, table, positive='yes'):
+        """Construir los conteos a partir de una tabla de `count_table`."""
+        return cls(table.index.name, table.columns.name, positive,
+                   groups=table.index, outcomes=table.columns,
+                   counts=table.to_numpy())
+
+    # ------------------------------------------------------------------
+    # Actualización y combinación
+    # ------------------------------------------------------------------
+
+    def _align(self, groups, outcomes):
+        """Agregar filas/columnas para etiquetas nuevas y devolver sus posiciones."""
+        new_groups = [g for g in groups if g not in self.groups]
+        new_outcomes = [o for o in outcomes if o not in self.outcomes]
+        if new_groups or new_outcomes:
+            self.counts = np.pad(self.counts,
+                                 ((0, len(new_groups)), (0, len(new_outcomes))))
+            self.groups += new_groups
+            self.outcomes += new_outcomes
+        row_pos = {g: i for i, g in enumerate(self.groups)}
+        col_pos = {o: j for j, o in enumerate(self.outcomes)}
+        return ([row_pos[g] for g in groups], [col_pos[o] for o in outcomes])
+
+    def add_table(self, table):
+        """Sumar una tabla de contingencia (DataFrame grupos × resultados)."""
+        rows, cols = self._align(list(table.index), list(table.columns))
+        self.counts[np.ix_(rows, cols)] += table.to_numpy(dtype=np.int64)
+        return self
+
+    def subtract_table(self, table):
+        """Restar una tabla sumada antes (por ejemplo el periodo que sale de una ventana).
+
+        Se valida antes de tocar el acumulador: si la resta se rechaza, los
+        conteos quedan como estaban.
+        """
+        values = table.to_numpy(dtype=np.int64)
+        known_rows = np.array([g in self.groups for g in table.index], dtype=bool)
+        known_cols = np.array([o in self.outcomes for o in table.columns], dtype=bool)
+        # Las etiquetas que el acumulador no tiene solo pueden traer ceros
+        if values[~known_rows].any() or values[:, ~known_cols].any():
+            raise ValueError("La tabla a restar tiene etiquetas que no están en los acumulados")
+        rows = [self.groups.index(g) for g in table.index[known_rows]]
+        cols = [self.outcomes.index(o) for o in table.columns[known_cols]]
+        remaining = self.counts[np.ix_(rows, cols)] - values[np.ix_(known_rows, known_cols)]
+        if (remaining < 0).any():
+            raise ValueError("La tabla a restar tiene más conteos que los acumulados")
+        self.counts[np.ix_(rows, cols)] = remaining
+        return self
+
+    def update(self, df):
+        """Sumar un lote nuevo de filas sin volver a recorrer el histórico."""
+        return self.add_table(count_table(df, self.row_col, self.col_col))
+
+    def merge(self, other):
+        """Combinar con los conteos de otro shard o proceso (devuelve uno nuevo)."""
+        if (other.row_col, other.col_col) != (self.row_col, self.col_col):
+            raise ValueError(
+                f"No se pueden combinar conteos de ({self.row_col}, {self.col_col}) "
+                f"con ({other.row_col}, {other.col_col})"
+            )
+        merged = self.copy()
+        merged.add_table(other.table())
+        return merged
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def copy(self):
+        return BayesCounts(self.row_col, self.col_col, self.positive,
+                           self.groups, self.outcomes, self.counts.copy())
+
+    # ------------------------------------------------------------------
+    # Probabilidades bajo demanda
+    # ------------------------------------------------------------------
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def _positive_counts(self):
+        if self.positive not in self.outcomes:
+            return np.zeros(len(self.groups), dtype=np.int64)
+        return self.counts[:, self.outcomes.index(self.positive)]
+
+    def _by_group(self, values):
+        return {g: float(v) for g, v in zip(self.groups, values)}
+
+    def prob_positive(self):
+        """P(S): probabilidad marginal del resultado positivo."""
+        total = self.total
+        return float(self._positive_counts().sum() / total) if total else float('nan')
+
+    def prob_group(self):
+        """P(E) para cada grupo."""
+        total = self.total
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._by_group(self.counts.sum(axis=1) / total)
+
+    def prob_positive_given_group(self):
+        """P(S|E) para cada grupo."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._by_group(self._positive_counts() / self.counts.sum(axis=1))
+
+    def prob_group_given_positive(self):
+        """P(E|S) para cada grupo (posterior de Bayes)."""
+        positive = self._positive_counts()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._by_group(positive / positive.sum())
+
+    def joint(self):
+        """P(E ∩ S) para cada grupo."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._by_group(self._positive_counts() / self.total)
+
+    def table(self):
+        """Tabla de contingencia acumulada como DataFrame."""
+        return pd.DataFrame(
+            self.counts,
+            index=pd.Index(self.groups, name=self.row_col),
+            columns=pd.Index(self.outcomes, name=self.col_col),
+        )
+
+    def summary(self, groups=None):
+        """Todas las probabilidades en el formato de `probability_tables`."""
+        return probability_tables(self.table(), positive=self.positive, groups=groups)
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+
+    def to_dict(self):
+        """Representación serializable (JSON) para guardar entre lotes."""
+        return {
+            'row_col': self.row_col,
+            'col_col': self.col_col,
+            'positive': self.positive,
+            'groups': [str(g) for g in self.groups],
+            'outcomes': [str(o) for o in self.outcomes],
+            'counts': self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['row_col'], data['col_col'], data['positive'],
+                   data['groups'], data['outcomes'], data['counts'])
+
+    def __repr__(self):
+        return (f"BayesCounts({self.row_col!r} × {self.col_col!r}, "
+                f"grupos={len(self.groups)}, total={self.total})")
@@ -0,0 +1,273 @@
+"""
+Cubo de conteos N-dimensional para consultas de probabilidad
+============================================================
+Cuenta en una sola pasada todas las combinaciones de varias columnas
+categóricas (grupo de edad, job, marital, education, contact, month,
+poutcome, y): los códigos de cada fila se combinan en un índice plano
+(`np.ravel_multi_index`) y se cuentan con `np.bincount`.
+
+Después cualquier probabilidad condicional se responde sumando ejes del
+cubo, sin volver a recorrer el DataFrame:
+
+    cube = CountCube.from_frame(df)
+    cube.prob({'y': 'yes'}, given={'job': 'student', 'contact': 'cellular'})
+    cube.distribution('month', given={'y': 'yes'})
+    cube.query("y=yes | job=student, contact=cellular")
+
+El cubo completo del dataset real tiene ~138 mil celdas (~1.1 MB), así que
+cada consulta cuesta lo mismo sin importar cuántas filas tenga el dataset.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from counts import _codes
+
+_CUBE_IDS = itertools.count()
+
+DEFAULT_DIMENSIONS = ['age_group', 'job', 'marital', 'education', 'contact',
+                      'month', 'poutcome', 'y']
+
+# Límite de celdas para evitar cubos que no caben en memoria (int64 = 8 bytes)
+MAX_CELLS = 50_000_000
+
+
+def parse_conditions(text):
+    """Traducir 'job=student, contact=cellular/telephone' a un diccionario.
+
+    Los valores alternativos de una dimensión se separan con '/'; un nombre
+    sin '=' es una dimensión libre (se devuelve con valor None).
+    """
+    conditions = {}
+    for item in text.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        dim, sep, value = item.partition('=')
+        dim = dim.strip()
+        if not sep:
+            conditions[dim] = None
+            continue
+        values = [v.strip() for v in value.split('/')]
+        conditions[dim] = values[0] if len(values) == 1 else values
+    return conditions
+
+
+class CountCube:
+    """Conteos conjuntos de varias dimensiones categóricas.
+
+    Parámetros:
+        dims: nombres de las dimensiones (columnas), en el orden de los ejes
+        labels: etiquetas de cada dimensión
+        counts: arreglo de conteos con un eje por dimensión
+
+    `version` identifica el estado de los conteos: cambia con cada
+    `update`, y cada cubo nuevo (incluidos `copy` y `merge`) tiene su propio
+    identificador, así las cachés de consultas se invalidan solas.
+    """
+
+    def __init__(self, dims, labels, counts=None):
+        self._id = next(_CUBE_IDS)
+        self._updates = 0
+        self.dims = list(dims)
+        self.labels = {d: list(labels[d]) for d in self.dims}
+        shape = tuple(len(self.labels[d]) for d in self.dims)
+        if counts is None:
+            counts = np.zeros(shape, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64).reshape(shape)
+
+    @classmethod
+    def from_frame(cls, df, dims=None):
+        """Construir el cubo desde un DataFrame en una sola pasada.
+
+        Por defecto usa las columnas de `DEFAULT_DIMENSIONS` que existan en
+        `df`. Las filas con algún valor nulo en esas columnas no se cuentan.
+        """
+        dims = [d for d in DEFAULT_DIMENSIONS if d in df.columns] if dims is None else list(dims)
+        cube = cls(dims, {d: [] for d in dims})
+        return cube.update(df)
+
+    # ------------------------------------------------------------------
+    # Actualización y combinación
+    # ------------------------------------------------------------------
+
+    def _align(self, labels):
+        """Agregar etiquetas nuevas (ampliando ejes) y devolver el mapeo de posiciones."""
+        positions = []
+        pad = []
+        for dim in self.dims:
+            new = [v for v in labels[dim] if v not in self.labels[dim]]
+            pad.append((0, len(new)))
+            self.labels[dim] += new
+            index = {v: i for i, v in enumerate(self.labels[dim])}
+            positions.append(np.array([index[v] for v in labels[dim]], dtype=np.int64))
+        if any(after for _, after in pad):
+            self.counts = np.pad(self.counts, pad)
+        return positions
+
+    def _check_size(self, shape):
+        cells = int(np.prod(shape, dtype=np.int64))
+        if cells > MAX_CELLS:
+            raise MemoryError(f"El cubo tendría {cells:,} celdas (máximo {MAX_CELLS:,}); "
+                              "usa menos dimensiones")
+
+    def update(self, df):
+        """Sumar un lote de filas (bincount sobre el índice plano de los códigos)."""
+        codes, labels = [], {}
+        for dim in self.dims:
+            dim_codes, labels[dim] = _codes(df[dim])
+            codes.append(dim_codes)
+        self._check_size([len(set(self.labels[d]) | set(labels[d])) for d in self.dims])
+        positions = self._align(labels)
+
+        valid = np.ones(len(df), dtype=bool)
+        for dim_codes in codes:
+            valid &= dim_codes >= 0
+        mapped = [pos[c[valid]] for pos, c in zip(positions, codes)]
+        if not mapped:
+            return self
+        flat = np.ravel_multi_index(mapped, self.counts.shape)
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+        self._updates += 1
+        return self
+
+    def merge(self, other):
+        """Combinar con el cubo de otro lote o proceso (mismas dimensiones)."""
+        if other.dims != self.dims:
+            raise ValueError(f"Dimensiones distintas: {self.dims} y {other.dims}")
+        merged = self.copy()
+        positions = merged._align(other.labels)
+        merged.counts[np.ix_(*positions)] += other.counts
+        merged._updates += 1
+        return merged
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def copy(self):
+        return CountCube(self.dims, self.labels, self.counts.copy())
+
+    @property
+    def version(self):
+        """(identificador del cubo, número de actualizaciones)."""
+        return (self._id, self._updates)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _axis(self, dim):
+        try:
+            return self.dims.index(dim)
+        except ValueError:
+            raise KeyError(f"Dimensión desconocida: {dim!r}. Disponibles: {self.dims}") from None
+
+    def _positions(self, dim, values):
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        if dim not in self.labels:
+            raise KeyError(f"Columna desconocida: {dim!r}")
+        labels = self.labels[dim]
+        # Los valores llegan como texto desde `query`; se comparan también como cadena
+        by_text = {str(v): i for i, v in enumerate(labels)}
+        positions = []
+        for v in values:
+            if v in labels:
+                positions.append(labels.index(v))
+            elif str(v) in by_text:
+                positions.append(by_text[str(v)])
+            else:
+                raise KeyError(f"Valor desconocido para {dim!r}: {v!r}")
+        return positions
+
+    def _condition(self, where):
+        """Cubo restringido a las condiciones `where` (se conservan todos los ejes)."""
+        counts = self.counts
+        for dim, values in (where or {}).items():
+            if values is None:
+                continue
+            counts = np.take(counts, self._positions(dim, values), axis=self._axis(dim))
+        return counts
+
+    def count(self, where=None):
+        """Número de filas que cumplen todas las condiciones de `where`."""
+        return int(self._condition(where).sum())
+
+    def prob(self, event, given=None):
+        """P(event | given) para diccionarios dimensión -> valor (o lista de valores)."""
+        given = given or {}
+        overlap = set(event) & set(given)
+        if overlap:
+            raise ValueError(f"Dimensiones repetidas en el evento y la condición: {overlap}")
+        denominator = self.count(given)
+        if not denominator:
+            return float('nan')
+        return self.count({**given, **event}) / denominator
+
+    def marginal(self, dims, where=None):
+        """Conteos de `dims` (una o varias dimensiones) restringidos a `where`.
+
+        Devuelve una Series (índice simple o MultiIndex) con una entrada por
+        combinación de etiquetas, en el orden de `dims`.
+        """
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        counts = self._condition(where)
+        axes = [self._axis(d) for d in dims]
+        other = tuple(i for i in range(counts.ndim) if i not in axes)
+        reduced = counts.sum(axis=other)
+        # Los ejes sobrevivientes quedan en orden creciente: reordenar como `dims`
+        order = np.argsort(np.argsort(axes))
+        reduced = np.transpose(reduced, order) if len(dims) > 1 else reduced
+
+        kept = {d: self.labels[d] for d in dims}
+        for dim, values in (where or {}).items():
+            if dim in kept and values is not None:
+                kept[dim] = [self.labels[dim][i] for i in self._positions(dim, values)]
+        if len(dims) == 1:
+            index = pd.Index(kept[dims[0]], name=dims[0])
+        else:
+            index = pd.MultiIndex.from_product([kept[d] for d in dims], names=dims)
+        return pd.Series(reduced.reshape(-1), index=index, name='count')
+
+    def distribution(self, dims, given=None):
+        """P(dims | given): distribución condicional como Series que suma 1."""
+        counts = self.marginal(dims, given)
+        total = counts.sum()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (counts / total).rename('probability')
+
+    def table(self, row, col='y', where=None):
+        """Tabla de contingencia `row` × `col` bajo `where` (formato de `counts.count_table`)."""
+        return self.marginal([row, col], where).unstack(col).rename_axis(columns=col)
+
+    def query(self, text):
+        """Responder una consulta escrita como 'evento | condición'.
+
+        - 'y=yes | job=student, contact=cellular' -> probabilidad (float)
+        - 'month | y=yes' -> distribución P(month | y=yes) (Series)
+        - 'job, y' -> distribución conjunta (Series con MultiIndex)
+
+        Varios valores de una dimensión se separan con '/': 'month=may/jun'.
+        """
+        event_text, _, given_text = text.partition('|')
+        event = parse_conditions(event_text)
+        given = {d: v for d, v in parse_conditions(given_text).items() if v is not None}
+        free = [d for d, v in event.items() if v is None]
+        if not free:
+            return self.prob(event, given)
+        fixed = {d: v for d, v in event.items() if v is not None}
+        if not fixed:
+            return self.distribution(free, given)
+        # P(libres, fijas | given) = conteo(libres, fijas, given) / conteo(given)
+        denominator = self.count(given)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self.marginal(free, {**given, **fixed}) / denominator).rename('probability')
+
+    def __repr__(self):
+        shape = ' × '.join(f"{d}[{len(self.labels[d])}]" for d in self.dims)
+        return f"CountCube({shape}, total={self.total})"
@@ -0,0 +1,289 @@
+"""
+Agregados precalculados para el dashboard `analisis`
+====================================================
+El componente React mostraba números fijos (4,521 clientes, grupos de edad,
+trabajos y contacto previo inventados) y recalculaba las probabilidades en
+el navegador. Este módulo genera desde los datos reales un artefacto JSON
+compacto y versionado que el dashboard carga tal cual:
+
+    {
+      "schema": 1, "version": "…", "revision": 3, "dataset": "bank",
+      "rows": 4521, "subscribed": 521, "prob_positive": 0.11524,
+      "dimensions": {
+        "age_group": {"version": "…", "labels": [...], "total": [...],
+                      "subscribed": [...], "p_positive_given": [...],
+                      "p_group": [...], "p_group_given_positive": [...]},
+        ...
+      }
+    }
+
+Cada dimensión guarda su tabla `dimensión × y` (la proyección del cubo de
+conteos) en columnas y las probabilidades ya derivadas, así que el
+navegador no calcula nada y el archivo pesa unos pocos KB aun con todas
+las dimensiones categóricas del dataset completo.
+
+La regeneración es incremental y se decide por la fuente (tamaño y fecha
+del zip, como `query_service.source_version`), no por los datos: si la
+fuente no cambió y el artefacto ya tiene las dimensiones pedidas, no se lee
+nada; si solo faltan dimensiones, se leen únicamente sus columnas. Si la
+fuente cambió se recuentan todas, pero cada dimensión conserva su
+`version` (hash de sus conteos) y el artefacto solo cambia de versión y
+revisión si alguna tabla cambió de verdad.
+
+Ejemplos:
+    python dashboard_data.py                             # bank.csv -> data/dashboard/aggregates.json
+    python dashboard_data.py --dataset bank-additional-full --output aggregates.json.gz
+    python dashboard_data.py --dimensions job,contact    # solo revisar esas dimensiones
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from counts import _codes, count_table
+
+SCHEMA_VERSION = 1
+
+DEFAULT_OUTPUT = Path("data") / "dashboard" / "aggregates.json"
+
+DEFAULT_DATASET = 'bank'
+
+# Dimensiones del dashboard; las que no existan en el dataset se omiten
+DIMENSIONS = ['age_group', 'job', 'marital', 'education', 'default', 'housing', 'loan',
+              'contact', 'month', 'day_of_week', 'poutcome', 'contacted_before']
+
+# Columna del CSV de la que sale cada dimensión derivada
+SOURCE_COLUMNS = {'age_group': 'age', 'contacted_before': 'previous'}
+
+# Decimales de las probabilidades en el artefacto
+PRECISION = 6
+
+
+def add_contacted_before(df):
+    """Columna 'contacted_before' (yes/no): el cliente tuvo contactos en campañas previas."""
+    if 'previous' in df.columns and 'contacted_before' not in df.columns:
+        df['contacted_before'] = np.where(df['previous'].to_numpy() > 0, 'yes', 'no')
+        df['contacted_before'] = df['contacted_before'].astype('category')
+    return df
+
+
+def _digest(parts):
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()[:16]
+
+
+def _rounded(values):
+    return [None if np.isnan(v) else round(float(v), PRECISION) for v in values]
+
+
+def dimension_block(df, dim, target='y', positive='yes'):
+    """Tabla `dim × target` en columnas con sus probabilidades derivadas.
+
+    La `version` del bloque es el hash de sus conteos: no cambia si la
+    tabla no cambió aunque la fuente sí.
+    """
+    table = count_table(df, dim, target)
+    totals = table.sum(axis=1).to_numpy(dtype=np.int64)
+    hits = (table[positive].to_numpy(dtype=np.int64) if positive in table.columns
+            else np.zeros(len(table), dtype=np.int64))
+    rows, subscribed = totals.sum(), hits.sum()
+    labels = [str(g) for g in table.index]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'version': _digest([dim, target, positive, labels,
+                                totals.tolist(), hits.tolist()]),
+            'labels': labels,
+            'total': totals.tolist(),
+            'subscribed': hits.tolist(),
+            'p_positive_given': _rounded(hits / totals),
+            'p_group': _rounded(totals / rows),
+            'p_group_given_positive': _rounded(hits / subscribed),
+        }
+
+
+def _artifact_version(artifact):
+    """Huella del artefacto completo a partir de las versiones de sus dimensiones."""
+    return _digest([artifact['dataset'], artifact['rows'], artifact['subscribed'],
+                    sorted((d, b['version']) for d, b in artifact['dimensions'].items())])
+
+
+def build_artifact(df, dataset, source=None, previous=None, dimensions=None,
+                   target='y', positive='yes'):
+    """Construir el artefacto desde `df`, conservando las demás dimensiones de `previous`.
+
+    `dimensions` son las que se cuentan en `df` (por defecto todas las que
+    tenga); las de `previous` que no se cuentan se copian tal cual.
+    Devuelve (artefacto, lista de dimensiones cuya tabla cambió).
+    """
+    add_contacted_before(df)
+    if dimensions is None:
+        dimensions = [d for d in DIMENSIONS if d in df.columns]
+    unknown = [d for d in dimensions if d not in df.columns]
+    if unknown:
+        raise KeyError(f"Dimensiones que no están en el dataset: {', '.join(unknown)}")
+
+    old = previous['dimensions'] if previous and previous.get('dataset') == dataset else {}
+    blocks = {d: b for d, b in old.items() if d not in dimensions}
+    changed = []
+    for dim in dimensions:
+        block = dimension_block(df, dim, target, positive)
+        if dim in old and old[dim]['version'] == block['version']:
+            block = old[dim]
+        else:
+            changed.append(dim)
+        blocks[dim] = block
+
+    target_codes, outcomes = _codes(df[target])
+    positive_code = outcomes.index(positive) if positive in outcomes else -2
+    subscribed = int(np.count_nonzero(target_codes == positive_code))
+    rows = int(np.count_nonzero(target_codes >= 0))
+    artifact = {
+        'schema': SCHEMA_VERSION,
+        'dataset': dataset,
+        'source': source,
+        'target': target,
+        'positive': positive,
+        'rows': rows,
+        'subscribed': subscribed,
+        'prob_positive': round(subscribed / rows, PRECISION) if rows else None,
+        'dimensions': {d: blocks[d] for d in DIMENSIONS if d in blocks},
+    }
+    artifact['version'] = _artifact_version(artifact)
+    revision = previous.get('revision', 0) if previous else 0
+    same = previous is not None and previous.get('version') == artifact['version']
+    artifact['revision'] = revision if same else revision + 1
+    artifact['generated_at'] = (previous['generated_at'] if same else
+                                time.strftime('%Y-%m-%dT%H:%M:%S'))
+    return artifact, changed
+
+
+def load_artifact(path):
+    """Leer un artefacto existente (.json o .json.gz); None si no existe o no es válido."""
+    path = Path(path)
+    try:
+        raw = path.read_bytes()
+        if path.suffix == '.gz':
+            raw = gzip.decompress(raw)
+        artifact = json.loads(raw)
+    except (OSError, ValueError):
+        return None
+    return artifact if artifact.get('schema') == SCHEMA_VERSION else None
+
+
+def write_artifact(artifact, path):
+    """Escribir el artefacto compacto (gzip si la ruta termina en .gz), de forma atómica."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(artifact, separators=(',', ':'), ensure_ascii=False).encode()
+    if path.suffix == '.gz':
+        data = gzip.compress(data, mtime=0)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return len(data)
+
+
+def load_columns(dataset, dimensions=None, target='y'):
+    """Leer solo las columnas de `dimensions` y `target` (todas si `dimensions` es None)."""
+    import analisis_probabilidad as ap
+
+    if dimensions is None or dataset == ap.SIMULATED:
+        return ap.load_data(dataset)
+
+    import data_cache
+    from data_loader import add_age_group
+
+    usecols = sorted({SOURCE_COLUMNS.get(d, d) for d in dimensions} | {target})
+    try:
+        df = data_cache.cached_bank_dataset(dataset, usecols=usecols)
+    except ValueError as e:
+        raise KeyError(f"El dataset {dataset!r} no tiene todas las columnas "
+                       f"{', '.join(usecols)}") from e
+    return add_age_group(df) if 'age' in df.columns else df
+
+
+def update_artifact(dataset=DEFAULT_DATASET, output=DEFAULT_OUTPUT, dimensions=None, force=False):
+    """Regenerar el artefacto de `dataset` en `output` solo en lo que haya cambiado.
+
+    Con la fuente sin cambios no se lee el dataset, salvo las columnas de
+    las dimensiones pedidas que el artefacto todavía no tiene. Devuelve un
+    diccionario con el estado ('current', 'updated' o 'unchanged'), las
+    dimensiones cuya tabla cambió y el tamaño del archivo.
+    """
+    from query_service import source_version
+
+    previous = None if force else load_artifact(output)
+    if previous is not None and previous.get('dataset') != dataset:
+        previous = None
+    source = source_version(dataset)
+    pending = dimensions
+    if previous is not None and source is not None and previous.get('source') == source:
+        pending = [d for d in (dimensions or []) if d not in previous['dimensions']]
+        if not pending:
+            return {'status': 'current', 'changed': [], 'bytes': Path(output).stat().st_size,
+                    'artifact': previous}
+
+    df = load_columns(dataset, pending)
+    artifact, changed = build_artifact(df, dataset, source, previous, pending)
+    if previous is not None and artifact['version'] == previous.get('version'):
+        # Ninguna tabla cambió: solo se reescribe para registrar la fuente nueva
+        size = (write_artifact(artifact, output) if previous.get('source') != source
+                else Path(output).stat().st_size)
+        return {'status': 'unchanged', 'changed': [], 'bytes': size, 'artifact': artifact}
+    size = write_artifact(artifact, output)
+    return {'status': 'updated', 'changed': changed, 'bytes': size, 'artifact': artifact}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generar los agregados del dashboard desde los datos reales")
+    parser.add_argument('--dataset', default=DEFAULT_DATASET,
+                        help="'simulado' o un CSV de bank+marketing.zip (por defecto 'bank')")
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT),
+                        help="Ruta del artefacto (.json, o .json.gz comprimido)")
+    parser.add_argument('--dimensions', default=None,
+                        help="Revisar solo estas dimensiones, separadas por comas")
+    parser.add_argument('--force', action='store_true',
+                        help="Recalcular todo aunque el artefacto esté al día")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    dimensions = ([d.strip() for d in args.dimensions.split(',') if d.strip()]
+                  if args.dimensions else None)
+    try:
+        result = update_artifact(args.dataset, args.output, dimensions, args.force)
+    except (KeyError, ValueError) as e:
+        print(f"✗ {e.args[0] if e.args else e}", file=sys.stderr)
+        return 2
+
+    artifact = result['artifact']
+    if result['status'] == 'current':
+        print(f"✓ '{args.output}' ya está al día (fuente sin cambios)")
+    elif result['status'] == 'unchanged':
+        print(f"✓ '{args.output}' sin cambios: ninguna dimensión cambió")
+    else:
+        changed = ', '.join(result['changed']) or 'ninguna'
+        print(f"✓ Artefacto guardado en '{args.output}' ({result['bytes']:,} bytes)")
+        print(f"  Dimensiones recalculadas: {changed}")
+    print(f"  {artifact['dataset']}: {artifact['rows']:,} filas, "
+          f"{len(artifact['dimensions'])} dimensiones, versión {artifact['version']} "
+          f"(revisión {artifact['revision']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
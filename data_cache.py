@@ -0,0 +1,242 @@
+"""
+Caché columnar en disco para los datasets del análisis
+=======================================================
+La primera carga de una fuente (la configuración del dataset simulado o un
+CSV dentro de bank+marketing.zip) guarda cada columna como un arreglo
+`.npy`; las columnas categóricas se guardan como códigos enteros pequeños
+junto con sus etiquetas. Las cargas siguientes abren esos arreglos con
+memory-map y no vuelven a procesar el CSV.
+
+La clave de la caché es un hash del contenido de la fuente o de los
+parámetros del generador, así que cualquier cambio la invalida sola. El
+SHA-256 del zip se guarda en `sources.json` junto con su tamaño y fecha de
+modificación: mientras esos dos no cambien, una carga desde la caché no
+vuelve a leer el zip.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import synthetic_data
+
+DEFAULT_CACHE_DIR = Path("data") / "cache"
+
+# Incrementar si cambia el formato en disco o la forma de construir los datos
+CACHE_VERSION = 2
+
+_HASH_BLOCK = 1 << 20
+
+SOURCES_INDEX = "sources.json"
+
+
+def _hash_file(path, digest):
+    """Agregar al hash los bytes de `path`, leídos por bloques."""
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+
+
+def _write_json(path, data):
+    """Escribir JSON de forma atómica (archivo temporal y rename)."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def source_digest(source_path, cache_dir=DEFAULT_CACHE_DIR):
+    """SHA-256 de `source_path`, recalculado solo si cambió su tamaño o su fecha.
+
+    Los hashes ya calculados se guardan en `<cache_dir>/sources.json`.
+    """
+    source_path = Path(source_path).resolve()
+    stat = source_path.stat()
+    version = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    index_path = Path(cache_dir) / SOURCES_INDEX
+    try:
+        index = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        index = {}
+    entry = index.get(str(source_path))
+    if entry is not None and {k: entry.get(k) for k in version} == version:
+        return entry['sha256']
+
+    digest = hashlib.sha256()
+    _hash_file(source_path, digest)
+    index[str(source_path)] = dict(version, sha256=digest.hexdigest())
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_json(index_path, index)
+    return digest.hexdigest()
+
+
+def cache_key(kind, params, source_path=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Clave de caché a partir del tipo de fuente, sus parámetros y su contenido."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'kind': kind, 'version': CACHE_VERSION,
+                              'params': params}, sort_keys=True).encode())
+    if source_path is not None:
+        digest.update(source_digest(source_path, cache_dir).encode())
+    return f"{kind}-{digest.hexdigest()[:24]}"
+
+
+def _code_dtype(n_categories):
+    """Tipo entero más pequeño que puede guardar los códigos (-1 = nulo)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def save_frame(df, key, cache_dir=DEFAULT_CACHE_DIR):
+    """Guardar `df` en la caché como un directorio de columnas `.npy`.
+
+    La escritura se hace en un directorio temporal que luego se renombra,
+    por lo que otro proceso nunca ve una entrada a medio escribir.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    target = cache_dir / key
+
+    tmp = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=cache_dir))
+    try:
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            filename = f"{i:03d}.npy"
+            if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object \
+                    or pd.api.types.is_string_dtype(series.dtype):
+                categorical = pd.Categorical(series)
+                codes = categorical.codes.astype(_code_dtype(len(categorical.categories)))
+                np.save(tmp / filename, codes)
+                columns.append({'name': col, 'file': filename, 'kind': 'category',
+                                'categories': [str(c) for c in categorical.categories],
+                                'ordered': bool(categorical.ordered)})
+            else:
+                np.save(tmp / filename, series.to_numpy())
+                columns.append({'name': col, 'file': filename, 'kind': 'numeric'})
+
+        meta = {'version': CACHE_VERSION, 'n_rows': len(df), 'columns': columns}
+        (tmp / "meta.json").write_text(json.dumps(meta, indent=2))
+
+        _publish(tmp, target)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return target
+
+
+def _entry_is_valid(entry):
+    try:
+        meta = json.loads((entry / "meta.json").read_text())
+    except (OSError, ValueError):
+        return False
+    return meta.get('version') == CACHE_VERSION
+
+
+def _publish(tmp, target):
+    """Renombrar el directorio `tmp` a `target` sin borrar una entrada en uso.
+
+    Si otro proceso ya publicó una entrada válida con la misma clave (por
+    ejemplo otro proceso del pool de `compare_datasets`), gana esa y `tmp`
+    se descarta: puede haber lectores con sus columnas en memory-map. Una
+    entrada inválida se aparta con un rename antes de borrarla.
+    """
+    try:
+        os.replace(tmp, target)
+        return
+    except OSError:
+        if not target.exists():
+            raise
+    if _entry_is_valid(target):
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+    stale = Path(tempfile.mkdtemp(prefix=f".{target.name}-stale-", dir=target.parent))
+    os.replace(target, stale / target.name)
+    shutil.rmtree(stale, ignore_errors=True)
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        if not _entry_is_valid(target):
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_frame(key, cache_dir=DEFAULT_CACHE_DIR):
+    """Abrir una entrada de la caché con memory-map, o None si no existe."""
+    entry = Path(cache_dir) / key
+    meta_path = entry / "meta.json"
+    if not meta_path.exists():
+        return None
+
+    meta = json.loads(meta_path.read_text())
+    if meta.get('version') != CACHE_VERSION:
+        return None
+
+    columns = {}
+    for spec in meta['columns']:
+        values = np.load(entry / spec['file'], mmap_mode='r')
+        if spec['kind'] == 'category':
+            dtype = pd.CategoricalDtype(spec['categories'], ordered=spec['ordered'])
+            columns[spec['name']] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            columns[spec['name']] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _load_or_build(key, build, cache_dir):
+    """Devolver la entrada `key` de la caché, construyéndola si hace falta."""
+    df = load_frame(key, cache_dir)
+    if df is None:
+        save_frame(build(), key, cache_dir)
+        df = load_frame(key, cache_dir)
+    return df
+
+
+def cached_synthetic_dataset(age_distribution=synthetic_data.AGE_DISTRIBUTION,
+                             subscription_rates=synthetic_data.SUBSCRIPTION_RATES,
+                             age_ranges=synthetic_data.AGE_RANGES,
+                             chunk_size=synthetic_data.DEFAULT_CHUNK_SIZE,
+                             seed=42,
+                             cache_dir=DEFAULT_CACHE_DIR):
+    """Dataset simulado, generado una sola vez por combinación de parámetros."""
+    params = {
+        'age_distribution': age_distribution,
+        'subscription_rates': subscription_rates,
+        'age_ranges': {k: list(v) for k, v in age_ranges.items()},
+        'chunk_size': chunk_size,
+        'seed': seed,
+    }
+    key = cache_key('synthetic', params)
+    return _load_or_build(
+        key,
+        lambda: synthetic_data.generate_dataset(age_distribution, subscription_rates,
+                                                age_ranges, chunk_size, seed),
+        cache_dir,
+    )
+
+
+def cached_bank_dataset(dataset='bank-additional-full',
+                        zip_path=data_loader.DEFAULT_ZIP,
+                        usecols=None,
+                        cache_dir=DEFAULT_CACHE_DIR):
+    """Dataset real desde el zip, procesado una sola vez por contenido del zip."""
+    params = {'dataset': dataset,
+              'usecols': sorted(usecols) if usecols is not None else None}
+    key = cache_key('bank', params, source_path=zip_path, cache_dir=cache_dir)
+    return _load_or_build(
+        key,
+        lambda: data_loader.load_bank_dataset(dataset, zip_path, usecols=usecols),
+        cache_dir,
+    )
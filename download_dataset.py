@@ -1,132 +1,542 @@
 """
 Script para descargar automáticamente el Bank Marketing Dataset
 desde el repositorio UCI Machine Learning
+
+La descarga se hace por segmentos en paralelo (peticiones HTTP Range sobre
+una sesión con pool de conexiones y reintentos), se puede reanudar si se
+interrumpe (el progreso de cada segmento queda en `<zip>.part.json`) y se
+verifica con SHA-256. El zip se conserva junto a un archivo `<zip>.meta.json`
+con su ETag/Last-Modified: si el servidor dice que no cambió, no se vuelve
+a descargar.
+
+Todas las funciones reciben la URL y la sesión como parámetros, así que se
+pueden probar contra un servidor HTTP local.
+
+Después de descargar solo se extraen los CSV pedidos, leyéndolos como
+flujo desde los zips anidados (`bank.zip`, `bank-additional.zip`) con
+memoria acotada, y se escribe `manifest.json` (miembro, tamaño, CRC, ruta)
+para ubicar los archivos sin recorrer la carpeta.
 """
 
+import argparse
+import hashlib
+import json
 import os
-import requests
+import shutil
+import sys
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def create_data_folder():
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from data_loader import DATASETS, resolve_member
+
+DATASET_URL = "https://archive.ics.uci.edu/static/public/222/bank+marketing.zip"
+
+DATASET_PAGE = "https://archive.ics.uci.edu/dataset/222/bank+marketing"
+
+DEFAULT_ZIP_NAME = "bank_marketing.zip"
+
+DEFAULT_SEGMENTS = 4
+
+# Tamaño de lectura de cada respuesta y cada cuánto se guarda el progreso
+BLOCK_SIZE = 1024 * 1024
+
+# Por debajo de este tamaño no vale la pena partir la descarga
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# Reintentos por segmento si la conexión se corta a mitad de la respuesta
+SEGMENT_RETRIES = 3
+
+MANIFEST_NAME = "manifest.json"
+
+# CSV que se extraen por defecto (nombres cortos de data_loader.DATASETS)
+DEFAULT_MEMBERS = list(DATASETS)
+
+
+class DownloadError(Exception):
+    """La descarga no se pudo completar o no pasó la verificación."""
+
+
+def create_data_folder(data_folder="data"):
     """Crear carpeta data/ si no existe"""
-    data_folder = Path("data")
+    data_folder = Path(data_folder)
     if not data_folder.exists():
-        data_folder.mkdir()
-        print("✓ Carpeta 'data/' creada")
+        data_folder.mkdir(parents=True)
+        print(f"✓ Carpeta '{data_folder}/' creada")
     else:
-        print("✓ Carpeta 'data/' ya existe")
+        print(f"✓ Carpeta '{data_folder}/' ya existe")
     return data_folder
 
-def download_dataset():
+
+# ============================================================================
+# Sesión HTTP y metadatos del servidor
+# ============================================================================
+
+def make_session(pool_size=DEFAULT_SEGMENTS, retries=3, backoff=0.5):
+    """Sesión con pool de conexiones y reintentos automáticos (errores 5xx y de red)."""
+    retry = Retry(total=retries, backoff_factor=backoff,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['HEAD', 'GET']))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def remote_info(session, url, timeout=30):
+    """Tamaño, soporte de Range, ETag y Last-Modified del recurso remoto (HEAD)."""
+    response = session.head(url, allow_redirects=True, timeout=timeout)
+    response.raise_for_status()
+    headers = response.headers
+    size = headers.get('Content-Length')
+    return {
+        'url': response.url,
+        'size': int(size) if size is not None else None,
+        'accept_ranges': headers.get('Accept-Ranges', '').lower() == 'bytes',
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+    }
+
+
+def _meta_path(path):
+    return path.with_name(path.name + '.meta.json')
+
+
+def _state_path(path):
+    return path.with_name(path.name + '.part.json')
+
+
+def _part_path(path):
+    return path.with_name(path.name + '.part')
+
+
+def _read_json(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def _same_version(saved, info):
+    """¿Describen `saved` e `info` la misma versión del archivo remoto?"""
+    if not saved:
+        return False
+    if info['size'] is not None and saved.get('size') != info['size']:
+        return False
+    if info['etag']:
+        return saved.get('etag') == info['etag']
+    if info['last_modified']:
+        return saved.get('last_modified') == info['last_modified']
+    return False
+
+
+def file_sha256(path, block_size=BLOCK_SIZE):
+    """SHA-256 de un archivo leído por bloques."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_current(path, info):
+    """True si `path` ya es la versión que describe `info` (según el .meta.json)."""
+    path = Path(path)
+    meta = _read_json(_meta_path(path))
+    return path.exists() and _same_version(meta, info) \
+        and path.stat().st_size == meta.get('size', path.stat().st_size)
+
+
+# ============================================================================
+# Descarga por segmentos
+# ============================================================================
+
+def _plan_segments(size, segments):
+    """Dividir [0, size) en rangos [inicio, fin] inclusivos."""
+    segments = max(1, min(segments, size // MIN_SEGMENT_SIZE or 1))
+    step = -(-size // segments)
+    return [[start, min(start + step, size) - 1] for start in range(0, size, step)]
+
+
+class _Progress:
+    """Progreso compartido entre segmentos: bytes por segmento y guardado del estado."""
+
+    def __init__(self, state, state_file, total, quiet):
+        self.state = state
+        self.state_file = state_file
+        self.total = total
+        self.quiet = quiet
+        self.lock = threading.Lock()
+        self.downloaded = sum(state['done'])
+        self._last_percent = -1
+
+    def add(self, index, n_bytes):
+        with self.lock:
+            self.state['done'][index] += n_bytes
+            self.downloaded += n_bytes
+            _write_json(self.state_file, self.state)
+            if not self.quiet and self.total:
+                percent = int(self.downloaded * 100 / self.total)
+                if percent != self._last_percent:
+                    self._last_percent = percent
+                    print(f"\rProgreso: {percent}% ({self.downloaded}/{self.total} bytes)",
+                          end='', flush=True)
+
+
+def _fetch_segment(session, url, part, index, segment, progress, validator, timeout):
+    """Descargar (o completar) un segmento escribiendo en su posición del .part."""
+    start, end = segment
+    for attempt in range(SEGMENT_RETRIES + 1):
+        offset = start + progress.state['done'][index]
+        if offset > end:
+            return
+        headers = {'Range': f"bytes={offset}-{end}"}
+        if validator:
+            headers['If-Range'] = validator
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise DownloadError("El servidor ignoró el rango pedido "
+                                        "(el archivo remoto cambió o no admite Range)")
+                with open(part, 'r+b') as f:
+                    f.seek(offset)
+                    for block in response.iter_content(chunk_size=BLOCK_SIZE):
+                        block = block[:end + 1 - offset]
+                        f.write(block)
+                        f.flush()
+                        offset += len(block)
+                        progress.add(index, len(block))
+                        if offset > end:
+                            break
+            if offset > end:
+                return
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout):
+            if attempt == SEGMENT_RETRIES:
+                raise
+    raise DownloadError(f"El segmento {index} quedó incompleto")
+
+
+def _fetch_whole(session, url, part, progress, timeout):
+    """Descarga en un solo flujo cuando el servidor no admite Range."""
+    with session.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        with open(part, 'wb') as f:
+            for block in response.iter_content(chunk_size=BLOCK_SIZE):
+                f.write(block)
+                progress.add(0, len(block))
+
+
+def fetch(url, path, session=None, segments=DEFAULT_SEGMENTS, sha256=None,
+          force=False, timeout=60, quiet=False):
+    """Descargar `url` en `path` por segmentos, reanudando y verificando.
+
+    Parámetros:
+        url: recurso remoto
+        path: archivo destino (se escribe primero en `<path>.part`)
+        session: sesión HTTP (por defecto `make_session(segments)`)
+        segments: peticiones Range en paralelo
+        sha256: suma esperada; si no coincide se lanza `DownloadError`
+        force: descargar aunque el archivo local esté al día
+        timeout: segundos de espera por conexión/lectura
+
+    Devuelve un diccionario con 'path', 'status' ('current' si no hizo
+    falta descargar, 'downloaded' o 'resumed'), 'sha256' y 'size'.
+    """
+    path = Path(path)
+    session = session or make_session(segments)
+    info = remote_info(session, url, timeout)
+    url = info['url']
+
+    if not force and is_current(path, info):
+        meta = _read_json(_meta_path(path))
+        if sha256 is None or meta.get('sha256') == sha256.lower():
+            return {'path': path, 'status': 'current', 'sha256': meta.get('sha256'),
+                    'size': path.stat().st_size}
+
+    part, state_file = _part_path(path), _state_path(path)
+    validator = info['etag'] or info['last_modified']
+    ranged = info['accept_ranges'] and info['size']
+
+    state = _read_json(state_file)
+    resumed = (ranged and part.exists() and _same_version(state, info)
+               and state.get('segments') and sum(state['done']) > 0)
+    if not resumed:
+        plan = _plan_segments(info['size'], segments) if ranged else []
+        state = dict(info, segments=plan, done=[0] * max(len(plan), 1))
+        with open(part, 'wb') as f:
+            if ranged:
+                f.truncate(info['size'])
+        _write_json(state_file, state)
+
+    progress = _Progress(state, state_file, info['size'], quiet)
+    if ranged:
+        with ThreadPoolExecutor(max_workers=len(state['segments'])) as pool:
+            futures = [pool.submit(_fetch_segment, session, url, part, i, segment,
+                                   progress, validator, timeout)
+                       for i, segment in enumerate(state['segments'])]
+            for future in futures:
+                future.result()
+    else:
+        _fetch_whole(session, url, part, progress, timeout)
+    if not quiet:
+        print()
+
+    size = part.stat().st_size
+    if info['size'] is not None and size != info['size']:
+        raise DownloadError(f"Tamaño inesperado: {size} bytes en lugar de {info['size']}")
+    digest = file_sha256(part)
+    if sha256 is not None and digest != sha256.lower():
+        part.unlink()
+        state_file.unlink()
+        raise DownloadError(f"SHA-256 no coincide: {digest} (esperado {sha256})")
+
+    os.replace(part, path)
+    state_file.unlink()
+    _write_json(_meta_path(path), {'url': url, 'size': size, 'etag': info['etag'],
+                                   'last_modified': info['last_modified'], 'sha256': digest})
+    return {'path': path, 'status': 'resumed' if resumed else 'downloaded',
+            'sha256': digest, 'size': size}
+
+
+# ============================================================================
+# Extracción selectiva y manifiesto
+# ============================================================================
+
+def read_manifest(data_folder="data"):
+    """Manifiesto de la carpeta (diccionario vacío si no existe)."""
+    return _read_json(Path(data_folder) / MANIFEST_NAME) or {'members': {}}
+
+
+def locate_dataset(dataset, data_folder="data"):
+    """Ruta del CSV extraído de `dataset` según el manifiesto, o None.
+
+    Solo consulta el manifiesto y hace un `stat` del archivo: no recorre
+    la carpeta.
+    """
+    data_folder = Path(data_folder)
+    entry = read_manifest(data_folder)['members'].get(dataset)
+    if entry is None:
+        return None
+    path = data_folder / entry['path']
+    try:
+        return path if path.stat().st_size == entry['size'] else None
+    except OSError:
+        return None
+
+
+def _extract_stream(source, target, block_size=BLOCK_SIZE):
+    """Copiar un miembro comprimido a `target` por bloques (escritura atómica).
+
+    `zipfile` comprueba el CRC al llegar al final del flujo y lanza
+    `BadZipFile` si no coincide; en ese caso no queda archivo a medias.
+    """
+    tmp = target.with_name(target.name + '.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            shutil.copyfileobj(source, f, block_size)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def extract_members(zip_path, data_folder="data", members=None, force=False):
+    """Extraer solo los CSV pedidos del zip anidado y actualizar el manifiesto.
+
+    Parámetros:
+        zip_path: bank+marketing.zip descargado
+        data_folder: carpeta de destino (los CSV quedan en su raíz)
+        members: nombres cortos de `data_loader.DATASETS` o rutas
+            'zip_interno/miembro' (por defecto los cuatro CSV)
+        force: extraer aunque el manifiesto diga que el archivo está al día
+
+    Los zips internos se leen directamente desde el exterior (sin copiarlos
+    a disco) y cada CSV se descomprime por bloques. Devuelve el diccionario
+    {nombre: 'extracted' | 'current'}.
+    """
+    data_folder = Path(data_folder)
+    data_folder.mkdir(parents=True, exist_ok=True)
+    members = DEFAULT_MEMBERS if members is None else list(members)
+    manifest = read_manifest(data_folder)
+    manifest['source'] = str(zip_path)
+
+    by_inner = {}
+    for name in members:
+        inner_zip, member = resolve_member(name)
+        by_inner.setdefault(inner_zip, []).append((name, member))
+
+    status = {}
+    with zipfile.ZipFile(zip_path) as outer:
+        for inner_zip, wanted in by_inner.items():
+            with outer.open(inner_zip) as inner_stream, zipfile.ZipFile(inner_stream) as inner:
+                for name, member in wanted:
+                    info = inner.getinfo(member)
+                    entry = {'member': f"{inner_zip}/{member}", 'size': info.file_size,
+                             'crc': f"{info.CRC:08x}", 'path': Path(member).name}
+                    if not force and manifest['members'].get(name) == entry \
+                            and locate_dataset(name, data_folder) is not None:
+                        status[name] = 'current'
+                        continue
+                    with inner.open(info) as source:
+                        _extract_stream(source, data_folder / entry['path'])
+                    manifest['members'][name] = entry
+                    _write_json(data_folder / MANIFEST_NAME, manifest)
+                    status[name] = 'extracted'
+    _write_json(data_folder / MANIFEST_NAME, manifest)
+    return status
+
+
+def _print_members(data_folder, names):
+    manifest = read_manifest(data_folder)['members']
+    for name in names:
+        size_mb = manifest[name]['size'] / (1024 * 1024)
+        print(f"  - {manifest[name]['path']} ({size_mb:.2f} MB)")
+
+
+# ============================================================================
+# Flujo del script
+# ============================================================================
+
+def download_dataset(url=DATASET_URL, data_folder="data", segments=DEFAULT_SEGMENTS,
+                     sha256=None, force=False, keep_zip=True, session=None, members=None):
     """Descargar el dataset desde UCI"""
     print("\n" + "="*70)
     print("DESCARGA DEL BANK MARKETING DATASET")
     print("="*70 + "\n")
-    
-    # URL del dataset
-    url = "https://archive.ics.uci.edu/static/public/222/bank+marketing.zip"
-    
+
     # Crear carpeta data
-    data_folder = create_data_folder()
-    
+    data_folder = create_data_folder(data_folder)
+
     # Nombre del archivo
-    zip_filename = data_folder / "bank_marketing.zip"
-    
+    zip_filename = data_folder / DEFAULT_ZIP_NAME
+
     try:
         print(f"Descargando desde: {url}")
-        print("Por favor espera, esto puede tomar unos minutos...")
-        
-        # Descargar con barra de progreso
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 8192
-        downloaded = 0
-        
-        with open(zip_filename, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=block_size):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    
-                    # Mostrar progreso
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        print(f"\rProgreso: {percent:.1f}% ({downloaded}/{total_size} bytes)", end='')
-        
-        print("\n✓ Descarga completada")
-        
-        # Extraer archivos
+        print(f"Por favor espera, esto puede tomar unos minutos ({segments} segmentos)...")
+
+        result = fetch(url, zip_filename, session=session, segments=segments,
+                       sha256=sha256, force=force)
+        if result['status'] == 'current':
+            print("✓ El archivo local está al día (ETag/Last-Modified), no se descargó")
+        elif result['status'] == 'resumed':
+            print("✓ Descarga reanudada y completada")
+        else:
+            print("✓ Descarga completada")
+        print(f"  SHA-256: {result['sha256']}")
+
+        # Extraer solo los CSV pedidos (sin extractall ni búsqueda recursiva)
         print("\nExtrayendo archivos...")
-        with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
-            zip_ref.extractall(data_folder)
-        
-        print("✓ Archivos extraídos")
-        
-        # Buscar el archivo principal
-        csv_files = list(data_folder.glob("**/*.csv"))
-        
-        if csv_files:
-            print(f"\n✓ Dataset descargado exitosamente en: {data_folder}")
-            print("\nArchivos disponibles:")
-            for csv_file in csv_files:
-                size_mb = csv_file.stat().st_size / (1024 * 1024)
-                print(f"  - {csv_file.name} ({size_mb:.2f} MB)")
-            
-            # Encontrar el archivo full
-            full_csv = [f for f in csv_files if 'full' in f.name.lower()]
-            if full_csv:
-                print(f"\n📊 Archivo principal: {full_csv[0].name}")
-                print(f"📍 Ruta: {full_csv[0]}")
-        
-        # Limpiar archivo zip
-        if zip_filename.exists():
+        extracted = extract_members(zip_filename, data_folder, members,
+                                    force=result['status'] != 'current')
+        n_new = sum(state == 'extracted' for state in extracted.values())
+        print(f"✓ Archivos extraídos ({n_new} nuevos, {len(extracted) - n_new} al día)")
+        print(f"  Manifiesto: {data_folder / MANIFEST_NAME}")
+
+        print(f"\n✓ Dataset descargado exitosamente en: {data_folder}")
+        print("\nArchivos disponibles:")
+        _print_members(data_folder, extracted)
+
+        # Encontrar el archivo full
+        full_csv = [name for name in extracted if name.endswith('full')]
+        if full_csv:
+            path = locate_dataset(full_csv[-1], data_folder)
+            print(f"\n📊 Archivo principal: {path.name}")
+            print(f"📍 Ruta: {path}")
+
+        # El zip se conserva para no volver a descargarlo en la próxima ejecución
+        if not keep_zip and zip_filename.exists():
             zip_filename.unlink()
+            _meta_path(zip_filename).unlink(missing_ok=True)
             print("\n✓ Archivo temporal eliminado")
-        
+
         print("\n" + "="*70)
         print("¡DESCARGA COMPLETADA CON ÉXITO!")
         print("="*70)
         print("\nPuedes ejecutar el análisis con:")
         print("  python analisis_probabilidad.py")
         print("="*70 + "\n")
-        
+
         return True
-        
-    except requests.exceptions.RequestException as e:
+
+    except (requests.exceptions.RequestException, DownloadError, zipfile.BadZipFile) as e:
         print(f"\n✗ Error al descargar: {e}")
+        print("  (se puede reanudar ejecutando de nuevo el script)")
         print("\nIntenta descargar manualmente desde:")
-        print("https://archive.ics.uci.edu/dataset/222/bank+marketing")
+        print(DATASET_PAGE)
         return False
-    
+
     except Exception as e:
         print(f"\n✗ Error inesperado: {e}")
         return False
 
-def verify_dataset():
-    """Verificar si el dataset ya existe"""
-    data_folder = Path("data")
-    
+
+def verify_dataset(data_folder="data", redownload=None, members=None):
+    """Verificar si el dataset ya existe
+
+    Los archivos se buscan en el manifiesto (sin recorrer la carpeta).
+    Devuelve True si hay que conservar lo existente. `redownload` decide
+    sin preguntar (True = descargar de nuevo); con None solo se pregunta
+    si la entrada estándar es una terminal, y si no se conserva el dataset.
+    """
+    data_folder = Path(data_folder)
+
     if not data_folder.exists():
         return False
-    
-    csv_files = list(data_folder.glob("**/*.csv"))
-    
-    if csv_files:
-        print("\n✓ Dataset ya existe en la carpeta 'data/'")
+
+    members = DEFAULT_MEMBERS if members is None else list(members)
+    found = [name for name in members if locate_dataset(name, data_folder) is not None]
+
+    if found and len(found) == len(members):
+        print(f"\n✓ Dataset ya existe en la carpeta '{data_folder}/'")
         print("\nArchivos encontrados:")
-        for csv_file in csv_files:
-            size_mb = csv_file.stat().st_size / (1024 * 1024)
-            print(f"  - {csv_file.name} ({size_mb:.2f} MB)")
-        
+        _print_members(data_folder, found)
+
+        if redownload is not None:
+            return not redownload
+        if not sys.stdin.isatty():
+            return True
         response = input("\n¿Deseas descargar nuevamente? (s/N): ").strip().lower()
         return response != 's'
-    
+
     return False
 
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Descargar el Bank Marketing Dataset (UCI)")
+    parser.add_argument('--url', default=DATASET_URL, help="URL del zip")
+    parser.add_argument('--data-folder', default="data", help="Carpeta de destino")
+    parser.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS,
+                        help="Peticiones Range en paralelo")
+    parser.add_argument('--sha256', default=None, help="Suma SHA-256 esperada del zip")
+    parser.add_argument('--members', default=None,
+                        help="CSV a extraer separados por comas "
+                             f"(por defecto: {', '.join(DEFAULT_MEMBERS)})")
+    parser.add_argument('--no-keep-zip', action='store_true',
+                        help="Borrar el zip tras extraer (la próxima vez se descarga de nuevo)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--yes', action='store_true',
+                       help="No preguntar: volver a descargar aunque ya exista")
+    group.add_argument('--non-interactive', action='store_true',
+                       help="No preguntar: conservar el dataset si ya existe")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
     print("""
     ╔══════════════════════════════════════════════════════════════════╗
     ║                                                                  ║
@@ -137,17 +547,23 @@ if __name__ == "__main__":
     ║                                                                  ║
     ╚══════════════════════════════════════════════════════════════════╝
     """)
-    
+
+    redownload = True if args.yes else (False if args.non_interactive else None)
+    members = args.members.split(',') if args.members else None
+
     # Verificar si ya existe
-    if not verify_dataset():
+    if not verify_dataset(args.data_folder, redownload, members):
         # Descargar
-        success = download_dataset()
-        
+        success = download_dataset(args.url, args.data_folder, args.segments,
+                                   args.sha256, force=args.yes,
+                                   keep_zip=not args.no_keep_zip, members=members)
+
         if not success:
             print("\n💡 ALTERNATIVAS:")
-            print("   1. Descarga manual: https://archive.ics.uci.edu/dataset/222/bank+marketing")
+            print(f"   1. Descarga manual: {DATASET_PAGE}")
             print("   2. Usar dataset simulado (ya incluido en el código)")
             print("   3. Intentar nuevamente más tarde")
+            sys.exit(1)
     else:
         print("\n✓ Todo listo! Puedes ejecutar el análisis.")
         print("\nComando:")
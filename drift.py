@@ -0,0 +1,243 @@
+"""
+Seguimiento de deriva en ventanas móviles de campaña
+====================================================
+bank-additional está ordenado por fecha (mayo de 2008 a noviembre de 2010)
+y trae `month` y `day_of_week`, pero sin año. Cada tramo consecutivo de
+filas con el mismo mes (o mes y día) es un periodo; el año se cuenta cada
+vez que el mes retrocede ('dec' -> 'mar').
+
+Las tablas `grupo × y` de todos los periodos se cuentan en una sola pasada
+(bincount sobre periodo, grupo y resultado). La ventana móvil es un
+`counts.BayesCounts`: al avanzar se suma la tabla del periodo que entra y
+se resta la del que sale, sin recorrer filas. Los periodos que salen de la
+ventana pasan a una ventana de referencia (los periodos inmediatamente
+anteriores), que se actualiza igual y es la base de la alerta:
+
+    banda = p_ref ± z·sqrt(p_ref·(1 - p_ref)·(1/n_ventana + 1/n_ref))
+
+Si P(S|E) de un grupo en la ventana (o P(S) global) queda fuera de su
+banda, se emite una alerta de deriva.
+"""
+
+from collections import deque
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from counts import BayesCounts, _codes, count_table
+
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+DEFAULT_WINDOW = 3
+
+DEFAULT_CONFIDENCE = 0.99
+
+# Mínimo de filas (ventana y referencia) para evaluar la alerta de un grupo
+DEFAULT_MIN_COUNT = 30
+
+# Etiqueta de P(S) global en las alertas
+OVERALL = 'total'
+
+
+def assign_periods(df, granularity='month'):
+    """Número de periodo de cada fila y etiquetas de los periodos, en orden temporal.
+
+    `granularity` es 'month' (un periodo por mes de campaña, ej. 'may#1') o
+    'day' (por día de contacto, ej. 'may#1 d03 wed').
+    """
+    if granularity not in ('month', 'day'):
+        raise ValueError("granularity debe ser 'month' o 'day'")
+    if df.empty:
+        raise ValueError("El dataset no tiene filas: no hay periodos que analizar")
+    for column in (['month'] if granularity == 'month' else ['month', 'day_of_week']):
+        if column not in df.columns:
+            raise KeyError(f"El dataset no tiene la columna {column!r}")
+
+    month_codes, month_labels = _codes(df['month'])
+    order = np.array([MONTHS.index(str(m)) for m in month_labels])
+    keys = month_codes.astype(np.int64)
+    if granularity == 'day':
+        day_codes, day_labels = _codes(df['day_of_week'])
+        keys = keys * len(day_labels) + day_codes
+    starts = np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+    period_ids = np.cumsum(np.isin(np.arange(len(keys)), starts)) - 1
+
+    labels, year, day, previous = [], 1, 0, None
+    for start in starts:
+        month = order[month_codes[start]]
+        if previous is not None and month < previous:
+            year += 1
+        day = day + 1 if month == previous else 1
+        label = f"{MONTHS[month]}#{year}"
+        if granularity == 'day':
+            label += f" d{day:02d} {day_labels[day_codes[start]]}"
+        labels.append(label)
+        previous = month
+    return period_ids, labels
+
+
+def period_tables(df, group_col='age_group', target='y', granularity='month'):
+    """Tablas de contingencia `group_col × target` de cada periodo (una pasada).
+
+    Devuelve una lista de (etiqueta, DataFrame) en orden temporal.
+    """
+    period_ids, labels = assign_periods(df, granularity)
+    group_codes, groups = _codes(df[group_col])
+    target_codes, outcomes = _codes(df[target])
+    valid = (group_codes >= 0) & (target_codes >= 0)
+    shape = (len(labels), len(groups), len(outcomes))
+    flat = np.ravel_multi_index((period_ids[valid], group_codes[valid], target_codes[valid]),
+                                shape)
+    counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+    index = pd.Index(groups, name=group_col)
+    columns = pd.Index(outcomes, name=target)
+    return [(label, pd.DataFrame(counts[i], index=index, columns=columns))
+            for i, label in enumerate(labels)]
+
+
+def _band(p_ref, n_ref, n_window, z):
+    """Semiamplitud de la banda de variación esperada para la tasa de la ventana."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return z * np.sqrt(p_ref * (1 - p_ref) * (1 / n_window + 1 / n_ref))
+
+
+class RollingWindow:
+    """Ventana móvil de conteos que se actualiza sumando y restando periodos.
+
+    La referencia de las alertas es otra ventana, la de los
+    `reference_width` periodos inmediatamente anteriores: los periodos que
+    salen de la ventana entran a la referencia y salen de ella al quedar
+    más viejos, así que la alerta marca cambios recientes y no una deriva
+    ya conocida.
+
+    Parámetros:
+        group_col, target, positive: como en `counts.BayesCounts`
+        width: número de periodos en la ventana
+        reference_width: periodos de la referencia (por defecto `width`)
+        confidence: nivel de confianza de las bandas de alerta
+        min_count: filas mínimas en la ventana y en la referencia para
+            evaluar un grupo
+        groups: orden de los grupos en los resultados
+    """
+
+    def __init__(self, group_col='age_group', target='y', positive='yes',
+                 width=DEFAULT_WINDOW, reference_width=None, confidence=DEFAULT_CONFIDENCE,
+                 min_count=DEFAULT_MIN_COUNT, groups=()):
+        if width < 1:
+            raise ValueError("La ventana debe tener al menos un periodo")
+        self.width = width
+        self.reference_width = reference_width or width
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.confidence = confidence
+        self.min_count = min_count
+        self.window = BayesCounts(group_col, target, positive, groups=groups)
+        self.reference = BayesCounts(group_col, target, positive, groups=groups)
+        self.periods = deque()
+        self.history = deque()
+
+    def push(self, label, table):
+        """Avanzar un periodo: sumar su tabla y restar la del periodo que sale.
+
+        Devuelve el estado de la ventana (ver `snapshot`) con las alertas.
+        """
+        self.window.add_table(table)
+        self.periods.append((label, table))
+        if len(self.periods) > self.width:
+            leaving = self.periods.popleft()
+            self.window.subtract_table(leaving[1])
+            self.reference.add_table(leaving[1])
+            self.history.append(leaving)
+            if len(self.history) > self.reference_width:
+                self.reference.subtract_table(self.history.popleft()[1])
+        snapshot = self.snapshot()
+        snapshot['alerts'] = self.alerts()
+        return snapshot
+
+    def update(self, label, df):
+        """`push` a partir de las filas nuevas del periodo."""
+        return self.push(label, count_table(df, self.window.row_col, self.window.col_col))
+
+    @staticmethod
+    def _rates(counts, groups):
+        """Filas y casos positivos por grupo (en el orden de `groups`) y en total."""
+        index = [counts.groups.index(g) if g in counts.groups else -1 for g in groups]
+        totals = np.append(counts.counts.sum(axis=1), 0)[index].astype(np.float64)
+        positive = np.append(counts._positive_counts(), 0)[index].astype(np.float64)
+        return (np.append(totals, counts.total), np.append(positive, positive.sum()))
+
+    def alerts(self):
+        """Grupos (y P(S) global) cuya tasa en la ventana sale de la banda de la referencia."""
+        if not self.history:
+            return []
+        names = list(self.window.groups)
+        n_win, pos_win = self._rates(self.window, names)
+        n_ref, pos_ref = self._rates(self.reference, names)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_win, p_ref = pos_win / n_win, pos_ref / n_ref
+        band = _band(p_ref, n_ref, n_win, self.z)
+        # Las probabilidades están en [0, 1]: la banda se recorta a ese rango
+        low, high = np.clip(p_ref - band, 0, 1), np.clip(p_ref + band, 0, 1)
+
+        alerts = []
+        for i, name in enumerate(names + [OVERALL]):
+            if min(n_win[i], n_ref[i]) < self.min_count or np.isnan(band[i]):
+                continue
+            if not low[i] <= p_win[i] <= high[i]:
+                alerts.append({
+                    'group': name,
+                    'rate': float(p_win[i]),
+                    'reference': float(p_ref[i]),
+                    'band': (float(low[i]), float(high[i])),
+                    'window_rows': int(n_win[i]),
+                })
+        return alerts
+
+    def snapshot(self):
+        """P(S), P(S|E) y P(E|S) de la ventana actual."""
+        return {
+            'periods': [label for label, _ in self.periods],
+            'total': self.window.total,
+            'prob_positive': self.window.prob_positive(),
+            'conditional': self.window.prob_positive_given_group(),
+            'posterior': self.window.prob_group_given_positive(),
+        }
+
+
+def track_drift(df, group_col='age_group', target='y', positive='yes',
+                width=DEFAULT_WINDOW, granularity='month', reference_width=None,
+                confidence=DEFAULT_CONFIDENCE, min_count=DEFAULT_MIN_COUNT, groups=()):
+    """Recorrer los periodos de `df` con una ventana móvil; devuelve un estado por periodo."""
+    window = RollingWindow(group_col, target, positive, width, reference_width,
+                           confidence, min_count, groups)
+    return [dict(window.push(label, table), period=label)
+            for label, table in period_tables(df, group_col, target, granularity)]
+
+
+def print_drift(snapshots, groups=None):
+    """Tabla de P(S) y P(S|E) por ventana, con las alertas de deriva."""
+    if not snapshots:
+        print("No hay periodos para analizar")
+        return
+    groups = groups or list(snapshots[-1]['conditional'])
+    print(f"\n{'Periodo':<16}{'Filas':>8}{'P(S)':>9}"
+          + ''.join(f"{('P(S|' + str(g) + ')'):>18}" for g in groups))
+    print("-" * (33 + 18 * len(groups)))
+    n_alerts = 0
+    for snap in snapshots:
+        flagged = {a['group'] for a in snap['alerts']}
+        overall = '*' if OVERALL in flagged else ' '
+        row = f"{snap['period']:<16}{snap['total']:>8,}{snap['prob_positive']:>8.4f}{overall}"
+        for g in groups:
+            mark = '*' if g in flagged else ' '
+            row += f"{snap['conditional'].get(g, float('nan')):>17.4f}{mark}"
+        print(row)
+        n_alerts += len(snap['alerts'])
+    print(f"\n* = fuera de la banda respecto a la ventana anterior "
+          f"({n_alerts} alertas)")
+    for snap in snapshots:
+        for a in snap['alerts']:
+            low, high = a['band']
+            name = 'P(S)' if a['group'] == OVERALL else f"P(S|{a['group']})"
+            print(f"  ⚠ {snap['period']}: {name} = {a['rate']:.4f} "
+                  f"fuera de [{low:.4f}, {high:.4f}] (ventana de {a['window_rows']:,} filas)")
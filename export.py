@@ -0,0 +1,205 @@
+"""
+Exportación tipada de resultados
+================================
+Las tablas de resultados se construyen de una vez a partir de los arreglos
+de conteos (sin armar filas una por una) y conservan sus tipos reales:
+enteros para los conteos, float64 para las probabilidades y `category`
+para los grupos. Formatos según la extensión del archivo:
+
+    .parquet           Parquet (pyarrow o fastparquet)
+    .arrow / .feather  Arrow IPC (pyarrow)
+    .json              JSON con esquema (`orient='table'`), sin pérdida de tipos
+    .xlsx              Excel en modo write-only de openpyxl (por filas, memoria acotada)
+    .csv               CSV con los números completos, sin formatear
+
+Las dependencias opcionales (pyarrow, openpyxl) solo se importan al
+escribir ese formato.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.json': 'json',
+    '.xlsx': 'excel',
+    '.csv': 'csv',
+}
+
+# Filas por hoja de Excel (límite del formato: 1,048,576 incluyendo el encabezado)
+EXCEL_MAX_ROWS = 1_048_575
+
+
+# ============================================================================
+# Tablas tipadas
+# ============================================================================
+
+def _probability_columns(counts, positive_col):
+    """Columnas de probabilidades desde un arreglo (..., grupos, resultados) de conteos."""
+    counts = np.asarray(counts, dtype=np.int64)
+    totals = counts.sum(axis=(-2, -1), keepdims=True)[..., 0]
+    group_totals = counts.sum(axis=-1)
+    positive = counts[..., positive_col]
+    positive_totals = positive.sum(axis=-1, keepdims=True)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'total': group_totals,
+            'subscribed': positive,
+            'not_subscribed': group_totals - positive,
+            'p_group': group_totals / totals,
+            'p_subscribe_given_group': positive / group_totals,
+            'p_group_given_subscribe': positive / positive_totals,
+            'p_joint': positive / totals,
+        }
+
+
+def results_table(results, positive='yes'):
+    """Resultados de la sección 3 como DataFrame tipado (una fila por grupo).
+
+    Mismo contenido que `analisis_probabilidad.results_frame`, pero con
+    números en lugar de cadenas formateadas.
+    """
+    groups = list(results['age_groups'])
+    table = results['contingency_table'].reindex(index=groups, fill_value=0)
+    columns = _probability_columns(table.to_numpy(), list(table.columns).index(positive))
+    frame = pd.DataFrame({
+        'group': pd.Categorical(groups, categories=groups),
+        'label': [results['age_labels'][g] for g in groups],
+        **columns,
+    })
+    return frame
+
+
+def segment_results_table(df, segment_cols, row_col='age_group', col_col='y', positive='yes'):
+    """Probabilidades por segmento y grupo en formato largo, calculadas en bloque.
+
+    Los conteos de todos los segmentos salen de una sola pasada
+    (`independence.segment_tables`) y las probabilidades se calculan sobre
+    el arreglo completo. Devuelve una fila por (segmento, grupo) con las
+    columnas de los segmentos como `category`.
+    """
+    from independence import segment_tables
+
+    segments, tables, row_labels, col_labels = segment_tables(df, segment_cols, row_col, col_col)
+    n_segments, n_groups = tables.shape[:2]
+    columns = _probability_columns(tables, col_labels.index(positive))
+
+    segment_frame = segments.to_frame(index=False) if isinstance(segments, pd.MultiIndex) \
+        else pd.DataFrame({segments.name: segments})
+    repeated = np.repeat(np.arange(n_segments), n_groups)
+    out = {col: pd.Categorical(segment_frame[col].to_numpy()[repeated])
+           for col in segment_frame.columns}
+    out[row_col] = pd.Categorical.from_codes(
+        np.tile(np.arange(n_groups), n_segments), categories=row_labels)
+    out.update({name: values.reshape(-1) for name, values in columns.items()})
+    return pd.DataFrame(out)
+
+
+# ============================================================================
+# Escritura
+# ============================================================================
+
+def _format_for(path, fmt):
+    if fmt is not None:
+        return fmt
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Extensión no soportada: {suffix!r}. Usa {', '.join(FORMATS)}")
+    return FORMATS[suffix]
+
+
+def _require(module, fmt):
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise ImportError(f"Exportar a {fmt} requiere '{module}' (pip install {module})") from e
+
+
+def write_excel(sheets, path, header_style=True):
+    """Escribir uno o más DataFrames a .xlsx en modo write-only (streaming).
+
+    `sheets` es un DataFrame o un diccionario nombre_hoja -> DataFrame. Las
+    filas se envían a openpyxl una por una sin construir celdas en memoria;
+    si una tabla supera el límite de filas de Excel continúa en hojas
+    `nombre_2`, `nombre_3`, ...
+    """
+    _require('openpyxl', 'Excel')
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    if isinstance(sheets, pd.DataFrame):
+        sheets = {'resultados': sheets}
+
+    wb = Workbook(write_only=True)
+    bold = Font(bold=True)
+    for name, frame in sheets.items():
+        # Categorías y objetos como texto; los números se escriben tal cual
+        frame = frame.astype({c: str for c in frame.columns
+                              if not pd.api.types.is_numeric_dtype(frame[c])})
+        for part, start in enumerate(range(0, max(len(frame), 1), EXCEL_MAX_ROWS)):
+            ws = wb.create_sheet(title=(name if part == 0 else f"{name}_{part + 1}")[:31])
+            header = []
+            for col in frame.columns:
+                cell = WriteOnlyCell(ws, value=str(col))
+                if header_style:
+                    cell.font = bold
+                header.append(cell)
+            ws.append(header)
+            block = frame.iloc[start:start + EXCEL_MAX_ROWS]
+            for row in block.itertuples(index=False, name=None):
+                ws.append(row)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return path
+
+
+def export_frame(df, path, fmt=None):
+    """Escribir `df` con sus tipos en el formato indicado por la extensión (o `fmt`)."""
+    fmt = _format_for(path, fmt)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'arrow':
+        _require('pyarrow', 'Arrow')
+        import pyarrow.feather as feather
+
+        feather.write_feather(df, path)
+    elif fmt == 'json':
+        df.to_json(path, orient='table', index=False, double_precision=15)
+    elif fmt == 'excel':
+        write_excel(df, path)
+    elif fmt == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Formato desconocido: {fmt!r}")
+    return path
+
+
+def export_results(results, paths, segments=None):
+    """Exportar los resultados a cada ruta de `paths` (formato según la extensión).
+
+    Si `segments` es un DataFrame de resultados por segmento
+    (`segment_results_table`), en Excel va como segunda hoja y en los
+    demás formatos se escribe junto al archivo con sufijo `_segmentos`.
+    """
+    table = results_table(results)
+    written = []
+    for path in paths:
+        path = Path(path)
+        if segments is not None and _format_for(path, None) == 'excel':
+            written.append(write_excel({'resultados': table, 'segmentos': segments}, path))
+            continue
+        written.append(export_frame(table, path))
+        if segments is not None:
+            written.append(export_frame(
+                segments, path.with_name(f"{path.stem}_segmentos{path.suffix}")))
+    return written
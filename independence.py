@@ -0,0 +1,281 @@
+"""
+Cribado de independencia entre todas las columnas categóricas
+=============================================================
+Generaliza el test Chi-cuadrado de la sección 3.5 a todos los pares de
+columnas categóricas (y de cada columna frente a `y`). Los códigos de las
+columnas se copian una sola vez a un bloque de memoria compartida y un
+pool de procesos construye las tablas de contingencia de cada par con
+`np.bincount`, sin volver a recorrer el DataFrame por cada crosstab.
+
+El resultado son matrices (DataFrames columna × columna) con χ², p-valor,
+grados de libertad y la V de Cramér.
+
+Para el test por segmento (mes × trabajo × contacto, ...) `chi2_batch`
+calcula en una sola pasada vectorizada las estadísticas de miles de tablas
+apiladas, con corrección por comparaciones múltiples (Bonferroni o BH).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Por debajo de este número de pares no compensa levantar procesos
+MIN_PAIRS_FOR_POOL = 16
+
+# Estado del proceso trabajador (memoria compartida adjunta)
+_WORKER = {}
+
+
+def _categorical_columns(df):
+    return [col for col in df.columns
+            if isinstance(df[col].dtype, pd.CategoricalDtype)
+            or df[col].dtype == object
+            or pd.api.types.is_string_dtype(df[col].dtype)]
+
+
+def _encode(df, columns):
+    """Códigos int16 de cada columna (una fila por columna) y su número de categorías."""
+    codes = np.empty((len(columns), len(df)), dtype=np.int16)
+    n_levels = []
+    for i, col in enumerate(columns):
+        categorical = pd.Categorical(df[col])
+        if len(categorical.categories) > np.iinfo(np.int16).max:
+            raise ValueError(f"Demasiadas categorías en '{col}' para el cribado")
+        codes[i] = categorical.codes
+        n_levels.append(len(categorical.categories))
+    return codes, n_levels
+
+
+def pair_table(row_codes, col_codes, n_rows, n_cols):
+    """Tabla de contingencia de dos columnas de códigos (nulos = -1 se ignoran)."""
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    if not valid.all():
+        row_codes, col_codes = row_codes[valid], col_codes[valid]
+    flat = row_codes.astype(np.int64) * n_cols + col_codes
+    return np.bincount(flat, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+
+def adjust_pvalues(p_values, method='bh'):
+    """Corregir p-valores por comparaciones múltiples.
+
+    `method` puede ser 'bonferroni' o 'bh' (Benjamini-Hochberg, controla la
+    tasa de falsos descubrimientos). Los NaN se ignoran y se conservan.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p_values.shape, np.nan)
+    valid = ~np.isnan(p_values)
+    p = p_values[valid]
+    m = len(p)
+    if m == 0:
+        return adjusted
+
+    if method == 'bonferroni':
+        adjusted[valid] = np.minimum(p * m, 1.0)
+    elif method in ('bh', 'fdr_bh'):
+        order = np.argsort(p)
+        scaled = p[order] * m / np.arange(1, m + 1)
+        scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+        result = np.empty(m)
+        result[order] = np.minimum(scaled, 1.0)
+        adjusted[valid] = result
+    else:
+        raise ValueError(f"Método de corrección desconocido: {method!r}")
+    return adjusted
+
+
+def chi2_batch(tables, correction=True, method=None, alpha=0.05):
+    """Test Chi-cuadrado de independencia para muchas tablas a la vez.
+
+    Parámetros:
+        tables: arreglo (n_tablas, filas, columnas) con los conteos
+        correction: corrección de Yates en las tablas con un grado de
+            libertad, como `stats.chi2_contingency`
+        method: None, 'bonferroni' o 'bh' para corregir los p-valores
+        alpha: nivel de significancia para la columna 'reject'
+
+    Las filas y columnas vacías de cada tabla no cuentan para los grados de
+    libertad ni para χ² (scipy fallaría con frecuencias esperadas nulas).
+    Devuelve un diccionario de arreglos: 'chi2', 'p_value', 'dof',
+    'expected', 'total' y, si hay `method`, 'p_adjusted' y 'reject'.
+    """
+    from scipy import stats
+
+    tables = np.asarray(tables, dtype=np.float64)
+    if tables.ndim == 2:
+        tables = tables[np.newaxis]
+
+    row_sums = tables.sum(axis=2)
+    col_sums = tables.sum(axis=1)
+    totals = row_sums.sum(axis=1)
+    dof = ((row_sums > 0).sum(axis=1) - 1) * ((col_sums > 0).sum(axis=1) - 1)
+    dof = np.maximum(dof, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = row_sums[:, :, np.newaxis] * col_sums[:, np.newaxis, :] \
+            / totals[:, np.newaxis, np.newaxis]
+        expected = np.nan_to_num(expected)
+
+        observed = tables
+        if correction:
+            diff = expected - observed
+            yates = (dof == 1)[:, np.newaxis, np.newaxis]
+            observed = np.where(yates,
+                                observed + np.minimum(0.5, np.abs(diff)) * np.sign(diff),
+                                observed)
+
+        cells = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+
+    chi2 = cells.sum(axis=(1, 2))
+    valid = dof > 0
+    chi2 = np.where(valid, chi2, np.nan)
+    p_value = np.full(len(chi2), np.nan)
+    p_value[valid] = stats.chi2.sf(chi2[valid], dof[valid])
+
+    result = {
+        'chi2': chi2,
+        'p_value': p_value,
+        'dof': dof,
+        'expected': expected,
+        'total': totals,
+    }
+    if method is not None:
+        result['p_adjusted'] = adjust_pvalues(p_value, method)
+        result['reject'] = result['p_adjusted'] < alpha
+    return result
+
+
+def chi2_statistic(table, correction=True):
+    """χ², p-valor, grados de libertad y total de una tabla.
+
+    Los tres primeros coinciden con los de `stats.chi2_contingency` (las
+    filas y columnas vacías se descartan antes del cálculo).
+    """
+    result = chi2_batch(table, correction)
+    return (float(result['chi2'][0]), float(result['p_value'][0]),
+            int(result['dof'][0]), float(result['total'][0]))
+
+
+def segment_tables(df, segment_cols, row_col, col_col='y'):
+    """Tablas de contingencia `row_col` × `col_col` para cada segmento.
+
+    Los segmentos son las combinaciones observadas de `segment_cols` (por
+    ejemplo ['month', 'job', 'contact']). Todas las tablas se cuentan en una
+    sola pasada con un índice plano (segmento, fila, columna).
+
+    Devuelve (índice de segmentos, arreglo (n_segmentos, filas, columnas),
+    etiquetas de filas, etiquetas de columnas).
+    """
+    segment_cols = list(segment_cols)
+    if len(segment_cols) == 1:
+        segment_codes, segments = pd.factorize(df[segment_cols[0]], sort=True)
+        segments = pd.Index(segments, name=segment_cols[0])
+    else:
+        segment_codes, segments = pd.MultiIndex.from_frame(df[segment_cols]).factorize(sort=True)
+        segments = segments.set_names(segment_cols)
+
+    row = pd.Categorical(df[row_col])
+    col = pd.Categorical(df[col_col])
+    n_rows, n_cols = len(row.categories), len(col.categories)
+
+    valid = (segment_codes >= 0) & (row.codes >= 0) & (col.codes >= 0)
+    flat = (segment_codes[valid].astype(np.int64) * n_rows
+            + row.codes[valid]) * n_cols + col.codes[valid]
+    n_segments = len(segments)
+    tables = np.bincount(flat, minlength=n_segments * n_rows * n_cols)
+    return (segments, tables.reshape(n_segments, n_rows, n_cols),
+            list(row.categories), list(col.categories))
+
+
+def cramers_v(chi2, total, n_rows, n_cols):
+    """V de Cramér a partir de χ² (sin corrección de sesgo)."""
+    k = min(n_rows, n_cols) - 1
+    if k <= 0 or not total:
+        return np.nan
+    return float(np.sqrt(chi2 / (total * k)))
+
+
+def _screen_pairs(codes, n_levels, pairs, correction):
+    """Calcular las estadísticas de una lista de pares (i, j) de columnas."""
+    results = []
+    for i, j in pairs:
+        table = pair_table(codes[i], codes[j], n_levels[i], n_levels[j])
+        chi2, p_value, dof, total = chi2_statistic(table, correction)
+        n_rows = int((table.sum(axis=1) > 0).sum())
+        n_cols = int((table.sum(axis=0) > 0).sum())
+        results.append((i, j, chi2, p_value, dof,
+                        cramers_v(chi2, total, n_rows, n_cols)))
+    return results
+
+
+def _init_worker(shm_name, shape):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER['shm'] = shm
+    _WORKER['codes'] = np.ndarray(shape, dtype=np.int16, buffer=shm.buf)
+
+
+def _worker_screen(n_levels, pairs, correction):
+    return _screen_pairs(_WORKER['codes'], n_levels, pairs, correction)
+
+
+def _split(items, n_parts):
+    size = -(-len(items) // n_parts)
+    return [items[k:k + size] for k in range(0, len(items), size)]
+
+
+def screen_independence(df, columns=None, target='y', workers=None, correction=True):
+    """Test Chi-cuadrado y V de Cramér para todos los pares de columnas categóricas.
+
+    Parámetros:
+        df: DataFrame con las columnas a analizar
+        columns: columnas categóricas (por defecto todas las de tipo
+            category/texto); `target` se agrega si no está incluida
+        workers: procesos del pool (None = núcleos disponibles, 1 = sin pool)
+        correction: corrección de Yates en tablas 2×2, como scipy
+
+    Devuelve un diccionario de DataFrames columna × columna con las claves
+    'chi2', 'p_value', 'dof' y 'cramers_v'.
+    """
+    if columns is None:
+        columns = _categorical_columns(df)
+    columns = list(columns)
+    if target is not None and target in df.columns and target not in columns:
+        columns.append(target)
+
+    codes, n_levels = _encode(df, columns)
+    pairs = list(combinations(range(len(columns)), 2))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(pairs)))
+
+    if workers == 1 or len(pairs) < MIN_PAIRS_FOR_POOL:
+        results = _screen_pairs(codes, n_levels, pairs, correction)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(codes.nbytes, 1))
+        try:
+            shared = np.ndarray(codes.shape, dtype=codes.dtype, buffer=shm.buf)
+            shared[:] = codes
+            del shared
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shm.name, codes.shape)) as pool:
+                futures = [pool.submit(_worker_screen, n_levels, batch, correction)
+                           for batch in _split(pairs, workers * 4)]
+                results = [row for future in futures for row in future.result()]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    n = len(columns)
+    matrices = {name: np.full((n, n), np.nan) for name in ('chi2', 'p_value', 'dof', 'cramers_v')}
+    np.fill_diagonal(matrices['cramers_v'], 1.0)
+    for i, j, chi2, p_value, dof, v in results:
+        for name, value in (('chi2', chi2), ('p_value', p_value),
+                            ('dof', dof), ('cramers_v', v)):
+            matrices[name][i, j] = matrices[name][j, i] = value
+
+    return {name: pd.DataFrame(values, index=columns, columns=columns)
+            for name, values in matrices.items()}
@@ -0,0 +1,172 @@
+"""
+Instrumentación por sección del análisis
+========================================
+`RunRecorder` mide cada etapa de una ejecución (carga, conteos y cada
+sección numerada): tiempo de pared, tiempo de CPU, memoria (RSS y,
+opcionalmente, el pico de tracemalloc) y filas procesadas. El resultado es
+un reporte JSON; con `profile=True` cada etapa corre bajo cProfile y se
+guarda el perfil de la etapa más lenta.
+
+Sin instrumentación no se crea ningún `RunRecorder` y este módulo ni
+siquiera se importa (`analisis_probabilidad.run_analysis` usa un contexto
+vacío). La memoria se lee de /proc o del módulo
+`resource` (solo Unix); en Windows se usa psutil si está instalado y, si
+no, los campos de memoria quedan en None.
+
+Ejemplo:
+    recorder = RunRecorder(trace_memory=True)
+    with recorder.stage('load') as stage:
+        df = load_data()
+        stage['rows'] = len(df)
+    recorder.write('data/run_report.json')
+"""
+
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+
+def _rss_mb():
+    """Memoria residente actual del proceso en MiB (máximo histórico si no hay /proc)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return max_rss_mb()
+
+
+def max_rss_mb():
+    """Máximo histórico de memoria residente del proceso en MiB (None si no se puede medir)."""
+    try:
+        import resource
+    except ImportError:
+        # Windows: sin `resource`; psutil da el pico (peak_wset) si está instalado
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KiB y macOS bytes
+    return rss / 1024 if sys.platform != 'darwin' else rss / (1024 * 1024)
+
+
+class RunRecorder:
+    """Registro de las etapas de una ejecución.
+
+    Parámetros:
+        trace_memory: medir además el pico de memoria con tracemalloc
+            (más preciso que el RSS pero hace más lento el código Python)
+        profile: correr cada etapa bajo cProfile y conservar el perfil de
+            la más lenta (los tiempos medidos quedan inflados)
+        metadata: datos libres que se copian al reporte (dataset, argumentos)
+    """
+
+    def __init__(self, trace_memory=False, profile=False, metadata=None):
+        self.trace_memory = trace_memory
+        self.profile = profile
+        self.metadata = dict(metadata or {})
+        self.stages = []
+        self._profiles = {}
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        if trace_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        """Medir el bloque `with`; el diccionario producido admite 'rows' y otros datos."""
+        info = {'rows': rows}
+        profiler = None
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.reset_peak()
+        if self.profile:
+            import cProfile
+
+            profiler = cProfile.Profile()
+        rss_before = _rss_mb()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield info
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            entry = {
+                'stage': name,
+                'wall_s': time.perf_counter() - wall,
+                'cpu_s': time.process_time() - cpu,
+                'rss_before_mb': rss_before,
+                'rss_after_mb': _rss_mb(),
+            }
+            if self.trace_memory:
+                import tracemalloc
+
+                entry['tracemalloc_peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            entry.update(info)
+            self.stages.append(entry)
+            if profiler is not None:
+                self._profiles[len(self.stages) - 1] = profiler
+
+    def hottest(self):
+        """Etapa con mayor tiempo de pared (None si no hay etapas)."""
+        return max(self.stages, key=lambda s: s['wall_s'], default=None)
+
+    def report(self):
+        """Reporte de la ejecución como diccionario serializable a JSON."""
+        hottest = self.hottest()
+        return {
+            'metadata': self.metadata,
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'pid': os.getpid(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'total': {
+                'wall_s': time.perf_counter() - self._start,
+                'cpu_s': time.process_time() - self._cpu_start,
+                'max_rss_mb': max_rss_mb(),
+            },
+            'hottest_stage': hottest['stage'] if hottest else None,
+            'stages': self.stages,
+        }
+
+    def write(self, path):
+        """Guardar el reporte JSON en `path` y devolver el diccionario."""
+        report = self.report()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False, default=str))
+        return report
+
+    def dump_profile(self, path):
+        """Guardar el perfil cProfile de la etapa más lenta (para pstats/snakeviz)."""
+        if not self._profiles:
+            raise RuntimeError("No hay perfiles: crea el RunRecorder con profile=True")
+        index = max(self._profiles, key=lambda i: self.stages[i]['wall_s'])
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._profiles[index].dump_stats(str(path))
+        return self.stages[index]['stage']
+
+    def print_summary(self):
+        print(f"{'etapa':<10}{'pared (s)':>11}{'CPU (s)':>10}{'RSS (MiB)':>11}{'filas':>12}")
+        for s in self.stages:
+            rows = f"{s['rows']:,}" if s.get('rows') is not None else '-'
+            rss = f"{s['rss_after_mb']:.1f}" if s['rss_after_mb'] is not None else '-'
+            print(f"{s['stage']:<10}{s['wall_s']:>11.4f}{s['cpu_s']:>10.4f}"
+                  f"{rss:>11}{rows:>12}")
@@ -0,0 +1,315 @@
+"""
+Prueba de carga del servicio de consultas
+=========================================
+Cliente asyncio (solo biblioteca estándar) que abre varias conexiones
+keep-alive contra `query_service.py`, reparte una mezcla de consultas y
+reporta la latencia p50/p90/p99, el máximo, el rendimiento y los errores.
+
+Con una mezcla fija de pocas rutas, tras el calentamiento todo sale de la
+caché de respuestas y solo se mide un acierto. Por eso la mezcla por
+defecto (`--mix random`) sortea condiciones con los valores que publica
+`/health`, y la latencia se reporta además por separado para aciertos y
+fallos de caché (cabecera `X-Cache`). `--no-cache` levanta el servicio
+sin caché para medir solo el cálculo.
+
+Con `--spawn` levanta el servicio en un subproceso en un puerto libre,
+espera a que `/health` responda y lo detiene al terminar, así la prueba
+corre completa en local.
+
+Ejemplos:
+    python load_test.py --spawn --dataset bank-additional-full --requests 20000
+    python load_test.py --spawn --dataset bank-additional-full --no-cache
+    python load_test.py --url http://127.0.0.1:8080 --concurrency 64 --mix fixed --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+# Mezcla de consultas típica de una sesión de análisis (dataset real)
+BANK_PATHS = [
+    '/marginal?dims=age_group',
+    '/marginal?dims=month&y=yes',
+    '/conditional?target=y&value=yes&age_group=young',
+    '/conditional?target=y&value=yes&job=student&contact=cellular',
+    '/conditional?target=y&job=retired',
+    '/joint?age_group=senior&y=yes',
+    '/bayes?row=age_group&target=y&positive=yes',
+    '/bayes?row=job&target=y&positive=yes&contact=cellular',
+    '/chi2?row=age_group&col=y',
+    '/chi2?row=job&col=y&month=may',
+    '/query?q=y%3Dyes%7Cpoutcome%3Dsuccess',
+]
+
+# Peticiones del calentamiento (fuera de la medición y distintas de las medidas)
+WARMUP_REQUESTS = 50
+
+# El dataset simulado solo tiene age_group e y como dimensiones
+SIMULATED_PATHS = [
+    '/marginal?dims=age_group',
+    '/marginal?dims=age_group&y=yes',
+    '/conditional?target=y&value=yes&age_group=young',
+    '/joint?age_group=senior&y=yes',
+    '/bayes?row=age_group&target=y&positive=yes',
+    '/chi2?row=age_group&col=y',
+]
+
+
+def random_paths(labels, count, target='y', positive='yes', max_conditions=2, seed=42):
+    """`count` consultas con condiciones sorteadas entre los valores de cada dimensión.
+
+    `labels` es {dimensión: valores} (el campo 'labels' de `/health`).
+    """
+    rng = random.Random(seed)
+    dims = [d for d in labels if d != target and labels[d]]
+    paths = []
+    for _ in range(count):
+        given = {d: rng.choice(labels[d])
+                 for d in rng.sample(dims, rng.randint(0, min(max_conditions, len(dims))))}
+        free = [d for d in dims if d not in given] or dims
+        kind = rng.choice(['marginal', 'conditional', 'joint', 'bayes', 'chi2'])
+        if kind == 'marginal':
+            params = {'dims': rng.choice(free), **given}
+        elif kind == 'conditional':
+            params = {'target': target, 'value': positive, **given}
+        elif kind == 'joint':
+            params = {**given, target: positive}
+        elif kind == 'bayes':
+            params = {'row': rng.choice(free), 'target': target, 'positive': positive, **given}
+        else:
+            params = {'row': rng.choice(free), 'col': target, **given}
+        paths.append(f"/{kind}?{urlencode(params)}")
+    return paths
+
+
+def percentile(sorted_values, q):
+    """Percentil `q` (0-100) por interpolación lineal de una lista ordenada."""
+    if not sorted_values:
+        return float('nan')
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+async def _request(reader, writer, host, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    cache_state = None
+    for line in head.split(b'\r\n'):
+        lower = line.lower()
+        if lower.startswith(b'content-length:'):
+            length = int(line.split(b':', 1)[1])
+        elif lower.startswith(b'x-cache:'):
+            cache_state = line.split(b':', 1)[1].strip().decode()
+    body = await reader.readexactly(length)
+    return status, body, cache_state
+
+
+async def _worker(host, port, paths, counter, total, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            index = counter[0]
+            if index >= total:
+                return
+            counter[0] += 1
+            path = paths[index % len(paths)]
+            start = time.perf_counter()
+            try:
+                status, _, cache_state = await _request(reader, writer, host, path)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                errors.append(f"{path}: {e}")
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            latencies.append((time.perf_counter() - start, cache_state))
+            if status != 200:
+                errors.append(f"{path}: HTTP {status}")
+    finally:
+        writer.close()
+
+
+def _latency_summary(latencies):
+    """Media, p50/p90/p99 y máximo en milisegundos de una lista de segundos."""
+    ordered = sorted(latencies)
+    ms = lambda s: s * 1000  # noqa: E731
+    return {
+        'count': len(ordered),
+        'mean': ms(statistics.fmean(ordered)) if ordered else float('nan'),
+        'p50': ms(percentile(ordered, 50)),
+        'p90': ms(percentile(ordered, 90)),
+        'p99': ms(percentile(ordered, 99)),
+        'max': ms(ordered[-1]) if ordered else float('nan'),
+    }
+
+
+def warmup_paths(labels, measured, count=WARMUP_REQUESTS, seed=42):
+    """Consultas de calentamiento que no están entre las `measured`.
+
+    Así el calentamiento abre el pool de hilos y los imports del servicio
+    sin dejar en la caché ninguna respuesta de las que se van a medir.
+    """
+    measured = set(measured)
+    candidates = random_paths(labels, count * 4, seed=seed + 1)
+    return [p for p in dict.fromkeys(candidates) if p not in measured][:count]
+
+
+async def run_load(url, paths, requests=5000, concurrency=32, warmup=()):
+    """Lanzar `requests` peticiones con `concurrency` conexiones; devuelve el resumen.
+
+    `warmup` son consultas que se lanzan antes, fuera de la medición (ver
+    `warmup_paths`); deben ser distintas de `paths` para no convertir las
+    primeras peticiones medidas en aciertos de caché.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+
+    if warmup:
+        warmup = list(warmup)
+        await _worker(host, port, warmup, [0], len(warmup), [], [])
+
+    latencies, errors, counter = [], [], [0]
+    started = time.perf_counter()
+    await asyncio.gather(*[_worker(host, port, paths, counter, requests, latencies, errors)
+                           for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    seconds = [s for s, _ in latencies]
+    return {
+        'url': url,
+        'requests': requests,
+        'concurrency': concurrency,
+        'completed': len(latencies),
+        'errors': len(errors),
+        'error_samples': errors[:5],
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed if elapsed else float('nan'),
+        'latency_ms': _latency_summary(seconds),
+        'latency_by_cache_ms': {
+            state: _latency_summary([s for s, c in latencies if c == state])
+            for state in ('hit', 'miss')
+        },
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def _wait_healthy(host, port, timeout=120):
+    """Esperar a que el servicio responda `/health`; devuelve ese cuerpo."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            status, body, _ = await _request(reader, writer, host, '/health')
+            writer.close()
+            if status == 200:
+                return json.loads(body)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError):
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"El servicio no respondió en {timeout} s")
+
+
+async def fetch_health(url):
+    """Leer `/health` del servicio en `url`."""
+    parts = urlsplit(url)
+    return await _wait_healthy(parts.hostname, parts.port or 80, timeout=10)
+
+
+def spawn_service(dataset, port, cache=True):
+    """Levantar query_service.py en un subproceso; devuelve el Popen."""
+    script = Path(__file__).resolve().parent / 'query_service.py'
+    return subprocess.Popen(
+        [sys.executable, str(script), '--dataset', dataset, '--port', str(port),
+         '--reload-interval', '0', *([] if cache else ['--no-cache'])],
+        stdout=subprocess.DEVNULL, env=dict(os.environ))
+
+
+def print_report(report):
+    lat = report['latency_ms']
+    print(f"\nPrueba de carga contra {report['url']}")
+    print(f"  Peticiones: {report['completed']:,}/{report['requests']:,} "
+          f"({report['concurrency']} conexiones, {report['errors']} errores)")
+    print(f"  Rendimiento: {report['throughput_rps']:,.0f} peticiones/s "
+          f"en {report['elapsed_s']:.2f} s")
+    print(f"  Latencia (ms): p50 {lat['p50']:.2f} | p90 {lat['p90']:.2f} | "
+          f"p99 {lat['p99']:.2f} | máx {lat['max']:.2f}")
+    for state, name in (('miss', 'fallos de caché'), ('hit', 'aciertos de caché')):
+        lat = report['latency_by_cache_ms'][state]
+        if lat['count']:
+            print(f"    {name} ({lat['count']:,}): p50 {lat['p50']:.2f} | "
+                  f"p90 {lat['p90']:.2f} | p99 {lat['p99']:.2f} | máx {lat['max']:.2f}")
+    for sample in report['error_samples']:
+        print(f"  ✗ {sample}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de consultas")
+    parser.add_argument('--url', default=None, help="Servicio ya en marcha (ej. http://127.0.0.1:8080)")
+    parser.add_argument('--spawn', action='store_true',
+                        help="Levantar el servicio en un subproceso para la prueba")
+    parser.add_argument('--dataset', default='simulado', help="Dataset del servicio (con --spawn)")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--mix', choices=['random', 'fixed'], default='random',
+                        help="Consultas sorteadas con los valores de /health (por defecto) "
+                             "o la lista fija de rutas")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla de la mezcla aleatoria")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Con --spawn: levantar el servicio sin caché")
+    parser.add_argument('--json', action='store_true', help="Imprimir el resumen como JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.url and not args.spawn:
+        print("✗ Indica --url o --spawn", file=sys.stderr)
+        return 2
+
+    process = None
+    url = args.url
+    try:
+        if args.spawn:
+            port = _free_port()
+            url = f"http://127.0.0.1:{port}"
+            process = spawn_service(args.dataset, port, cache=not args.no_cache)
+            health = asyncio.run(_wait_healthy('127.0.0.1', port))
+        else:
+            health = asyncio.run(fetch_health(url))
+        if args.mix == 'random':
+            paths = random_paths(health['labels'], args.requests, seed=args.seed)
+        else:
+            paths = SIMULATED_PATHS if health['dataset'] == 'simulado' else BANK_PATHS
+        warmup = warmup_paths(health['labels'], paths, seed=args.seed)
+        report = asyncio.run(run_load(url, paths, args.requests, args.concurrency, warmup))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
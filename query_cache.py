@@ -0,0 +1,188 @@
+"""
+Capa de consultas de probabilidad con caché LRU
+===============================================
+`CachedQueries` envuelve un `cube.CountCube` y memoriza cada respuesta
+(probabilidades, conteos, distribuciones) con la clave
+
+    (versión del dataset, versión del cubo, tipo de consulta, condiciones, objetivo)
+
+en una caché LRU acotada por número de entradas y por bytes. Como la
+versión del cubo cambia con cada `update`, las respuestas viejas dejan de
+coincidir solas (y el LRU termina por expulsarlas): no hay que invalidar a
+mano cuando llegan datos nuevos.
+
+La caché es segura entre hilos y lleva estadísticas de aciertos, fallos y
+expulsiones, pensada para un servicio compartido donde muchos analistas
+repiten las mismas consultas.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from cube import parse_conditions
+
+DEFAULT_MAX_ENTRIES = 4096
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_MISSING = object()
+
+
+def _sizeof(value):
+    """Tamaño aproximado en bytes de una respuesta cacheada."""
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Caché LRU con límite de entradas y de bytes, y estadísticas de uso."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def stats(self):
+        """Aciertos, fallos, tasa de aciertos, expulsiones, entradas y bytes usados."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+def _freeze(conditions):
+    """Condiciones {dimensión: valor o lista} como clave hashable y canónica."""
+    if not conditions:
+        return ()
+    frozen = []
+    for dim, values in conditions.items():
+        if values is None:
+            continue
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        frozen.append((dim, tuple(str(v) for v in values)))
+    return tuple(sorted(frozen))
+
+
+class CachedQueries:
+    """Consultas de probabilidad memorizadas sobre un cubo de conteos.
+
+    Parámetros:
+        cube: `cube.CountCube` con los conteos
+        dataset_version: identificador del dataset (por ejemplo la clave de
+            `data_cache`), para compartir la caché entre cubos de datasets
+            distintos sin mezclar respuestas
+        cache: `LRUCache` a usar (por defecto una nueva)
+    """
+
+    def __init__(self, cube, dataset_version=None, cache=None):
+        self.cube = cube
+        self.dataset_version = dataset_version
+        self.cache = cache if cache is not None else LRUCache()
+
+    def _key(self, kind, conditions, target=None):
+        target = tuple(target) if isinstance(target, list) else target
+        return (self.dataset_version, self.cube.version, kind, _freeze(conditions), target)
+
+    def _memoized(self, key, compute):
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.cache.put(key, value)
+        # Las Series se devuelven como copia para que el llamador no altere la caché
+        return value.copy() if isinstance(value, (pd.Series, pd.DataFrame)) else value
+
+    def update(self, df):
+        """Sumar datos nuevos al cubo; las respuestas anteriores quedan obsoletas."""
+        self.cube.update(df)
+        return self
+
+    def count(self, where=None):
+        return self._memoized(self._key('count', where), lambda: self.cube.count(where))
+
+    def prob(self, event, given=None):
+        """P(event | given), memorizada."""
+        key = self._key('prob', given, _freeze(event))
+        return self._memoized(key, lambda: self.cube.prob(event, given))
+
+    def marginal(self, dims, where=None):
+        key = self._key('marginal', where, dims)
+        return self._memoized(key, lambda: self.cube.marginal(dims, where))
+
+    def distribution(self, dims, given=None):
+        """P(dims | given), memorizada."""
+        key = self._key('distribution', given, dims)
+        return self._memoized(key, lambda: self.cube.distribution(dims, given))
+
+    def table(self, row, col='y', where=None):
+        key = self._key('table', where, (row, col))
+        return self._memoized(key, lambda: self.cube.table(row, col, where))
+
+    def query(self, text):
+        """`CountCube.query` memorizada; la clave es la consulta ya interpretada."""
+        event_text, _, given_text = text.partition('|')
+        event = parse_conditions(event_text)
+        given = parse_conditions(given_text)
+        key = self._key('query', given, (_freeze(event), tuple(d for d, v in event.items()
+                                                               if v is None)))
+        return self._memoized(key, lambda: self.cube.query(text))
+
+    def stats(self):
+        return self.cache.stats()
+
@@ -0,0 +1,441 @@
+"""
+Servicio HTTP local de consultas de probabilidad
+================================================
+Servidor asyncio (solo biblioteca estándar) que carga el dataset una vez,
+construye el cubo de conteos (`cube.CountCube`) y responde en JSON las
+consultas de la sección 3 sin volver a correr el script:
+
+    GET /health                                 estado, versión y estadísticas de la caché
+    GET /marginal?dims=month                    P(month)
+    GET /marginal?dims=month&y=yes              P(month | y=yes)
+    GET /conditional?target=y&value=yes&job=student&contact=cellular
+                                                P(y=yes | job=student, contact=cellular)
+    GET /joint?age_group=young&y=yes            P(age_group=young ∩ y=yes)
+    GET /bayes?row=age_group&target=y&positive=yes
+                                                prior, verosimilitud y posterior por grupo
+    GET /chi2?row=age_group&col=y               test Chi-cuadrado de independencia
+    GET /query?q=y=yes|job=student              consulta libre (sintaxis de CountCube.query)
+    POST /reload                                reconstruir los agregados ahora
+
+Los parámetros que no son reservados son condiciones `dimensión=valor`
+(varios valores con '/': `month=may/jun`). Los cálculos corren en un pool
+de hilos, así que el bucle de eventos nunca se bloquea; las respuestas se
+memorizan con `query_cache.CachedQueries` y, además, cada respuesta se
+guarda ya serializada en la misma caché LRU, así una consulta repetida se
+contesta sin salir del bucle de eventos. La cabecera `X-Cache` (hit/miss)
+indica si la respuesta salió de esa caché; `--no-cache` la desactiva (y
+también la de `CachedQueries`) para medir el cálculo de cada consulta.
+
+Recarga en caliente: cada `--reload-interval` segundos se revisa la
+versión de la fuente (tamaño y fecha del zip o del archivo `--watch`); si
+cambió, los agregados se reconstruyen en segundo plano y se reemplazan de
+forma atómica, sin cortar las peticiones en curso.
+
+Ejemplo:
+    python query_service.py --dataset bank-additional-full --port 8080
+    curl 'http://127.0.0.1:8080/conditional?target=y&value=yes&job=student'
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+import warnings
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HOST = '127.0.0.1'
+
+DEFAULT_PORT = 8080
+
+DEFAULT_RELOAD_INTERVAL = 5.0
+
+# Parámetros que no son condiciones
+RESERVED = {'dims', 'target', 'value', 'row', 'col', 'positive', 'q', 'correction'}
+
+MAX_HEADER_BYTES = 64 * 1024
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error',
+               503: 'Service Unavailable'}
+
+
+class BadRequest(Exception):
+    """Parámetros inválidos en la petición (respuesta 400)."""
+
+
+# ============================================================================
+# Agregados
+# ============================================================================
+
+def source_version(dataset, watch=None):
+    """Versión de la fuente de datos: (tamaño, fecha de modificación) del archivo vigilado."""
+    import analisis_probabilidad as ap
+
+    if watch is None and dataset != ap.SIMULATED:
+        from data_loader import DEFAULT_ZIP
+
+        watch = DEFAULT_ZIP
+    if watch is None:
+        return 'simulado'
+    try:
+        stat = Path(watch).stat()
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def build_state(dataset, watch=None, cache=None):
+    """Cargar el dataset y construir el cubo y la capa de consultas (bloqueante)."""
+    import analisis_probabilidad as ap
+    from cube import CountCube
+    from query_cache import CachedQueries
+
+    # scipy (rutas /chi2) se importa aquí y no en la primera petición
+    from scipy import stats  # noqa: F401
+
+    version = source_version(dataset, watch)
+    started = time.perf_counter()
+    df = ap.load_data(dataset)
+    cube = CountCube.from_frame(df)
+    return {
+        'dataset': dataset,
+        'version': version,
+        'rows': len(df),
+        'queries': CachedQueries(cube, dataset_version=(dataset, version), cache=cache),
+        'build_s': time.perf_counter() - started,
+        'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def _jsonable(value):
+    """Convertir resultados (Series, numpy, NaN) a tipos JSON."""
+    if isinstance(value, pd.Series):
+        if isinstance(value.index, pd.MultiIndex):
+            return [{**dict(zip(value.index.names, map(str, key))), 'value': _jsonable(v)}
+                    for key, v in value.items()]
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return {str(k): _jsonable(value.loc[k]) for k in value.index}
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    return value
+
+
+def _encode(body):
+    return json.dumps(_jsonable(body), ensure_ascii=False).encode()
+
+
+# ============================================================================
+# Consultas
+# ============================================================================
+
+def _conditions(params):
+    conditions = {}
+    for name, value in params.items():
+        if name in RESERVED:
+            continue
+        values = value.split('/')
+        conditions[name] = values[0] if len(values) == 1 else values
+    return conditions
+
+
+def _require(params, name):
+    if not params.get(name):
+        raise BadRequest(f"Falta el parámetro '{name}'")
+    return params[name]
+
+
+def handle_marginal(queries, params):
+    dims = _require(params, 'dims').split(',')
+    given = _conditions(params)
+    return {'dims': dims, 'given': given,
+            'count': queries.count(given),
+            'probabilities': queries.distribution(dims, given)}
+
+
+def handle_conditional(queries, params):
+    target = _require(params, 'target')
+    given = _conditions(params)
+    if 'value' in params:
+        values = params['value'].split('/')
+        event = {target: values[0] if len(values) == 1 else values}
+        return {'event': event, 'given': given, 'probability': queries.prob(event, given)}
+    return {'target': target, 'given': given,
+            'probabilities': queries.distribution([target], given)}
+
+
+def handle_joint(queries, params):
+    event = _conditions(params)
+    if not event:
+        raise BadRequest("Indica al menos una condición, por ejemplo ?age_group=young&y=yes")
+    return {'event': event, 'count': queries.count(event), 'probability': queries.prob(event)}
+
+
+def handle_bayes(queries, params):
+    """Teorema de Bayes: P(fila | objetivo=positivo) = P(positivo | fila) × P(fila) / P(positivo)."""
+    from counts import probability_tables
+
+    row = params.get('row', 'age_group')
+    target = params.get('target', 'y')
+    if row == target:
+        raise BadRequest(f"'row' y 'target' deben ser columnas distintas (ambas son {row!r})")
+    positive = params.get('positive', 'yes')
+    table = queries.table(row, target, _conditions(params))
+    summary = probability_tables(table, positive=positive)
+    return {'row': row, 'target': target, 'positive': positive,
+            'given': _conditions(params),
+            'prob_positive': summary['prob_subscribe'],
+            'prior': summary['marginal_probs'],
+            'likelihood': {g: c['prob_yes'] for g, c in summary['conditional_probs'].items()},
+            'posterior': summary['bayes_results']}
+
+
+def handle_chi2(queries, params):
+    from independence import chi2_statistic
+
+    row = _require(params, 'row')
+    col = params.get('col', 'y')
+    if row == col:
+        raise BadRequest(f"'row' y 'col' deben ser columnas distintas (ambas son {row!r})")
+    correction = params.get('correction', 'true').lower() not in ('0', 'false', 'no')
+    table = queries.table(row, col, _conditions(params))
+    chi2, p_value, dof, total = chi2_statistic(table, correction)
+    return {'row': row, 'col': col, 'given': _conditions(params),
+            'chi2': chi2, 'p_value': p_value, 'dof': dof, 'total': total}
+
+
+def handle_query(queries, params):
+    text = _require(params, 'q')
+    return {'query': text, 'result': queries.query(text)}
+
+
+ROUTES = {
+    '/marginal': handle_marginal,
+    '/conditional': handle_conditional,
+    '/joint': handle_joint,
+    '/bayes': handle_bayes,
+    '/chi2': handle_chi2,
+    '/query': handle_query,
+}
+
+
+# ============================================================================
+# Servidor
+# ============================================================================
+
+class QueryService:
+    """Servidor HTTP/1.1 mínimo sobre `asyncio.start_server` (con keep-alive).
+
+    Parámetros:
+        dataset: 'simulado' o un CSV de bank+marketing.zip
+        watch: archivo cuya modificación dispara la recarga (por defecto el zip)
+        reload_interval: segundos entre revisiones de la versión (0 = sin recarga)
+        cache: memorizar respuestas y consultas (False = calcular cada petición)
+    """
+
+    def __init__(self, dataset='simulado', watch=None, reload_interval=DEFAULT_RELOAD_INTERVAL,
+                 cache=True):
+        from query_cache import LRUCache
+
+        self.dataset = dataset
+        self.watch = watch
+        self.reload_interval = reload_interval
+        # Sin caché: una LRU de capacidad 0 descarta cada entrada al guardarla
+        self.cache = LRUCache() if cache else LRUCache(max_entries=0)
+        self.state = None
+        self.requests = 0
+        self.reloads = 0
+        self._reload_lock = asyncio.Lock()
+
+    async def load(self):
+        """Construir los agregados en un hilo y reemplazar el estado de una vez."""
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            state = await loop.run_in_executor(None, build_state, self.dataset,
+                                               self.watch, self.cache)
+            self.state = state
+            self.reloads += 1
+            print(f"✓ Agregados listos: {state['rows']:,} filas, versión {state['version']}, "
+                  f"{state['build_s']:.2f} s", flush=True)
+
+    async def watch_source(self):
+        """Tarea de fondo: recargar cuando cambia la versión de la fuente."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            version = await loop.run_in_executor(None, source_version, self.dataset, self.watch)
+            if version is not None and self.state is not None and version != self.state['version']:
+                print(f"↻ Nueva versión de datos ({version}), recargando...", flush=True)
+                try:
+                    await self.load()
+                except Exception as e:  # la versión anterior sigue atendiendo
+                    print(f"✗ No se pudo recargar: {e}", file=sys.stderr, flush=True)
+
+    def health(self):
+        state = self.state
+        return {
+            'status': 'ok' if state else 'loading',
+            'dataset': self.dataset,
+            'version': state and state['version'],
+            'rows': state and state['rows'],
+            'dims': state and state['queries'].cube.dims,
+            'labels': state and {d: [str(v) for v in labels]
+                                 for d, labels in state['queries'].cube.labels.items()},
+            'loaded_at': state and state['loaded_at'],
+            'reloads': self.reloads,
+            'requests': self.requests,
+            'cache': self.cache.stats(),
+        }
+
+    async def dispatch(self, method, target):
+        """Resolver una petición.
+
+        Devuelve (código, cuerpo JSON serializable o ya en bytes, estado de
+        la caché de respuestas: 'hit', 'miss' o None si no aplica).
+        """
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        if url.path == '/health':
+            return 200, self.health(), None
+        if url.path == '/reload':
+            if method != 'POST':
+                return 405, {'error': "Usa POST /reload"}, None
+            await self.load()
+            return 200, self.health(), None
+        handler = ROUTES.get(url.path)
+        if handler is None:
+            return 404, {'error': f"Ruta desconocida: {url.path}",
+                         'routes': ['/health', '/reload', *ROUTES]}, None
+        if method != 'GET':
+            return 405, {'error': f"Usa GET {url.path}"}, None
+        state = self.state
+        if state is None:
+            return 503, {'error': "Los agregados todavía se están cargando"}, None
+
+        # Respuesta completa ya serializada: un acierto se responde sin salir del bucle
+        queries = state['queries']
+        key = ('response', queries.dataset_version, queries.cube.version,
+               url.path, tuple(sorted(params.items())))
+        payload = self.cache.get(key)
+        if payload is not None:
+            return 200, payload, 'hit'
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, handler, queries, params)
+        except (BadRequest, KeyError, ValueError) as e:
+            return 400, {'error': str(e.args[0] if e.args else e)}, 'miss'
+        result['version'] = state['version']
+        payload = _encode(result)
+        self.cache.put(key, payload)
+        return 200, payload, 'miss'
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                try:
+                    status, body, cache_state = await self.dispatch(method.upper(), target)
+                except Exception as e:
+                    status, body, cache_state = 500, {'error': f"{type(e).__name__}: {e}"}, None
+                payload = body if isinstance(body, bytes) else _encode(body)
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                extra = f"X-Cache: {cache_state}\r\n" if cache_state else ""
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(payload)}\r\n{extra}"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """Cargar los agregados, abrir el puerto y atender hasta que se cancele."""
+        await self.load()
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            limit=MAX_HEADER_BYTES)
+        watcher = None
+        if self.reload_interval > 0:
+            watcher = asyncio.create_task(self.watch_source())
+        address = server.sockets[0].getsockname()
+        print(f"✓ Servicio escuchando en http://{address[0]}:{address[1]}", flush=True)
+        if ready is not None:
+            ready.set_result(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de consultas de probabilidad")
+    parser.add_argument('--dataset', default='simulado',
+                        help="'simulado' o un CSV de bank+marketing.zip (ej. bank-additional-full)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--watch', default=None,
+                        help="Archivo cuya modificación dispara la recarga (por defecto el zip)")
+    parser.add_argument('--reload-interval', type=float, default=DEFAULT_RELOAD_INTERVAL,
+                        help="Segundos entre revisiones de la versión de datos (0 = sin recarga)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="No memorizar respuestas ni consultas (medir el cálculo)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    warnings.filterwarnings('ignore')
+    service = QueryService(args.dataset, args.watch, args.reload_interval,
+                           cache=not args.no_cache)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n✓ Servicio detenido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""
+Estadísticas descriptivas en una sola pasada, por bloques
+=========================================================
+Para resumir historiales de campañas que no caben en memoria, cada columna
+numérica se acumula bloque a bloque:
+
+- `RunningStats`: conteo, media, varianza, mínimo y máximo con el
+  algoritmo de Welford/Chan. Cada bloque se resume con numpy y se combina
+  con lo acumulado, así que dos acumuladores de bloques o procesos
+  distintos se pueden sumar (`merge` o `+`) con el mismo resultado que una
+  pasada sobre todos los datos.
+- `QuantileSketch`: cuantiles aproximados (mediana, p90, p99) con memoria
+  acotada. Es un histograma de cubetas logarítmicas (como DDSketch): el
+  valor devuelto para cualquier cuantil tiene error relativo ≤ `alpha`
+  (por defecto 1 %), es decir |q̂ - q| ≤ alpha·|q|, sin importar cuántas
+  filas se procesen. También se puede combinar entre bloques.
+
+`StreamingSummary` junta ambos para varias columnas (age, balance,
+duration, campaign y los indicadores económicos de bank-additional).
+
+Ejemplos:
+    python streaming_stats.py --dataset bank-additional-full --chunksize 10000
+    python streaming_stats.py --scale 1000 --alpha 0.005
+"""
+
+import argparse
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COLUMNS = [
+    'age', 'balance', 'duration', 'campaign',
+    'emp.var.rate', 'cons.price.idx', 'cons.conf.idx', 'euribor3m', 'nr.employed',
+]
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+DEFAULT_ALPHA = 0.01
+
+# Máximo de cubetas por signo; al superarlo se fusionan las de menor magnitud
+DEFAULT_MAX_BINS = 4096
+
+
+def _clean(values):
+    """Arreglo float64 sin NaN."""
+    values = np.asarray(values, dtype=np.float64).ravel()
+    return values[~np.isnan(values)] if np.isnan(values).any() else values
+
+
+class RunningStats:
+    """Conteo, media, varianza, mínimo y máximo acumulados en una pasada."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, minimum=math.inf, maximum=-math.inf):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+        self.min = float(minimum)
+        self.max = float(maximum)
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        """Fórmula de Chan para combinar dos resúmenes (n, media, M2)."""
+        if not count:
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+        return self
+
+    def update(self, values):
+        """Sumar un bloque de valores (los NaN se ignoran)."""
+        values = _clean(values)
+        if not len(values):
+            return self
+        mean = values.mean()
+        return self._combine(len(values), mean, float(((values - mean) ** 2).sum()),
+                             float(values.min()), float(values.max()))
+
+    def merge(self, other):
+        """Combinar con el acumulador de otro bloque o proceso (devuelve uno nuevo)."""
+        return self.copy()._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def copy(self):
+        return RunningStats(self.count, self.mean, self.m2, self.min, self.max)
+
+    def variance(self, ddof=1):
+        return self.m2 / (self.count - ddof) if self.count > ddof else math.nan
+
+    def std(self, ddof=1):
+        return math.sqrt(self.variance(ddof))
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean if self.count else math.nan,
+                'std': self.std(), 'min': self.min if self.count else math.nan,
+                'max': self.max if self.count else math.nan}
+
+    def __repr__(self):
+        return (f"RunningStats(count={self.count}, mean={self.mean:.4g}, "
+                f"std={self.std():.4g}, min={self.min:.4g}, max={self.max:.4g})")
+
+
+class QuantileSketch:
+    """Cuantiles aproximados con error relativo acotado y memoria acotada.
+
+    Cada valor x ≠ 0 cae en la cubeta k = ceil(log_γ |x|), con
+    γ = (1 + alpha) / (1 - alpha); los ceros se cuentan aparte. El
+    representante de la cubeta, 2γ^k / (γ + 1), está a distancia relativa
+    ≤ alpha de cualquier valor de la cubeta, así que el cuantil estimado
+    cumple |q̂ - q| ≤ alpha·|q|.
+
+    La memoria depende del rango de magnitudes, no del número de filas: de
+    1e-3 a 1e6 con alpha = 1 % son ~1,000 cubetas por signo. Si se supera
+    `max_bins` se fusionan las cubetas de menor magnitud (solo los
+    cuantiles de esos valores pierden la garantía).
+    """
+
+    def __init__(self, alpha=DEFAULT_ALPHA, max_bins=DEFAULT_MAX_BINS):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha debe estar entre 0 y 1")
+        self.alpha = alpha
+        self.max_bins = max_bins
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        # Por signo: (clave mínima, conteos por cubeta desde esa clave)
+        self._stores = {1: (0, np.zeros(0, dtype=np.int64)),
+                        -1: (0, np.zeros(0, dtype=np.int64))}
+        self.zeros = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _add_to_store(self, sign, keys, counts=None):
+        if not len(keys):
+            return
+        offset, bins = self._stores[sign]
+        low, high = int(keys.min()), int(keys.max())
+        if len(bins):
+            low, high = min(low, offset), max(high, offset + len(bins) - 1)
+        merged = np.zeros(high - low + 1, dtype=np.int64)
+        if len(bins):
+            merged[offset - low:offset - low + len(bins)] = bins
+        merged += np.bincount(keys - low, weights=counts,
+                              minlength=len(merged)).astype(np.int64)
+        # Fusionar las cubetas de menor magnitud si se pasa del límite
+        if len(merged) > self.max_bins:
+            extra = len(merged) - self.max_bins
+            merged[extra] += merged[:extra].sum()
+            merged, low = merged[extra:], low + extra
+        self._stores[sign] = (low, merged)
+
+    def update(self, values):
+        """Sumar un bloque de valores (los NaN se ignoran)."""
+        values = _clean(values)
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.zeros += int((values == 0).sum())
+        for sign, mask in ((1, values > 0), (-1, values < 0)):
+            magnitudes = np.abs(values[mask])
+            keys = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+            self._add_to_store(sign, keys)
+        return self
+
+    def merge(self, other):
+        """Combinar con el sketch de otro bloque (mismo alpha); devuelve uno nuevo."""
+        if other.alpha != self.alpha:
+            raise ValueError("Solo se pueden combinar sketches con el mismo alpha")
+        merged = self.copy()
+        for sign in (1, -1):
+            offset, bins = other._stores[sign]
+            nonzero = np.flatnonzero(bins)
+            merged._add_to_store(sign, nonzero + offset, bins[nonzero])
+        merged.zeros += other.zeros
+        merged.count += other.count
+        merged.min = min(merged.min, other.min)
+        merged.max = max(merged.max, other.max)
+        return merged
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def copy(self):
+        sketch = QuantileSketch(self.alpha, self.max_bins)
+        sketch._stores = {s: (o, b.copy()) for s, (o, b) in self._stores.items()}
+        sketch.zeros, sketch.count = self.zeros, self.count
+        sketch.min, sketch.max = self.min, self.max
+        return sketch
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Valor aproximado del cuantil `q` (0-1), con error relativo ≤ alpha."""
+        if not self.count:
+            return math.nan
+        # Acotar al rango observado no puede alejar la estimación del valor real
+        return min(max(self._quantile(q), self.min), self.max)
+
+    def _quantile(self, q):
+        rank = q * (self.count - 1)
+        # Orden ascendente: negativos de mayor a menor magnitud, ceros, positivos
+        offset, bins = self._stores[-1]
+        seen = 0
+        for i in range(len(bins) - 1, -1, -1):
+            seen += bins[i]
+            if seen > rank:
+                return -self._value(offset + i)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        offset, bins = self._stores[1]
+        cumulative = np.cumsum(bins) + seen
+        i = int(np.searchsorted(cumulative, rank, side='right'))
+        return self._value(offset + min(i, len(bins) - 1))
+
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        return {q: self.quantile(q) for q in qs}
+
+    @property
+    def n_bins(self):
+        return sum(len(b) for _, b in self._stores.values())
+
+    def __repr__(self):
+        return f"QuantileSketch(alpha={self.alpha}, count={self.count}, bins={self.n_bins})"
+
+
+class StreamingSummary:
+    """Resumen descriptivo de varias columnas acumulado bloque a bloque.
+
+    Parámetros:
+        columns: columnas a resumir (por defecto las de `DEFAULT_COLUMNS`
+            que aparezcan en el primer bloque)
+        alpha: error relativo de los cuantiles
+        quantiles: cuantiles a reportar
+    """
+
+    def __init__(self, columns=None, alpha=DEFAULT_ALPHA, quantiles=DEFAULT_QUANTILES):
+        self.columns = list(columns) if columns is not None else None
+        self.alpha = alpha
+        self.quantile_levels = tuple(quantiles)
+        self.stats = {}
+        self.sketches = {}
+        self.chunks = 0
+
+    def _ensure(self, columns):
+        for col in columns:
+            if col not in self.stats:
+                self.stats[col] = RunningStats()
+                self.sketches[col] = QuantileSketch(self.alpha)
+
+    def update(self, chunk):
+        """Sumar un bloque (DataFrame) a los acumuladores."""
+        if self.columns is None:
+            self.columns = [c for c in DEFAULT_COLUMNS if c in chunk.columns]
+        self._ensure(self.columns)
+        for col in self.columns:
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.stats[col].update(values)
+            self.sketches[col].update(values)
+        self.chunks += 1
+        return self
+
+    def merge(self, other):
+        """Combinar con el resumen de otro proceso o shard (devuelve uno nuevo)."""
+        merged = StreamingSummary(self.columns or other.columns, self.alpha, self.quantile_levels)
+        merged._ensure(set(self.stats) | set(other.stats))
+        for col in merged.stats:
+            for part in (self, other):
+                if col in part.stats:
+                    merged.stats[col] = merged.stats[col] + part.stats[col]
+                    merged.sketches[col] = merged.sketches[col] + part.sketches[col]
+        merged.chunks = self.chunks + other.chunks
+        return merged
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def summary(self):
+        """DataFrame con una fila por columna: count, mean, std, min, max y cuantiles."""
+        rows = {}
+        for col in self.columns or []:
+            row = self.stats[col].to_dict()
+            for q, value in self.sketches[col].quantiles(self.quantile_levels).items():
+                row[f"p{q * 100:g}"] = value
+            rows[col] = row
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def summarize_chunks(chunks, columns=None, alpha=DEFAULT_ALPHA, quantiles=DEFAULT_QUANTILES):
+    """Resumir un iterable de DataFrames sin materializarlos juntos."""
+    summary = StreamingSummary(columns, alpha, quantiles)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary
+
+
+def iter_chunks(dataset='simulado', chunksize=100_000, scale=1):
+    """Bloques del dataset simulado (`scale` veces el tamaño base) o de uno real del zip."""
+    if dataset == 'simulado':
+        from synthetic_data import AGE_DISTRIBUTION, iter_dataset_chunks
+
+        distribution = {g: n * scale for g, n in AGE_DISTRIBUTION.items()}
+        return iter_dataset_chunks(distribution, chunk_size=chunksize)
+
+    from data_loader import iter_bank_chunks
+
+    return iter_bank_chunks(dataset, chunksize=chunksize)
+
+
+def print_streaming_summary(summary):
+    table = summary.summary()
+    alpha = summary.alpha
+    print(f"Estadísticas en una pasada ({summary.chunks} bloques; "
+          f"cuantiles con error relativo ≤ {alpha:.0%}):")
+    print(table.to_string(float_format=lambda v: f"{v:,.3f}"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Estadísticas descriptivas en una pasada, bloque a bloque")
+    parser.add_argument('--dataset', default='simulado',
+                        help="'simulado' o un CSV de bank+marketing.zip (ej. bank-additional-full)")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Filas por bloque")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="Con el dataset simulado: multiplicar su tamaño (ej. 1000 = 4.5M filas)")
+    parser.add_argument('--columns', default=None, help="Columnas separadas por comas")
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help="Error relativo máximo de los cuantiles (por defecto 0.01)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    columns = args.columns.split(',') if args.columns else None
+    try:
+        summary = summarize_chunks(iter_chunks(args.dataset, args.chunksize, args.scale),
+                                   columns, args.alpha)
+    except (KeyError, ValueError) as e:
+        print(f"✗ {e.args[0] if e.args else e}", file=sys.stderr)
+        return 2
+    print_streaming_summary(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
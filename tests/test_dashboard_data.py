@@ -0,0 +1,110 @@
+"""
+Pruebas del artefacto del dashboard: revisiones y regeneración incremental
+"""
+
+import pandas as pd
+import pytest
+
+import dashboard_data
+import query_service
+
+DIMENSIONS = ['age_group', 'job', 'contact']
+
+
+def _frame(job_last='admin.'):
+    jobs = ['admin.', 'technician', 'services', 'admin.', 'technician', job_last]
+    return pd.DataFrame({
+        'age_group': pd.Categorical(['young', 'adult', 'adult', 'senior', 'young', 'adult']),
+        'job': pd.Categorical(jobs),
+        'contact': pd.Categorical(['cellular', 'telephone', 'cellular',
+                                   'cellular', 'unknown', 'telephone']),
+        'y': pd.Categorical(['yes', 'no', 'no', 'yes', 'no', 'no']),
+    })
+
+
+def test_build_artifact_tracks_changed_dimensions():
+    first, changed = dashboard_data.build_artifact(_frame(), 'prueba')
+    assert changed == DIMENSIONS
+    assert first['revision'] == 1
+    assert (first['rows'], first['subscribed']) == (6, 2)
+    job = first['dimensions']['job']
+    assert dict(zip(job['labels'], job['total'])) == {'admin.': 3, 'services': 1, 'technician': 2}
+
+    same, changed = dashboard_data.build_artifact(_frame(), 'prueba', previous=first)
+    assert changed == []
+    assert same['version'] == first['version']
+    assert same['revision'] == 1
+    assert same['generated_at'] == first['generated_at']
+
+    updated, changed = dashboard_data.build_artifact(_frame('services'), 'prueba', previous=first)
+    assert changed == ['job']
+    assert updated['revision'] == 2
+    assert updated['version'] != first['version']
+    assert updated['dimensions']['job']['version'] != first['dimensions']['job']['version']
+    for dim in ('age_group', 'contact'):
+        assert updated['dimensions'][dim] == first['dimensions'][dim]
+
+
+def test_build_artifact_keeps_dimensions_not_counted():
+    first, _ = dashboard_data.build_artifact(_frame(), 'prueba')
+    partial, changed = dashboard_data.build_artifact(
+        _frame('services')[['job', 'y']], 'prueba', previous=first, dimensions=['job'])
+    assert changed == ['job']
+    assert list(partial['dimensions']) == DIMENSIONS
+    assert partial['dimensions']['contact'] == first['dimensions']['contact']
+
+
+@pytest.fixture
+def source(monkeypatch):
+    """Fuente y datos simulados: `state` controla lo que ven `update_artifact`."""
+    state = {'version': 'v1', 'frame': _frame(), 'loads': []}
+
+    def load_columns(dataset, dimensions=None, target='y'):
+        state['loads'].append(dimensions)
+        return state['frame'].copy()
+
+    monkeypatch.setattr(query_service, 'source_version', lambda dataset, watch=None: state['version'])
+    monkeypatch.setattr(dashboard_data, 'load_columns', load_columns)
+    return state
+
+
+def test_update_artifact_states(tmp_path, source):
+    output = tmp_path / 'aggregates.json.gz'
+
+    result = dashboard_data.update_artifact('prueba', output)
+    assert result['status'] == 'updated'
+    assert result['changed'] == DIMENSIONS
+    assert dashboard_data.load_artifact(output)['revision'] == 1
+
+    # Misma fuente: no se leen los datos
+    result = dashboard_data.update_artifact('prueba', output)
+    assert result['status'] == 'current'
+    assert len(source['loads']) == 1
+
+    # Fuente nueva con los mismos datos: se registra la fuente, sin nueva revisión
+    source['version'] = 'v2'
+    result = dashboard_data.update_artifact('prueba', output)
+    assert result['status'] == 'unchanged'
+    saved = dashboard_data.load_artifact(output)
+    assert (saved['source'], saved['revision']) == ('v2', 1)
+    assert dashboard_data.update_artifact('prueba', output)['status'] == 'current'
+
+    # Fuente nueva con una dimensión distinta
+    source['version'], source['frame'] = 'v3', _frame('services')
+    result = dashboard_data.update_artifact('prueba', output)
+    assert result['status'] == 'updated'
+    assert result['changed'] == ['job']
+    assert dashboard_data.load_artifact(output)['revision'] == 2
+
+
+def test_update_artifact_reads_only_missing_dimensions(tmp_path, source):
+    output = tmp_path / 'aggregates.json'
+    source['frame'] = _frame()[['job', 'y']]
+    dashboard_data.update_artifact('prueba', output, dimensions=['job'])
+
+    source['frame'] = _frame()[['contact', 'y']]
+    result = dashboard_data.update_artifact('prueba', output, dimensions=['job', 'contact'])
+    assert result['status'] == 'updated'
+    assert result['changed'] == ['contact']
+    assert source['loads'] == [['job'], ['contact']]
+    assert list(dashboard_data.load_artifact(output)['dimensions']) == ['job', 'contact']
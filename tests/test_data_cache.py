@@ -0,0 +1,47 @@
+"""
+Pruebas de la caché columnar: clave por contenido y publicación concurrente
+"""
+
+import os
+
+import pandas as pd
+
+import data_cache
+
+
+def _frame(n):
+    return pd.DataFrame({'age': range(n), 'y': pd.Categorical(['yes', 'no'] * (n // 2))})
+
+
+def test_source_digest_rehashes_only_on_change(tmp_path, monkeypatch):
+    source = tmp_path / 'fuente.zip'
+    source.write_bytes(b'a' * 1000)
+    calls = []
+    original = data_cache._hash_file
+    monkeypatch.setattr(data_cache, '_hash_file',
+                        lambda path, digest: (calls.append(path), original(path, digest)))
+
+    first = data_cache.source_digest(source, tmp_path / 'cache')
+    assert data_cache.source_digest(source, tmp_path / 'cache') == first
+    assert len(calls) == 1
+
+    source.write_bytes(b'b' * 1000)
+    os.utime(source, ns=(1, 1))
+    assert data_cache.source_digest(source, tmp_path / 'cache') != first
+    assert len(calls) == 2
+
+
+def test_save_frame_keeps_an_existing_valid_entry(tmp_path):
+    data_cache.save_frame(_frame(10), 'clave', tmp_path)
+    # Otro proceso llega tarde con la misma clave: gana la entrada publicada
+    data_cache.save_frame(_frame(4), 'clave', tmp_path)
+    assert len(data_cache.load_frame('clave', tmp_path)) == 10
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['clave']
+
+
+def test_save_frame_replaces_a_stale_entry(tmp_path):
+    data_cache.save_frame(_frame(10), 'clave', tmp_path)
+    (tmp_path / 'clave' / 'meta.json').write_text('{"version": 0}')
+    data_cache.save_frame(_frame(4), 'clave', tmp_path)
+    assert len(data_cache.load_frame('clave', tmp_path)) == 4
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['clave']
@@ -0,0 +1,141 @@
+"""
+Pruebas del descargador contra un servidor HTTP local con soporte de Range
+"""
+
+import hashlib
+import http.server
+import io
+import json
+import threading
+import zipfile
+
+import pytest
+
+import download_dataset as dd
+
+PAYLOAD = bytes(range(256)) * (3 * 4096 + 17)   # ~3 MB: varios segmentos
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Sirve `server.payload` en /data.zip con HEAD, GET y Range de un solo tramo."""
+
+    def log_message(self, *args):
+        pass
+
+    def _headers(self, status, length, extra=()):
+        self.send_response(status)
+        self.send_header('Content-Length', str(length))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', self.server.etag)
+        self.send_header('Last-Modified', 'Wed, 01 May 2024 00:00:00 GMT')
+        for name, value in extra:
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.server.log.append(('HEAD', None))
+        self._headers(200, len(self.server.payload))
+
+    def do_GET(self):
+        payload = self.server.payload
+        spec = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        self.server.log.append(('GET', spec))
+        if spec and (if_range is None or if_range == self.server.etag):
+            start, _, end = spec.removeprefix('bytes=').partition('-')
+            start, end = int(start), int(end) if end else len(payload) - 1
+            self._headers(206, end - start + 1,
+                          [('Content-Range', f"bytes {start}-{end}/{len(payload)}")])
+            self.wfile.write(payload[start:end + 1])
+        else:
+            self._headers(200, len(payload))
+            self.wfile.write(payload)
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _RangeHandler)
+    httpd.payload = PAYLOAD
+    httpd.etag = '"v1"'
+    httpd.log = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/data.zip"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _gets(server):
+    return [spec for method, spec in server.log if method == 'GET']
+
+
+def test_fetch_resumes_truncated_part(server, tmp_path):
+    target = tmp_path / 'data.zip'
+    session = dd.make_session(1)
+    info = dd.remote_info(session, server.url)
+    done = 1_000_000
+    # Descarga interrumpida: el .part solo tiene los primeros bytes
+    dd._part_path(target).write_bytes(PAYLOAD[:done])
+    state = dict(info, segments=[[0, len(PAYLOAD) - 1]], done=[done])
+    dd._state_path(target).write_text(json.dumps(state))
+    server.log.clear()
+
+    result = dd.fetch(server.url, target, session=session, segments=1, quiet=True)
+
+    assert result['status'] == 'resumed'
+    assert target.read_bytes() == PAYLOAD
+    assert _gets(server) == [f"bytes={done}-{len(PAYLOAD) - 1}"]
+    assert not dd._part_path(target).exists()
+    assert not dd._state_path(target).exists()
+
+
+def test_fetch_skips_when_etag_matches(server, tmp_path):
+    target = tmp_path / 'data.zip'
+    first = dd.fetch(server.url, target, segments=3, quiet=True)
+    assert first['status'] == 'downloaded'
+    assert first['sha256'] == hashlib.sha256(PAYLOAD).hexdigest()
+    server.log.clear()
+
+    again = dd.fetch(server.url, target, segments=3, quiet=True)
+    assert again['status'] == 'current'
+    assert _gets(server) == []
+
+    # Otra versión remota: se vuelve a descargar
+    server.etag = '"v2"'
+    assert dd.fetch(server.url, target, segments=3, quiet=True)['status'] == 'downloaded'
+
+
+def test_fetch_rejects_wrong_sha256(server, tmp_path):
+    target = tmp_path / 'data.zip'
+    with pytest.raises(dd.DownloadError, match='SHA-256'):
+        dd.fetch(server.url, target, sha256='0' * 64, quiet=True)
+    assert not target.exists()
+    assert not dd._part_path(target).exists()
+    assert not dd._state_path(target).exists()
+
+
+def _nested_zip(path, members):
+    """Zip exterior con zips internos, como bank+marketing.zip."""
+    inner = {}
+    for (inner_zip, member), content in members.items():
+        inner.setdefault(inner_zip, {})[member] = content
+    with zipfile.ZipFile(path, 'w') as outer:
+        for inner_zip, files in inner.items():
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as z:
+                for member, content in files.items():
+                    z.writestr(member, content)
+            outer.writestr(inner_zip, buffer.getvalue())
+
+
+def test_extract_members_creates_missing_folder(tmp_path):
+    source = tmp_path / 'bank+marketing.zip'
+    content = b'"age";"y"\n30;"yes"\n45;"no"\n'
+    _nested_zip(source, {dd.DATASETS['bank']: content})
+    folder = tmp_path / 'nuevo' / 'data'
+
+    assert dd.extract_members(source, folder, members=['bank']) == {'bank': 'extracted'}
+    assert (folder / 'bank.csv').read_bytes() == content
+    assert dd.locate_dataset('bank', folder) == folder / 'bank.csv'
+    assert dd.extract_members(source, folder, members=['bank']) == {'bank': 'current'}
@@ -0,0 +1,69 @@
+"""
+Pruebas de independence: los resultados por tabla deben coincidir con scipy
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import independence
+
+
+def _random_tables(rng, n, shape, low=0, high=60):
+    return rng.integers(low, high, size=(n, *shape))
+
+
+@pytest.mark.parametrize('shape, correction', [((2, 2), True), ((3, 4), False),
+                                               ((5, 2), False), ((2, 2), False)])
+def test_chi2_batch_matches_scipy(shape, correction):
+    rng = np.random.default_rng(7)
+    tables = _random_tables(rng, 40, shape, low=1)
+    result = independence.chi2_batch(tables, correction=correction)
+    for k, table in enumerate(tables):
+        chi2, p_value, dof, expected = stats.chi2_contingency(table, correction=correction)
+        assert result['chi2'][k] == pytest.approx(chi2, rel=1e-9, abs=1e-12)
+        assert result['p_value'][k] == pytest.approx(p_value, rel=1e-9, abs=1e-12)
+        assert result['dof'][k] == dof
+        np.testing.assert_allclose(result['expected'][k], expected, rtol=1e-12)
+
+
+def test_chi2_statistic_matches_scipy():
+    table = pd.DataFrame([[120, 30], [80, 45], [40, 22]], index=['a', 'b', 'c'],
+                         columns=['no', 'yes'])
+    chi2, p_value, dof, total = independence.chi2_statistic(table)
+    expected = stats.chi2_contingency(table.to_numpy())
+    assert chi2 == pytest.approx(expected[0])
+    assert p_value == pytest.approx(expected[1])
+    assert dof == expected[2]
+    assert total == table.to_numpy().sum()
+
+
+def test_adjust_pvalues_bh_matches_scipy():
+    rng = np.random.default_rng(3)
+    p_values = np.concatenate([rng.uniform(0, 0.05, 20), rng.uniform(0, 1, 80)])
+    np.testing.assert_allclose(independence.adjust_pvalues(p_values, 'bh'),
+                               stats.false_discovery_control(p_values, method='bh'),
+                               rtol=1e-12)
+
+
+def test_adjust_pvalues_keeps_nan():
+    adjusted = independence.adjust_pvalues([0.01, np.nan, 0.04], 'bonferroni')
+    assert np.isnan(adjusted[1])
+    np.testing.assert_allclose(adjusted[[0, 2]], [0.02, 0.08])
+
+
+def test_screen_independence_pool_matches_serial():
+    rng = np.random.default_rng(11)
+    n = 2_000
+    df = pd.DataFrame({f"c{i}": pd.Categorical(rng.choice(list('abcd')[:2 + i % 3], n))
+                       for i in range(7)})
+    df['y'] = pd.Categorical(np.where(df['c0'] == 'a', rng.choice(['yes', 'no'], n, p=[.3, .7]),
+                                      rng.choice(['yes', 'no'], n, p=[.1, .9])))
+    # 8 columnas = 28 pares, por encima de MIN_PAIRS_FOR_POOL
+    assert 8 * 7 // 2 >= independence.MIN_PAIRS_FOR_POOL
+
+    serial = independence.screen_independence(df, workers=1)
+    pooled = independence.screen_independence(df, workers=2)
+    for name in ('chi2', 'p_value', 'dof', 'cramers_v'):
+        pd.testing.assert_frame_equal(serial[name], pooled[name])
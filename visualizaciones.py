@@ -0,0 +1,330 @@
+"""
+Visualizaciones del análisis de probabilidad (sección 5)
+========================================================
+matplotlib solo se importa al llamar a estas funciones, y el estilo se
+aplica dentro de un contexto en lugar de modificar los rcParams globales,
+así que importar el módulo no tiene costo ni efectos secundarios.
+
+Además del modo interactivo (`plot_results` + `show`), `render_report`
+dibuja sin pantalla: usa figuras `matplotlib.figure.Figure` con el
+backend Agg (sin pyplot), reparte la figura completa y cada panel en un
+pool de procesos, puede generar SVG o vistas previas de baja resolución y
+no vuelve a dibujar un archivo si los valores graficados no cambiaron
+(clave = hash de `conditional_probs`, `bayes_results` y demás datos).
+"""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+FIGURE_PATH = 'analisis_probabilidad_completo.png'
+
+STYLE = 'seaborn-v0_8-darkgrid'
+
+RC_PARAMS = {
+    'figure.figsize': (15, 10),
+    'font.size': 10,
+}
+
+# Incrementar si cambia el dibujo, para invalidar la caché de renderizado
+RENDER_VERSION = 1
+
+RENDER_CACHE_FILE = '.render_cache.json'
+
+PREVIEW_DPI = 72
+
+# Formatos de salida: extensión, sufijo del nombre y resolución (None = la pedida)
+FORMATS = {
+    'png': ('png', '', None),
+    'svg': ('svg', '', None),
+    'preview': ('png', '_preview', PREVIEW_DPI),
+}
+
+
+# ============================================================================
+# Datos graficados
+# ============================================================================
+
+def plot_data(results):
+    """Extraer de los resultados solo los valores que se grafican (serializables)."""
+    age_groups = list(results['age_groups'])
+    return {
+        'age_groups': [str(g) for g in age_groups],
+        'age_labels': [results['age_labels'][g] for g in age_groups],
+        'total_clients': int(results['total_clients']),
+        'subscribed': int(results['subscribed']),
+        'not_subscribed': int(results['not_subscribed']),
+        'prob_subscribe': float(results['prob_subscribe']),
+        'age_mean': float(results['age_mean']),
+        'prob_yes': [float(results['conditional_probs'][g]['prob_yes']) for g in age_groups],
+        'posterior': [float(results['bayes_results'][g]) for g in age_groups],
+    }
+
+
+def data_hash(data):
+    """Hash estable de los datos graficados (clave de la caché de renderizado)."""
+    payload = json.dumps({'version': RENDER_VERSION, 'data': data}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# ============================================================================
+# Paneles
+# ============================================================================
+
+def _draw_distribution(ax, data):
+    # Gráfico 1: Distribución general (Pie Chart)
+    labels_pie = ['Suscribió', 'No Suscribió']
+    sizes = [data['subscribed'], data['not_subscribed']]
+    colors_pie = ['#10b981', '#ef4444']
+    explode = (0.05, 0)
+
+    wedges, texts, autotexts = ax.pie(sizes, explode=explode, labels=labels_pie,
+                                      colors=colors_pie, autopct='%1.2f%%',
+                                      shadow=True, startangle=90, textprops={'fontsize': 11})
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_weight('bold')
+    ax.set_title(f"Distribución de Suscripciones\n(N = {data['total_clients']:,} clientes)",
+                 fontsize=13, fontweight='bold', pad=20)
+
+
+def _draw_summary_table(ax, data):
+    # Gráfico 2: Estadísticas básicas (Tabla)
+    ax.axis('tight')
+    ax.axis('off')
+    summary_stats = [
+        ['Total Clientes', f"{data['total_clients']:,}"],
+        ['Suscripciones', f"{data['subscribed']:,}"],
+        ['No Suscripciones', f"{data['not_subscribed']:,}"],
+        ['Tasa Conversión', f"{data['prob_subscribe']*100:.2f}%"],
+        ['Edad Media', f"{data['age_mean']:.1f} años"]
+    ]
+    table = ax.table(cellText=summary_stats, cellLoc='left',
+                     colWidths=[0.6, 0.4], loc='center')
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 2.5)
+    for i in range(len(summary_stats)):
+        table[(i, 0)].set_facecolor('#f0f0f0')
+        table[(i, 1)].set_facecolor('#ffffff')
+    ax.set_title('Estadísticas Generales', fontsize=12, fontweight='bold', pad=10)
+
+
+def _draw_conditional(ax, data):
+    # Gráfico 3: Probabilidades condicionales
+    groups_plot = data['age_labels']
+    probs_plot = [p*100 for p in data['prob_yes']]
+    colors_bar = ['#3b82f6', '#10b981', '#f59e0b']
+    prob_subscribe = data['prob_subscribe']
+
+    bars = ax.bar(groups_plot, probs_plot, color=colors_bar, alpha=0.7, edgecolor='black')
+    ax.axhline(y=prob_subscribe*100, color='red', linestyle='--', linewidth=2,
+               label=f'P(S) base = {prob_subscribe*100:.2f}%')
+
+    # Añadir valores encima de las barras
+    for bar, prob in zip(bars, probs_plot):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.3,
+                f'{prob:.2f}%', ha='center', va='bottom', fontweight='bold', fontsize=11)
+
+    ax.set_ylabel('Probabilidad de Suscripción (%)', fontsize=11, fontweight='bold')
+    ax.set_title('Probabilidades Condicionales: P(Suscripción | Grupo de Edad)',
+                 fontsize=13, fontweight='bold', pad=15)
+    ax.legend(fontsize=10)
+    ax.set_ylim([0, max(probs_plot) * 1.2])
+    ax.grid(axis='y', alpha=0.3)
+
+
+def _draw_bayes(ax, data):
+    # Gráfico 4: Teorema de Bayes
+    groups_plot = data['age_labels']
+    bayes_plot = [p*100 for p in data['posterior']]
+    colors_bayes = ['#8b5cf6', '#ec4899', '#f97316']
+
+    bars_bayes = ax.bar(groups_plot, bayes_plot, color=colors_bayes, alpha=0.7, edgecolor='black')
+
+    for bar, prob in zip(bars_bayes, bayes_plot):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                f'{prob:.2f}%', ha='center', va='bottom', fontweight='bold', fontsize=11)
+
+    ax.set_ylabel('Probabilidad Posterior (%)', fontsize=11, fontweight='bold')
+    ax.set_title('Teorema de Bayes: P(Grupo de Edad | Suscripción)',
+                 fontsize=13, fontweight='bold', pad=15)
+    ax.set_ylim([0, max(bayes_plot) * 1.2])
+    ax.grid(axis='y', alpha=0.3)
+
+
+def _draw_bayes_table(ax, data):
+    # Gráfico 5: Tabla de resultados Bayes
+    ax.axis('tight')
+    ax.axis('off')
+    bayes_table_data = []
+    for label, prob_yes, posterior in zip(data['age_labels'], data['prob_yes'], data['posterior']):
+        bayes_table_data.append([
+            label.replace(' (', '\n('),
+            f"{prob_yes*100:.2f}%",
+            f"{posterior*100:.2f}%"
+        ])
+
+    table2 = ax.table(cellText=bayes_table_data,
+                      colLabels=['Grupo', 'P(S|E)', 'P(E|S)'],
+                      cellLoc='center', loc='center',
+                      colWidths=[0.5, 0.25, 0.25])
+    table2.auto_set_font_size(False)
+    table2.set_fontsize(9)
+    table2.scale(1, 2.5)
+
+    # Colorear encabezados
+    for i in range(3):
+        table2[(0, i)].set_facecolor('#4a5568')
+        table2[(0, i)].set_text_props(weight='bold', color='white')
+
+    ax.set_title('Resumen Bayes', fontsize=11, fontweight='bold', pad=10)
+
+
+# Nombre -> (función, posición en la grilla 3×3, tamaño como figura suelta)
+PANELS = {
+    'distribucion': (_draw_distribution, (0, slice(0, 2)), (10, 5)),
+    'estadisticas': (_draw_summary_table, (0, 2), (6, 5)),
+    'condicionales': (_draw_conditional, (1, slice(None)), (16, 5)),
+    'bayes': (_draw_bayes, (2, slice(0, 2)), (10, 5)),
+    'resumen_bayes': (_draw_bayes_table, (2, 2), (6, 5)),
+}
+
+
+def _draw_all(fig, data):
+    """Dibujar los 5 paneles en la grilla de la figura completa."""
+    gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
+    for draw, (row, col), _ in PANELS.values():
+        draw(fig.add_subplot(gs[row, col]), data)
+    fig.suptitle('Análisis de Probabilidad - Bank Marketing Dataset',
+                 fontsize=16, fontweight='bold', y=0.995)
+
+
+# ============================================================================
+# Modo interactivo (pyplot)
+# ============================================================================
+
+def build_figure(results):
+    """Construir la figura de 5 paneles a partir de los resultados de la sección 3."""
+    import matplotlib.pyplot as plt
+
+    with plt.style.context(STYLE), plt.rc_context(RC_PARAMS):
+        fig = plt.figure(figsize=(16, 12))
+        _draw_all(fig, plot_data(results))
+    return fig
+
+
+def plot_results(results, path=FIGURE_PATH, dpi=300):
+    """Dibujar la figura completa y guardarla en `path`; devuelve la ruta."""
+    import matplotlib.pyplot as plt
+
+    fig = build_figure(results)
+    with plt.style.context(STYLE):
+        fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    return path
+
+
+def show():
+    """Mostrar las figuras abiertas (bloquea en backends interactivos)."""
+    import matplotlib.pyplot as plt
+
+    plt.show()
+
+
+# ============================================================================
+# Modo sin pantalla (Agg), en paralelo y con caché
+# ============================================================================
+
+def _render_job(panel, data, path, fmt, dpi):
+    """Dibujar la figura completa (panel=None) o un panel y guardarlo en `path`.
+
+    Usa `Figure` directamente (backend Agg, sin pyplot), por lo que es
+    seguro ejecutarlo en procesos trabajadores sin pantalla.
+    """
+    import matplotlib
+    import matplotlib.style
+    from matplotlib.figure import Figure
+
+    with matplotlib.style.context(STYLE), matplotlib.rc_context(RC_PARAMS):
+        if panel is None:
+            fig = Figure(figsize=(16, 12))
+            _draw_all(fig, data)
+        else:
+            draw, _, size = PANELS[panel]
+            fig = Figure(figsize=size)
+            draw(fig.add_subplot(), data)
+        fig.savefig(path, format=fmt, dpi=dpi, bbox_inches='tight')
+    return str(path)
+
+
+def _load_render_cache(output_dir):
+    path = output_dir / RENDER_CACHE_FILE
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def render_report(results, output_dir='.', formats=('png',), dpi=300,
+                  panels=False, workers=None, force=False,
+                  basename='analisis_probabilidad_completo'):
+    """Renderizar la figura (y opcionalmente cada panel) sin pantalla.
+
+    Parámetros:
+        results: resultados de `analisis_probabilidad.compute_probabilities`
+        output_dir: carpeta de salida
+        formats: cualquiera de 'png', 'svg' (vectorial) y 'preview'
+            (PNG de baja resolución)
+        dpi: resolución del PNG completo
+        panels: además de la figura completa, guardar cada panel por separado
+        workers: procesos del pool (None = uno por trabajo, 1 = sin pool)
+        force: volver a dibujar aunque los datos no hayan cambiado
+
+    Devuelve un diccionario {ruta: 'rendered' | 'cached'}.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Formatos desconocidos: {sorted(unknown)}. Usa {sorted(FORMATS)}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    data = plot_data(results)
+    key = data_hash(data)
+    cache = {} if force else _load_render_cache(output_dir)
+
+    jobs = []
+    status = {}
+    targets = [(None, basename)]
+    if panels:
+        targets += [(name, f"{basename}_{name}") for name in PANELS]
+    for panel, stem in targets:
+        for name in formats:
+            ext, suffix, fixed_dpi = FORMATS[name]
+            job_dpi = fixed_dpi or dpi
+            path = output_dir / f"{stem}{suffix}.{ext}"
+            entry_key = f"{key}:{job_dpi}"
+            if cache.get(path.name) == entry_key and path.exists():
+                status[str(path)] = 'cached'
+            else:
+                jobs.append((panel, data, path, ext, job_dpi, entry_key))
+
+    if jobs:
+        if workers == 1 or len(jobs) == 1:
+            for panel, job_data, path, ext, job_dpi, _ in jobs:
+                _render_job(panel, job_data, path, ext, job_dpi)
+        else:
+            with ProcessPoolExecutor(max_workers=workers or len(jobs)) as pool:
+                futures = [pool.submit(_render_job, *job[:5]) for job in jobs]
+                for future in futures:
+                    future.result()
+
+        cache = _load_render_cache(output_dir)
+        for *_, path, _, _, entry_key in jobs:
+            cache[path.name] = entry_key
+            status[str(path)] = 'rendered'
+        (output_dir / RENDER_CACHE_FILE).write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+    return status